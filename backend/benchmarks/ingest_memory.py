@@ -0,0 +1,150 @@
+"""
+Benchmark do pico de memória (RSS) da leitura de CSVs grandes.
+
+Compara a leitura original (bytes do upload inteiros em memória e um `BytesIO`), a
+leitura em blocos concatenados com `pd.concat` e a leitura atual de `_read_csv`, que
+lê as colunas de texto repetitivas como `category` e une os blocos coluna a coluna.
+Todos os modos terminam com `compact_dataframe`, como em `load_csv`, e cada um roda
+em um processo separado para medir o pico de RSS de forma isolada.
+
+Uso (no diretório backend):
+    python -m benchmarks.ingest_memory --sizes 100 1024
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Importar `src.services` instancia os agentes, que exigem uma chave de API (não usada aqui)
+os.environ.setdefault('DATABASE_URI', 'sqlite://')
+os.environ.setdefault('GROQ_API_KEY', 'benchmark')
+
+MODES = ('whole_file', 'chunked_concat', 'streaming')
+ROWS_PER_BLOCK = 500_000
+
+
+def _status_mb(field: str) -> float:
+    """Lê um campo de memória (em KB) de /proc/self/status, em MB."""
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(f'{field}:'):
+                return int(line.split()[1]) / 1024
+
+    return 0.0
+
+
+def _reset_peak_rss() -> None:
+    # Zera o pico de RSS (VmHWM) do processo, desconsiderando o pico das importações
+    with open('/proc/self/clear_refs', 'w') as clear_refs:
+        clear_refs.write('5')
+
+
+def generate_csv(path: str, size_mb: int) -> None:
+    """Gera um CSV sintético de notas fiscais com aproximadamente `size_mb` MB."""
+    rng = np.random.default_rng(0)
+    suppliers = np.array([f'Fornecedor {i:05d} LTDA' for i in range(20_000)])
+    categories = np.array(['Alimentacao', 'Saude', 'Transporte', 'Educacao', 'Lazer'])
+    row_id = 0
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('id,data,categoria,fornecedor,valor,descricao\n')
+
+        while file.tell() < size_mb * 1024**2:
+            n = ROWS_PER_BLOCK
+            block = pd.DataFrame(
+                {
+                    'id': np.arange(row_id, row_id + n),
+                    'data': pd.Timestamp('2024-01-01')
+                    + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+                    'categoria': categories[rng.integers(0, len(categories), n)],
+                    'fornecedor': suppliers[rng.integers(0, len(suppliers), n)],
+                    'valor': rng.gamma(2.0, 150.0, n).round(2),
+                    'descricao': [
+                        f'Item {i} da nota' for i in rng.integers(0, 10**6, n)
+                    ],
+                }
+            )
+            block.to_csv(file, header=False, index=False, date_format='%Y-%m-%d')
+            row_id += n
+
+
+def run_mode(mode: str, path: str) -> None:
+    """Lê o CSV no modo informado e imprime o pico de RSS acima do processo já importado."""
+    from src.services.data_compaction import compact_dataframe
+    from src.services.data_processing import _read_csv
+    from src.settings import settings
+
+    _reset_peak_rss()
+    before = _status_mb('VmRSS')
+    start = time.perf_counter()
+
+    with open(path, 'rb') as file:
+        if mode == 'whole_file':
+            df = pd.read_csv(io.BytesIO(file.read()))
+        elif mode == 'chunked_concat':
+            with pd.read_csv(file, chunksize=settings.csv_chunk_rows) as reader:
+                df = pd.concat(reader, ignore_index=True)
+        else:
+            df, _ = _read_csv(file, None, None)
+
+    df, _ = compact_dataframe(df)
+    elapsed = time.perf_counter() - start
+    frame_mb = df.memory_usage(deep=True).sum() / 1024**2
+    print(f'{_status_mb("VmHWM") - before:.0f} {frame_mb:.0f} {elapsed:.1f}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument(
+        '--run', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.run:
+        run_mode(*args.run)
+        return
+
+    print(
+        f'{"size":>8} {"mode":>15} {"peak RSS MB":>12} {"frame MB":>9} {"seconds":>8}'
+    )
+
+    for size_mb in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.csv')
+            generate_csv(path, size_mb)
+
+            for mode in args.modes:
+                result = subprocess.run(
+                    [
+                        sys.executable,
+                        '-m',
+                        'benchmarks.ingest_memory',
+                        '--run',
+                        mode,
+                        path,
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                )
+                if result.returncode:
+                    print(
+                        f'{size_mb:>6}MB {mode:>15} failed: {result.stderr.strip()[-200:]}'
+                    )
+                    continue
+
+                peak, frame, seconds = result.stdout.split()[-3:]
+                print(f'{size_mb:>6}MB {mode:>15} {peak:>12} {frame:>9} {seconds:>8}')
+
+
+if __name__ == '__main__':
+    main()
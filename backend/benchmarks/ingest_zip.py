@@ -0,0 +1,95 @@
+"""
+Benchmark da leitura dos CSVs de um ZIP: em sequência, no próprio processo, e por
+`DataHandler._load_zip_members` com diferentes quantidades de processos (com um único
+processo, ele também lê em sequência, sem o pool).
+
+O tempo do pool inclui a cópia do ZIP para o disco, a criação dos processos e o envio
+dos DataFrames lidos de volta ao processo principal; o ganho depende dos núcleos
+disponíveis (informados na saída).
+
+Uso (no diretório backend):
+    python -m benchmarks.ingest_zip --members 4 --member-mb 50 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import zipfile
+
+# Importar `src.services` instancia os agentes, que exigem uma chave de API (não usada aqui)
+os.environ.setdefault('DATABASE_URI', 'sqlite://')
+os.environ.setdefault('GROQ_API_KEY', 'benchmark')
+
+from benchmarks.ingest_memory import generate_csv
+
+
+def generate_zip(path: str, members: int, member_mb: int) -> list[str]:
+    """Gera um ZIP com `members` CSVs sintéticos de aproximadamente `member_mb` MB."""
+    names = [f'notas_{i:02d}.csv' for i in range(members)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'data.csv')
+        generate_csv(csv_path, member_mb)
+
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for name in names:
+                zip_file.write(csv_path, name)
+
+    return names
+
+
+def run_serial(path: str, members: list[str]) -> float:
+    from src.services.data_processing import _read_zip_member
+
+    start = time.perf_counter()
+    for member in members:
+        _read_zip_member(path, member, None, None)
+
+    return time.perf_counter() - start
+
+
+def run_pool(path: str, members: list[str], workers: int) -> float:
+    from src.services.data_processing import DataHandler
+    from src.settings import settings
+
+    settings.ingest_workers = workers
+
+    start = time.perf_counter()
+    with open(path, 'rb') as file:
+        asyncio.run(DataHandler()._load_zip_members(file, members, None, None))
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--members', type=int, default=4)
+    parser.add_argument('--member-mb', type=int, default=50)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'data.zip')
+        members = generate_zip(path, args.members, args.member_mb)
+
+        print(
+            f'{args.members} x {args.member_mb} MB CSVs, {os.cpu_count()} CPUs, '
+            f'best of {args.repeat}'
+        )
+        print(f'{"mode":>12} {"seconds":>8} {"speedup":>8}')
+
+        serial = min(run_serial(path, members) for _ in range(args.repeat))
+        print(f'{"serial":>12} {serial:>8.2f} {1:>8.2f}')
+
+        for workers in args.workers:
+            seconds = min(run_pool(path, members, workers) for _ in range(args.repeat))
+            print(
+                f'{f"workers={workers}":>12} {seconds:>8.2f} {serial / seconds:>8.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 """Classe base para outros agentes herdarem métodos comuns"""
 
+import asyncio
+
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain.chains.conversation.memory import ConversationSummaryMemory
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -10,9 +12,20 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_groq import ChatGroq
 
 from src.settings import settings
+from src.utils.cache import LRUCache
 from src.utils.exceptions import APIKeyNotFoundException, ExecutorNotFoundException
 
 
+class SummaryMemory(ConversationSummaryMemory):
+    """
+    Memória de sumarização que também atualiza o resumo nas execuções assíncronas: o
+    `asave_context` herdado apenas guarda as mensagens, sem resumi-las.
+    """
+
+    async def asave_context(self, inputs: dict, outputs: dict) -> None:
+        await asyncio.to_thread(self.save_context, inputs, outputs)
+
+
 # Agente base para reaproveitamento e herança
 class BaseAgent:
     def __init__(
@@ -21,13 +34,16 @@ class BaseAgent:
     ):
         self._llm = llm
         self.agent = None
+        self._memory_key = None
+        # Executores com a memória de conversa de cada sessão
+        self._executors = LRUCache(max_items=settings.agent_memory_max_sessions)
         self.prompt = ChatPromptTemplate(
             [
                 (
                     'system',
                     'You are a helpful agent that answers questions, respond to the questions objectively and only when certain, use the tools available to create better answers',
                 ),
-                MessagesPlaceholder('input'),
+                ('human', '{input}'),
                 MessagesPlaceholder('agent_scratchpad'),
             ]
         )
@@ -118,7 +134,7 @@ class BaseAgent:
                 llm=self._llm,
             )
             ```
-            memory_key (str | None, optional): Chave de memória usada no template de prompt para o histórico de chat, se for None, nenhuma memória será adicionada ao agente.
+            memory_key (str | None, optional): Chave de memória usada no template de prompt para o histórico de chat, se for None, nenhuma memória será adicionada ao agente. Cada sessão recebe a sua própria memória (ver `executor`).
             verbose (bool, optional): Se o agente imprimirá suas ações no console.
 
         Raises:
@@ -132,14 +148,9 @@ class BaseAgent:
         )
 
         # Se chave para histórico da memória, adicionar memória de sumarização ao agente
+        self._memory_key = memory_key
         if memory_key:
-            memory = ConversationSummaryMemory(
-                memory_key=memory_key,
-                input_key='input',
-                output_key='output',
-                return_messages=True,
-                llm=self._llm,
-            )
+            memory = self._create_memory()
 
         # Criar um ciclo de execução para o agente executar suas ferramentas
         self.agent = AgentExecutor(
@@ -149,12 +160,43 @@ class BaseAgent:
             max_iterations=7,
             verbose=verbose,
         )
+        self._executors.clear()
+
+    def _create_memory(self) -> SummaryMemory:
+        return SummaryMemory(
+            memory_key=self._memory_key,
+            input_key='input',
+            output_key='output',
+            return_messages=True,
+            llm=self._llm,
+        )
 
-    def get_model_info(self):
-        return (self.model_name, self.provider)
+    def executor(self, session: str | None = None) -> AgentExecutor:
+        """
+        Retorna o executor do agente. Com memória de conversa, cada sessão (thread_id)
+        recebe um executor com a sua própria memória, para que conversas simultâneas não
+        misturem seus históricos; sem sessão, usa a memória do executor padrão.
 
-    def run(self, user_input):
+        Raises:
+            ExecutorNotFoundException: se o agente ainda não foi inicializado.
+        """
         if not self.agent:
             raise ExecutorNotFoundException()
 
-        return self.agent.invoke({'input': user_input})
+        if session is None or not self._memory_key:
+            return self.agent
+
+        return self._executors.get_or_set(
+            session,
+            lambda: self.agent.model_copy(update={'memory': self._create_memory()}),
+        )
+
+    def get_model_info(self):
+        return (self.model_name, self.provider)
+
+    def run(self, user_input, session: str | None = None):
+        return self.executor(session).invoke({'input': user_input})
+
+    async def arun(self, user_input, session: str | None = None):
+        """Executa o agente sem bloquear o loop de eventos; as ferramentas síncronas rodam em threads."""
+        return await self.executor(session).ainvoke({'input': user_input})
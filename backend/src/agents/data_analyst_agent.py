@@ -3,6 +3,9 @@ from langchain.tools import BaseTool
 from langchain_core.messages import SystemMessage
 
 from src.tools.data_analysis_tool import (
+    aggregate_data,
+    analyze_time_series,
+    create_aggregate_bar_chart,
     create_bar_chart,
     create_box_plot,
     create_correlation_heatmap,
@@ -10,13 +13,16 @@ from src.tools.data_analysis_tool import (
     create_line_plot,
     create_scatter_plot,
     detect_outliers_iqr,
+    evaluate_clusters,
     find_clusters_and_plot,
     get_correlation_matrix,
     get_data_rows,
     get_data_summary,
     get_metadata,
+    scan_numeric_anomalies,
 )
 from src.tools.python_tool import python_ast_repl
+from src.tools.sql_tool import sql_query
 
 from .base_agent import BaseAgent
 
@@ -38,7 +44,7 @@ Follow these rules strictly:
     a. **Explore:** First, use the `get_data_summary` tool to understand the data's structure, columns, data types, and basic statistics. This is your first step in almost every analysis.
     b. **Plan:** Formulate a plan on how to approach the user's request.
     c. **Choose the Right Tool:** Based on the data types you discovered, choose the most appropriate tool. For example, use `create_histogram` for numerical columns and a bar chart tool for categorical columns.
-    d. **Execute:** Use your tools to execute the plan.
+    d. **Execute:** Use your tools to execute the plan. For totals/averages by category or period, use `aggregate_data` (and `create_aggregate_bar_chart` to plot them); for other filtering, grouping or aggregations, use the `sql_query` tool.
     e. **Last Resort:** The `Python_code` tool is powerful for complex data manipulation and analysis with the libraries pandas & plotly. Use it only as a last resort if no other specific tool can solve the problem. Using this tool for file manipulation is not allowed!
 4.  **Graph Generation:** 
         * The graph generation tools **returns a graph_id** that should be used in the response.
@@ -55,7 +61,7 @@ Follow these rules strictly:
         self.prompt = ChatPromptTemplate.from_messages(
             [
                 SystemMessage(system_instructions),
-                MessagesPlaceholder('input'),
+                ('human', '{input}'),
                 MessagesPlaceholder('agent_scratchpad'),
             ]
         )
@@ -67,17 +73,23 @@ Follow these rules strictly:
 
         tools: list[BaseTool] = [
             create_bar_chart,
+            create_aggregate_bar_chart,
+            aggregate_data,
+            analyze_time_series,
             create_histogram,
             create_line_plot,
             create_scatter_plot,
             detect_outliers_iqr,
+            scan_numeric_anomalies,
             find_clusters_and_plot,
+            evaluate_clusters,
             get_correlation_matrix,
             get_data_summary,
             create_box_plot,
             create_correlation_heatmap,
             get_data_rows,
             get_metadata,
+            sql_query,
             python_ast_repl,
         ]
 
@@ -30,7 +30,7 @@ class DataEngineerAgent(BaseAgent):
         self.prompt = ChatPromptTemplate(
             [
                 SystemMessage(system_instructions),
-                MessagesPlaceholder('input'),
+                ('human', '{input}'),
                 MessagesPlaceholder('agent_scratchpad'),
             ]
         )
@@ -32,7 +32,7 @@ For common and general responses not requiring other agents, create a brief and
         self.prompt = ChatPromptTemplate(
             [
                 SystemMessage(system_instructions),
-                MessagesPlaceholder('input'),
+                ('human', '{input}'),
                 MessagesPlaceholder('chat_history'),
                 MessagesPlaceholder('agent_scratchpad'),
             ]
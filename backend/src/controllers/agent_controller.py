@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, UploadFile
 
 from src.schemas import ApiKeyInput, UserInput
 from src.services import Chat, DataHandler, get_chat_service
+from src.services.dataset_registry import DEFAULT_SESSION
 
 router = APIRouter()
 data_handler = DataHandler()
@@ -17,17 +18,47 @@ def get_chat_dependency() -> Chat:
 
 @router.post('/upload', status_code=201)
 async def csv_input(
-    separator: str,
     file: UploadFile,
+    separator: str | None = None,
+    header: int | None = None,
+    thread_id: str = DEFAULT_SESSION,
+    merge_zip_members: bool = False,
+    source_column: str | None = None,
 ):
-    response = await data_handler.load_csv(file, separator)
+    response = await data_handler.load_csv(
+        file,
+        separator,
+        header,
+        merge_zip_members=merge_zip_members,
+        source_column=source_column,
+        session=thread_id,
+    )
 
-    return {'data': response}
+    return response
+
+
+@router.post('/upload/append', status_code=201)
+async def csv_append(
+    file: UploadFile,
+    separator: str | None = None,
+    header: int | None = None,
+    thread_id: str = DEFAULT_SESSION,
+):
+    response = await data_handler.append_csv(file, separator, header, thread_id)
+
+    return response
+
+
+@router.delete('/upload', status_code=200)
+async def csv_drop(thread_id: str = DEFAULT_SESSION):
+    response = await data_handler.drop_dataset(thread_id)
+
+    return response
 
 
 @router.post('/prompt', status_code=201)
 async def prompt_model(input: UserInput, chat: Chat = Depends(get_chat_dependency)):
-    response = await chat.send_prompt(input.request)
+    response = await chat.send_prompt(input.request, input.thread_id)
     return response
 
 
@@ -1,16 +1,113 @@
 """Rotas para serviços relacionados ao banco de dados"""
 
-from fastapi import APIRouter
+import asyncio
+import gzip
 
-from src.services import get_graph_db, init_db
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+
+from src.schemas import GraphBatchInput
+from src.services import init_db
+from src.services.chart_retention import get_storage_stats
+from src.services.graph_cache import (
+    CachedGraph,
+    get_cached_graph,
+    get_cached_graphs,
+)
 
 router = APIRouter()
 
 init_db()
 
+# Gráficos não mudam depois de salvos: podem ser mantidos em cache pelos clientes
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def _etag(graph: CachedGraph, variant: str) -> str:
+    # Cada representação (envelope JSON, figura em gzip ou sem compressão) tem um ETag forte próprio
+    return f'"{graph.digest}-{variant}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Verifica se o ETag está no cabeçalho If-None-Match da requisição."""
+    if_none_match = request.headers.get('if-none-match')
+
+    if not if_none_match:
+        return False
+
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or etag in tags
+
+
+def _cached_response(request: Request, etag: str, build) -> Response:
+    """Retorna 304 quando o cliente já tem a representação, senão a resposta de `build`."""
+    headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
+
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    response = build()
+    response.headers.update(headers)
+
+    return response
+
+
+@router.get('/storage/stats', status_code=200)
+async def storage_stats():
+    """Ocupação do armazenamento de gráficos, para acompanhamento da retenção."""
+    return await asyncio.to_thread(get_storage_stats)
+
 
 @router.get('/graphs/{graph_id}', status_code=200)
-async def get_graph(graph_id: str):
-    results = get_graph_db(graph_id)
+async def get_graph(graph_id: str, request: Request):
+    graph = await get_cached_graph(graph_id)
+
+    if graph is None:
+        return {'graph': None}
+
+    return _cached_response(
+        request,
+        _etag(graph, 'json'),
+        lambda: JSONResponse({'graph': gzip.decompress(graph.data).decode()}),
+    )
+
+
+@router.post('/graphs/batch', status_code=200)
+async def get_graphs(graph_input: GraphBatchInput):
+    """Retorna vários gráficos em uma única requisição; IDs não encontrados vêm como null."""
+    graphs = await get_cached_graphs(graph_input.graph_ids)
+
+    return {
+        'graphs': {
+            graph_id: gzip.decompress(graphs[graph_id].data).decode()
+            if graph_id in graphs
+            else None
+            for graph_id in graph_input.graph_ids
+        }
+    }
+
+
+@router.get('/graphs/{graph_id}/figure', status_code=200)
+async def get_graph_figure(graph_id: str, request: Request):
+    """
+    Retorna o JSON do Plotly do gráfico. Para clientes que aceitam gzip, os bytes
+    comprimidos salvos no banco são enviados sem descompressão.
+    """
+    graph = await get_cached_graph(graph_id)
+
+    if graph is None:
+        raise HTTPException(status_code=404, detail='Graph not found.')
+
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        variant, headers = 'gzip', {'Content-Encoding': 'gzip'}
+    else:
+        variant, headers = 'identity', {}
+
+    def build() -> Response:
+        content = graph.data if variant == 'gzip' else gzip.decompress(graph.data)
+        return Response(content, media_type='application/json', headers=headers)
+
+    response = _cached_response(request, _etag(graph, variant), build)
+    response.headers['Vary'] = 'Accept-Encoding'
 
-    return {'graph': results}
+    return response
@@ -11,7 +11,9 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from src.utils.exceptions import (
     APIKeyNotFoundException,
+    DatasetNotFoundError,
     ModelNotFoundException,
+    SchemaMismatchError,
     WrongFileTypeError,
 )
 
@@ -26,6 +28,8 @@ class ExceptionHandlerMiddleware(BaseHTTPMiddleware):
         except (
             APIKeyNotFoundException,
             WrongFileTypeError,
+            SchemaMismatchError,
+            DatasetNotFoundError,
             ModelNotFoundException,
         ) as exc:
             return JSONResponse(
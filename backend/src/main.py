@@ -1,8 +1,35 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .controllers import agent_controller, db_controller
 from .exception_handler import ExceptionHandlerMiddleware
+from .services import close_db
+from .services.chart_retention import run_compaction
+from .services.chart_writer import chart_writer
+from .settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pool de threads das ferramentas dos agentes: o LangChain executa as ferramentas
+    # síncronas (e o asyncio, `to_thread`) no executor padrão do loop
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            settings.agent_tool_workers, thread_name_prefix='agent-tools'
+        )
+    )
+    # Compactação periódica da tabela de gráficos conforme a retenção configurada
+    compaction = asyncio.create_task(run_compaction())
+    yield
+    compaction.cancel()
+    # Grava os gráficos pendentes e devolve as conexões dos pools do banco de dados
+    await asyncio.to_thread(chart_writer.close)
+    await close_db()
+
 
 app = FastAPI(
     title='Smart Financial Solutions API',
@@ -12,6 +39,7 @@ app = FastAPI(
     """,
     root_path='/api',
     version='1.0.0',
+    lifespan=lifespan,
 )
 
 # CORS para restrição de domínios, liberal por padrão.
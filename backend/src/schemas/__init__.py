@@ -1,4 +1,4 @@
 from .model_schemas import JSONOutput, QueryOutput
-from .user_schemas import ApiKeyInput, UserInput
+from .user_schemas import ApiKeyInput, GraphBatchInput, UserInput
 
-__all__ = ['UserInput', 'ApiKeyInput', 'JSONOutput', 'QueryOutput']
+__all__ = ['UserInput', 'ApiKeyInput', 'GraphBatchInput', 'JSONOutput', 'QueryOutput']
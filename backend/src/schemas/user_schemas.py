@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from src.settings import settings
 
 
 class UserInput(BaseModel):
@@ -6,6 +8,10 @@ class UserInput(BaseModel):
     thread_id: str
 
 
+class GraphBatchInput(BaseModel):
+    graph_ids: list[str] = Field(min_length=1, max_length=settings.graph_batch_max_ids)
+
+
 class ApiKeyInput(BaseModel):
     api_key: str
     model_name: str
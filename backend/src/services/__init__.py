@@ -1,13 +1,28 @@
 from .chat_model import Chat, get_chat_service
 from .data_processing import DataHandler
-from .db_services import execute_query, get_graph_db, init_db, insert_graphs_db
+from .db_services import (
+    close_db,
+    execute_query,
+    execute_query_async,
+    get_graph_data_async,
+    get_graph_db,
+    get_graph_db_async,
+    init_db,
+    insert_graphs_db,
+    insert_graphs_db_async,
+)
 
 __all__ = [
     'DataHandler',
     'Chat',
+    'close_db',
     'execute_query',
+    'execute_query_async',
     'insert_graphs_db',
+    'insert_graphs_db_async',
     'get_graph_db',
+    'get_graph_data_async',
+    'get_graph_db_async',
     'init_db',
     'get_chat_service',
 ]
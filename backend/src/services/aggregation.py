@@ -0,0 +1,208 @@
+"""Agregações por grupo (group-by/pivot) com os resultados materializados em cache por versão do conjunto de dados."""
+
+import numpy as np
+import pandas as pd
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .dataset_registry import get_dataframe, get_dataset_version
+
+AGGREGATIONS = ('sum', 'mean', 'count', 'min', 'max', 'median', 'std')
+PERIODS = ('D', 'W', 'M', 'Q', 'Y')
+
+
+def _filter_mask(series: pd.Series, values: list) -> np.ndarray:
+    """Linhas em que a coluna é igual a algum dos valores, convertidos para o tipo da coluna."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.astype(str).isin([str(v) for v in values])
+        return np.isin(series.cat.codes.to_numpy(), np.flatnonzero(categories))
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.isin(pd.to_datetime(values)).to_numpy()
+    if pd.api.types.is_bool_dtype(series):
+        return series.isin([str(v).lower() in ('true', '1') for v in values]).to_numpy()
+    if pd.api.types.is_numeric_dtype(series):
+        return series.isin(pd.to_numeric(values)).to_numpy()
+
+    return series.astype(str).isin([str(v) for v in values]).to_numpy()
+
+
+def _period_start(series: pd.Series, period: str) -> pd.Series:
+    """
+    Início do período (D, W, M, Q ou Y) de cada data, calculado com a aritmética de
+    `datetime64` do NumPy, bem mais rápida que `dt.to_period`. Semanas começam na segunda-feira.
+    """
+    values = series.to_numpy(dtype='datetime64[ns]')
+    unit = {'D': 'D', 'W': 'D', 'M': 'M', 'Q': 'M', 'Y': 'Y'}[period]
+    start = values.astype(f'datetime64[{unit}]')
+
+    if period == 'W':
+        days = start.astype(np.int64)
+        start = (days - (days + 3) % 7).astype(
+            'datetime64[D]'
+        )  # 1970-01-01 foi quinta-feira
+    elif period == 'Q':
+        months = start.astype(np.int64)
+        start = (months - months % 3).astype('datetime64[M]')
+
+    start = np.where(np.isnat(values), np.datetime64('NaT'), start)
+
+    return pd.Series(start.astype('datetime64[ns]'), index=series.index)
+
+
+def _group_codes(series: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """Códigos inteiros dos grupos de uma coluna (-1 para nulos) e os valores de cada código."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int64), series.cat.categories
+
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def compute_aggregate(
+    df: pd.DataFrame,
+    group_by: list[str],
+    value_columns: list[str],
+    aggregations: list[str],
+    filters: dict[str, list] | None = None,
+    date_column: str | None = None,
+    period: str | None = None,
+) -> pd.DataFrame:
+    """
+    Agrega colunas numéricas por grupos. As colunas de agrupamento são convertidas em
+    códigos inteiros (os códigos das colunas `category` são usados diretamente) e
+    combinadas em um único código por linha, sobre o qual o pandas agrega.
+
+    Args:
+        df (DataFrame): Conjunto de dados.
+        group_by (list[str]): Colunas de agrupamento.
+        value_columns (list[str]): Colunas numéricas agregadas; vazio conta as linhas.
+        aggregations (list[str]): Funções de `AGGREGATIONS` aplicadas a cada coluna.
+        filters (dict[str, list] | None, optional): Valores mantidos de cada coluna.
+        date_column (str | None, optional): Coluna de datas agrupada por período.
+        period (str | None, optional): Período de `date_column`: D, W, M, Q ou Y.
+
+    Returns:
+        DataFrame: Uma linha por grupo, com as colunas de agrupamento e as agregações.
+    """
+    invalid = [a for a in aggregations if a not in AGGREGATIONS]
+    if invalid:
+        raise ValueError(
+            f'Invalid aggregation "{invalid[0]}". Choose from {", ".join(AGGREGATIONS)}.'
+        )
+
+    columns = [*group_by, *value_columns, *(filters or {})]
+    columns += [date_column] if date_column else []
+    missing = [c for c in dict.fromkeys(columns) if c not in df.columns]
+    if missing:
+        raise ValueError(f'Columns not found in the dataset: {", ".join(missing)}.')
+
+    non_numeric = [
+        c
+        for c in value_columns
+        if not pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c])
+    ]
+    if non_numeric:
+        raise ValueError(
+            f'Columns must be numeric to aggregate: {", ".join(non_numeric)}.'
+        )
+
+    keys = {column: df[column] for column in group_by}
+
+    if date_column:
+        if period not in PERIODS:
+            raise ValueError(
+                f'Invalid period "{period}". Choose from {", ".join(PERIODS)}.'
+            )
+        if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+            raise ValueError(f'Column "{date_column}" is not a date column.')
+
+        keys[f'{date_column} ({period})'] = _period_start(df[date_column], period)
+
+    if not keys:
+        raise ValueError('At least one group_by column or a date_column is required.')
+
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in (filters or {}).items():
+        mask &= _filter_mask(
+            df[column], values if isinstance(values, list) else [values]
+        )
+
+    # Código único por linha: combinação dos códigos de cada coluna de agrupamento
+    codes, levels = zip(*(_group_codes(series[mask]) for series in keys.values()))
+    valid = np.all(np.stack(codes) >= 0, axis=0)
+    sizes = tuple(max(len(level), 1) for level in levels)
+    combined = np.ravel_multi_index(tuple(c[valid] for c in codes), sizes)
+
+    if value_columns:
+        values = df.loc[mask, value_columns][valid].reset_index(drop=True)
+        result = values.groupby(combined, sort=True).agg(aggregations)
+        result.columns = [f'{agg}({column})' for column, agg in result.columns]
+        result = result.astype(
+            {c: np.float64 for c in result.columns if result[c].dtype == np.float32}
+        )
+    else:
+        result = pd.Series(combined).value_counts(sort=False).sort_index()
+        result = result.rename('count').to_frame()
+
+    positions = np.unravel_index(result.index.to_numpy(), sizes)
+    for name, level, position in zip(keys, levels, positions):
+        result[name] = level.take(position)
+
+    return result[[*keys, *result.columns[: -len(keys)]]].reset_index(drop=True)
+
+
+aggregate_cache = LRUCache(
+    max_items=settings.aggregate_cache_size,
+    max_bytes=settings.aggregate_cache_max_mb * 1024**2,
+    sizeof=lambda df: int(df.memory_usage(deep=True).sum()),
+)
+
+
+def get_aggregate(
+    group_by: list[str],
+    value_columns: list[str] | None = None,
+    aggregations: list[str] | None = None,
+    filters: dict[str, list] | None = None,
+    date_column: str | None = None,
+    period: str | None = None,
+    session: str | None = None,
+) -> pd.DataFrame | None:
+    """
+    Retorna a agregação do conjunto de dados da sessão, materializada em cache por
+    versão do conjunto de dados, colunas de agrupamento, medidas e filtros, de modo
+    que perguntas repetidas e os gráficos montados a partir dela não recalculem.
+    """
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    value_columns = list(value_columns or [])
+    aggregations = list(aggregations or ['sum'])
+    filters = {
+        column: values if isinstance(values, list) else [values]
+        for column, values in (filters or {}).items()
+    }
+    key = (
+        version,
+        tuple(group_by),
+        tuple(value_columns),
+        tuple(aggregations),
+        tuple(sorted((c, tuple(map(str, v))) for c, v in filters.items())),
+        date_column,
+        period,
+    )
+
+    return aggregate_cache.get_or_set(
+        key,
+        lambda: compute_aggregate(
+            get_dataframe(session),
+            list(group_by),
+            value_columns,
+            aggregations,
+            filters,
+            date_column,
+            period,
+        ),
+    )
@@ -0,0 +1,189 @@
+"""Detecção de valores anômalos em todas as colunas numéricas de uma só vez."""
+
+import numpy as np
+import pandas as pd
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .dataset_profile import get_dataset_profile
+from .dataset_registry import get_dataframe, get_dataset_version
+
+# Limite padrão de cada método: múltiplos do IQR, do desvio padrão e do MAD
+METHODS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5}
+
+# Fator que torna o MAD comparável ao desvio padrão em dados normais
+MAD_SCALE = 0.6745
+
+
+def _numeric_columns(df: pd.DataFrame) -> list[str]:
+    return [
+        c
+        for c in df.columns
+        if pd.api.types.is_numeric_dtype(df[c])
+        and not pd.api.types.is_bool_dtype(df[c])
+    ]
+
+
+def _values(df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    return df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _summarize(series: pd.Series, stats: dict) -> dict:
+    """Quartis exatos da coluna e média e desvio padrão, das estatísticas quando houver."""
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    q1, median, q3 = np.nanpercentile(values, [25, 50, 75])
+
+    if stats.get('count'):
+        mean, std = stats['mean'], stats['std']
+    else:
+        mean, std = np.nanmean(values), np.nanstd(values, ddof=1)
+
+    return {'mean': mean, 'std': std, '25%': q1, '50%': median, '75%': q3}
+
+
+def compute_bounds(
+    df: pd.DataFrame,
+    columns: list[str],
+    method: str = 'iqr',
+    threshold: float | None = None,
+    stats: dict[str, dict] | None = None,
+) -> pd.DataFrame:
+    """
+    Calcula os limites inferior e superior de valores normais de cada coluna.
+
+    Args:
+        df (DataFrame): Conjunto de dados.
+        columns (list[str]): Colunas numéricas avaliadas.
+        method (str, optional): 'iqr' (quartis), 'zscore' (média e desvio padrão) ou
+            'mad' (mediana e desvio absoluto mediano).
+        threshold (float | None, optional): Multiplicador do método; o padrão de
+            `METHODS` quando None.
+        stats (dict[str, dict] | None, optional): Estatísticas já calculadas por coluna
+            (no formato de `describe`); a média e o desvio padrão são reutilizados, mas
+            os quartis são sempre calculados dos dados, já que os do sketch das
+            estatísticas incrementais são aproximados em conjuntos grandes.
+
+    Returns:
+        DataFrame: Colunas 'lower' e 'upper', indexado pelo nome das colunas.
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f'Invalid method "{method}". Choose from {", ".join(METHODS)}.'
+        )
+
+    if not columns:
+        return pd.DataFrame(columns=['lower', 'upper'], dtype=np.float64)
+
+    threshold = METHODS[method] if threshold is None else threshold
+    stats = stats or {}
+    summary = pd.DataFrame(
+        {c: _summarize(df[c], stats.get(c, {})) for c in columns}
+    ).T.astype(np.float64)
+
+    if method == 'iqr':
+        iqr = summary['75%'] - summary['25%']
+        lower = summary['25%'] - threshold * iqr
+        upper = summary['75%'] + threshold * iqr
+    elif method == 'zscore':
+        lower = summary['mean'] - threshold * summary['std']
+        upper = summary['mean'] + threshold * summary['std']
+    else:
+        median = summary['50%'].to_numpy()
+        mad = np.nanmedian(np.abs(_values(df, columns) - median), axis=0)
+        spread = pd.Series(threshold * mad / MAD_SCALE, index=columns)
+        lower = summary['50%'] - spread
+        upper = summary['50%'] + spread
+
+    return pd.DataFrame({'lower': lower, 'upper': upper})
+
+
+def scan_anomalies(df: pd.DataFrame, bounds: pd.DataFrame) -> pd.DataFrame:
+    """
+    Conta os valores fora dos limites de todas as colunas, percorrendo os dados em
+    blocos de linhas (todas as colunas de cada bloco avaliadas juntas).
+
+    Returns:
+        DataFrame: Limites, quantidade e percentual de valores anômalos e os valores
+            anômalos mínimo e máximo de cada coluna.
+    """
+    columns = list(bounds.index)
+    lower = bounds['lower'].to_numpy()
+    upper = bounds['upper'].to_numpy()
+    counts = np.zeros(len(columns), dtype=np.int64)
+    valid = np.zeros(len(columns), dtype=np.int64)
+    lowest = np.full(len(columns), np.inf)
+    highest = np.full(len(columns), -np.inf)
+
+    for start in range(0, len(df), settings.csv_chunk_rows):
+        values = _values(df.iloc[start : start + settings.csv_chunk_rows], columns)
+        outside = (values < lower) | (values > upper)
+
+        counts += outside.sum(axis=0)
+        valid += (~np.isnan(values)).sum(axis=0)
+        lowest = np.fmin(lowest, np.where(outside, values, np.inf).min(axis=0))
+        highest = np.fmax(highest, np.where(outside, values, -np.inf).max(axis=0))
+
+    report = bounds.copy()
+    report['outliers'] = counts
+    with np.errstate(divide='ignore', invalid='ignore'):
+        report['pct'] = np.round(100 * counts / valid, 2)
+    report['min_outlier'] = np.where(counts > 0, lowest, np.nan)
+    report['max_outlier'] = np.where(counts > 0, highest, np.nan)
+
+    return report
+
+
+anomaly_cache = LRUCache(max_items=settings.anomaly_cache_size)
+
+
+def get_anomaly_report(
+    method: str = 'iqr', threshold: float | None = None, session: str | None = None
+) -> pd.DataFrame | None:
+    """
+    Retorna o relatório de valores anômalos de todas as colunas numéricas do conjunto
+    de dados da sessão, mantido em cache por versão, método e limite. A média e o
+    desvio padrão vêm do perfil em cache; os quartis e a mediana são exatos.
+    """
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    def build() -> pd.DataFrame:
+        df = get_dataframe(session)
+        profile = get_dataset_profile(session)
+        columns = _numeric_columns(df)
+        stats = {c: profile.columns[c].stats for c in columns}
+        bounds = compute_bounds(df, columns, method, threshold, stats)
+
+        return scan_anomalies(df, bounds)
+
+    return anomaly_cache.get_or_set((version, method, threshold), build)
+
+
+def get_anomaly_rows(
+    column: str,
+    method: str = 'iqr',
+    threshold: float | None = None,
+    offset: int = 0,
+    limit: int = 20,
+    session: str | None = None,
+) -> tuple[pd.DataFrame, int]:
+    """
+    Retorna uma página das linhas com valores anômalos em uma coluna, usando os
+    limites do relatório em cache, e a quantidade total dessas linhas.
+    """
+    df = get_dataframe(session)
+    report = get_anomaly_report(method, threshold, session)
+
+    if column not in df.columns:
+        raise ValueError(f'Column "{column}" not found in the dataset.')
+    if column not in report.index:
+        raise ValueError(f'Column "{column}" is not numeric.')
+
+    lower, upper = report.loc[column, ['lower', 'upper']]
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    positions = np.flatnonzero((values < lower) | (values > upper))
+
+    return df.iloc[positions[offset : offset + limit]], len(positions)
@@ -0,0 +1,137 @@
+"""Agregados calculados no servidor para montar histogramas e box plots sem enviar os dados brutos."""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Histogram:
+    """Limites das faixas e contagem de observações em cada faixa."""
+
+    edges: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def centers(self) -> np.ndarray:
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    @property
+    def widths(self) -> np.ndarray:
+        return np.diff(self.edges)
+
+
+@dataclass
+class BoxStats:
+    """Quartis, bigodes (regra de Tukey, 1,5 x IQR) e os valores extremos de um box plot."""
+
+    count: int
+    mean: float
+    min: float
+    q1: float
+    median: float
+    q3: float
+    max: float
+    lower_fence: float
+    upper_fence: float
+    outliers: np.ndarray
+    n_outliers: int
+
+
+def _values(series: pd.Series) -> np.ndarray:
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return values[~np.isnan(values)]
+
+
+def compute_histogram(series: pd.Series, max_bins: int) -> Histogram:
+    """
+    Agrupa os valores de uma coluna numérica em faixas de mesma largura. A quantidade
+    de faixas segue a regra 'auto' do NumPy (Sturges ou Freedman-Diaconis), limitada a
+    `max_bins`; colunas inteiras com poucos valores usam uma faixa por valor.
+    """
+    values = _values(series)
+
+    if values.size == 0:
+        return Histogram(np.array([0.0, 1.0]), np.array([0]))
+
+    low, high = values.min(), values.max()
+    bins = len(np.histogram_bin_edges(values, bins='auto'))
+
+    if pd.api.types.is_integer_dtype(series) and high - low < max_bins:
+        bins = int(high - low) + 1
+        low, high = low - 0.5, high + 0.5
+
+    counts, edges = np.histogram(values, bins=min(bins, max_bins), range=(low, high))
+
+    return Histogram(edges, counts)
+
+
+def compute_box_stats(values: np.ndarray, max_outliers: int) -> BoxStats:
+    """
+    Calcula as estatísticas de um box plot. Quando há mais de `max_outliers` valores
+    fora dos bigodes, são mantidos apenas os mais extremos de cada lado.
+    """
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lower_fence, upper_fence = inside.min(), inside.max()
+
+    low = values[values < lower_fence]
+    high = values[values > upper_fence]
+    n_outliers = low.size + high.size
+
+    # O limite é dividido entre os dois lados; a sobra de um lado vai para o outro
+    if n_outliers > max_outliers:
+        keep_low = min(low.size, max(max_outliers // 2, max_outliers - high.size))
+        keep_high = max_outliers - keep_low
+
+        if keep_low < low.size:
+            low = np.partition(low, keep_low)[:keep_low]
+        if keep_high < high.size:
+            high = np.partition(high, -keep_high)[-keep_high:]
+
+    return BoxStats(
+        count=values.size,
+        mean=float(values.mean()),
+        min=float(values.min()),
+        q1=float(q1),
+        median=float(median),
+        q3=float(q3),
+        max=float(values.max()),
+        lower_fence=float(lower_fence),
+        upper_fence=float(upper_fence),
+        outliers=np.concatenate([low, high]),
+        n_outliers=n_outliers,
+    )
+
+
+def compute_box_groups(
+    df: pd.DataFrame, y_column: str, x_column: str | None, max_outliers: int
+) -> dict[str, BoxStats]:
+    """
+    Calcula as estatísticas de box plot de `y_column`, para cada valor de `x_column`
+    quando informado. Os valores são ordenados por grupo uma única vez e separados
+    em fatias, sem um `groupby` por grupo.
+    """
+    if x_column is None:
+        values = _values(df[y_column])
+        return (
+            {y_column: compute_box_stats(values, max_outliers)} if values.size else {}
+        )
+
+    codes, groups = pd.factorize(df[x_column], sort=True)
+    values = df[y_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+    values = values[order]
+
+    return {
+        str(group): compute_box_stats(values[start:end], max_outliers)
+        for group, start, end in zip(groups, bounds[:-1], bounds[1:])
+        if end > start
+    }
@@ -0,0 +1,90 @@
+"""Identidade dos gráficos pelo conteúdo: ferramenta, argumentos e versão do conjunto de dados."""
+
+import functools
+import inspect
+import json
+import time
+import uuid
+from collections.abc import Callable
+from contextvars import ContextVar
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .dataset_registry import get_dataset_version
+
+# Namespace dos UUIDs (versão 5) dos gráficos, que cabem na coluna `uuid` da tabela
+CHART_NAMESPACE = uuid.UUID('6f1c3a52-8d4e-4b7a-9e2f-0c5d8a1b3e47')
+
+# ID do gráfico em geração, usado ao salvá-lo no banco de dados
+current_chart_id: ContextVar[str | None] = ContextVar('current_chart_id', default=None)
+
+chart_cache = LRUCache(max_items=settings.chart_dedup_cache_size)
+
+# Tempo de geração economizado pelos gráficos reaproveitados (segundos)
+saved_seconds = 0.0
+
+
+def chart_id(tool_name: str, arguments: dict, version: str) -> str:
+    """UUID determinístico do gráfico gerado por uma ferramenta com esses argumentos e dados."""
+    # Listas e textos vazios equivalem a argumentos omitidos
+    arguments = {
+        name: None if value in ('', [], {}) else value
+        for name, value in arguments.items()
+    }
+    key = json.dumps(
+        {'tool': tool_name, 'arguments': arguments, 'version': version},
+        sort_keys=True,
+        default=str,
+    )
+
+    return str(uuid.uuid5(CHART_NAMESPACE, key))
+
+
+def deduplicate_chart(func: Callable[..., dict | str]) -> Callable[..., dict | str]:
+    """
+    Decorador das ferramentas de gráficos: o ID do gráfico é derivado do nome da
+    ferramenta, dos argumentos normalizados (com os valores padrão) e da versão do
+    conjunto de dados. Uma chamada repetida retorna o resultado anterior, com o mesmo
+    graph_id, sem gerar nem salvar o gráfico novamente.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global saved_seconds
+
+        version = get_dataset_version()
+
+        if version is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        graph_id = chart_id(func.__name__, bound.arguments, version)
+
+        cached = chart_cache.get(graph_id)
+        if cached is not None:
+            result, elapsed = cached
+            saved_seconds += elapsed
+            return dict(result)
+
+        token = current_chart_id.set(graph_id)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            current_chart_id.reset(token)
+
+        # Apenas gráficos gerados com sucesso são reaproveitados, não as mensagens de erro
+        if isinstance(result, dict) and result.get('graph_id') == graph_id:
+            chart_cache.set(graph_id, (dict(result), time.perf_counter() - start))
+
+        return result
+
+    return wrapper
+
+
+def get_dedup_stats() -> dict:
+    """Acertos e falhas do reaproveitamento de gráficos e o tempo de geração economizado."""
+    return {**chart_cache.stats(), 'saved_seconds': round(saved_seconds, 3)}
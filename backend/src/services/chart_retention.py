@@ -0,0 +1,175 @@
+"""Retenção dos gráficos salvos: exclusão em lotes dos gráficos expirados ou excedentes e recuperação do espaço em disco."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.settings import settings
+
+from .chart_identity import chart_cache, get_dedup_stats
+from .chart_writer import chart_writer
+from .db_services import enable_incremental_vacuum, engine, execute_query
+from .graph_cache import graph_cache
+
+# Tamanho do gráfico salvo em qualquer um dos formatos; no SQLite, `length` de um BLOB
+# não lê o conteúdo
+PAYLOAD_SIZE = 'COALESCE(length(graph_data), 0) + COALESCE(length(graph_json), 0)'
+
+# Gráficos mais antigos que o prazo, pelo índice de `created_at`
+SELECT_EXPIRED = text(
+    'SELECT "uuid" FROM charts WHERE created_at < :cutoff ORDER BY created_at LIMIT :limit'
+)
+# Gráficos além dos `keep` mais recentes
+SELECT_OVER_ROWS = text(
+    'SELECT "uuid" FROM charts ORDER BY created_at DESC, "uuid" DESC LIMIT :limit OFFSET :keep'
+)
+# Gráficos a partir dos quais o total acumulado, dos mais recentes para os mais antigos,
+# passa de `max_bytes`
+SELECT_OVER_SIZE = text(
+    f'SELECT "uuid" FROM (SELECT "uuid", created_at, SUM({PAYLOAD_SIZE}) '
+    'OVER (ORDER BY created_at DESC, "uuid" DESC) AS total FROM charts) '
+    'WHERE total > :max_bytes ORDER BY created_at LIMIT :limit'
+)
+DELETE_GRAPHS = text('DELETE FROM charts WHERE "uuid" IN :graph_ids').bindparams(
+    bindparam('graph_ids', expanding=True)
+)
+SELECT_STATS = text(
+    f'SELECT COUNT(*) AS charts, SUM({PAYLOAD_SIZE}) AS payload_bytes, '
+    'MIN(created_at) AS oldest, MAX(created_at) AS newest FROM charts'
+)
+
+
+def _delete_batches(select, params: dict) -> int:
+    """
+    Exclui, em transações de até `chart_compaction_batch_size` gráficos, os gráficos
+    retornados por `select` até que não reste nenhum, removendo-os também do cache e
+    do reaproveitamento, para que uma chamada repetida não retorne um graph_id excluído.
+    """
+    deleted = 0
+
+    while True:
+        graph_ids = (
+            execute_query(
+                select, {**params, 'limit': settings.chart_compaction_batch_size}
+            )
+            .scalars()
+            .all()
+        )
+
+        if not graph_ids:
+            return deleted
+
+        execute_query(DELETE_GRAPHS, {'graph_ids': graph_ids}, commit=True)
+        for graph_id in graph_ids:
+            graph_cache.pop(graph_id)
+            chart_cache.pop(graph_id)
+        deleted += len(graph_ids)
+
+
+def _incremental_vacuum() -> int:
+    """Devolve ao sistema as páginas livres do SQLite em etapas curtas, retornando quantas."""
+    if engine.dialect.name != 'sqlite':
+        return 0
+
+    reclaimed = 0
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        free = conn.exec_driver_sql('PRAGMA freelist_count').scalar()
+
+        while free:
+            pages = min(free, settings.chart_vacuum_pages)
+            conn.exec_driver_sql(f'PRAGMA incremental_vacuum({pages})')
+            remaining = conn.exec_driver_sql('PRAGMA freelist_count').scalar()
+
+            # Sem `auto_vacuum` incremental o pragma não devolve nenhuma página
+            if remaining >= free:
+                break
+            reclaimed, free = reclaimed + free - remaining, remaining
+
+    return reclaimed
+
+
+def compact_charts() -> dict:
+    """
+    Aplica os limites de retenção configurados (idade, quantidade e tamanho total),
+    excluindo primeiro os gráficos mais antigos, e recupera o espaço liberado.
+
+    Returns:
+        dict: Gráficos excluídos por limite e páginas devolvidas pelo vacuum.
+    """
+    result = {'expired': 0, 'over_rows': 0, 'over_size': 0}
+
+    if settings.chart_ttl_days is not None:
+        cutoff = datetime.now(UTC) - timedelta(days=settings.chart_ttl_days)
+        result['expired'] = _delete_batches(
+            SELECT_EXPIRED, {'cutoff': cutoff.strftime('%Y-%m-%d %H:%M:%S')}
+        )
+
+    if settings.chart_max_rows is not None:
+        result['over_rows'] = _delete_batches(
+            SELECT_OVER_ROWS, {'keep': settings.chart_max_rows}
+        )
+
+    if settings.chart_max_mb is not None:
+        result['over_size'] = _delete_batches(
+            SELECT_OVER_SIZE, {'max_bytes': settings.chart_max_mb * 1024**2}
+        )
+
+    result['vacuumed_pages'] = _incremental_vacuum()
+
+    return result
+
+
+async def run_compaction() -> None:
+    """
+    Executa a compactação periodicamente, fora do loop de eventos, até ser cancelada.
+    Antes, ativa o `auto_vacuum` incremental em um banco criado sem ele.
+    """
+    try:
+        if await asyncio.to_thread(enable_incremental_vacuum):
+            print('Charts database vacuumed to enable incremental auto_vacuum.')
+    except SQLAlchemyError as e:
+        print(f'Enabling incremental auto_vacuum failed: {e}')
+
+    while True:
+        try:
+            result = await asyncio.to_thread(compact_charts)
+            if any(result.values()):
+                print(f'Charts compaction: {result}')
+        except SQLAlchemyError as e:
+            print(f'Charts compaction failed: {e}')
+
+        await asyncio.sleep(settings.chart_compaction_interval_seconds)
+
+
+def get_storage_stats() -> dict:
+    """Ocupação da tabela de gráficos, do arquivo do banco de dados e do cache de gráficos."""
+    row = execute_query(SELECT_STATS).one()
+
+    stats = {
+        'charts': row.charts,
+        'payload_bytes': row.payload_bytes or 0,
+        'oldest': row.oldest,
+        'newest': row.newest,
+        'pending_writes': len(chart_writer),
+        'cache': graph_cache.stats(),
+        'deduplication': get_dedup_stats(),
+        'retention': {
+            'ttl_days': settings.chart_ttl_days,
+            'max_rows': settings.chart_max_rows,
+            'max_mb': settings.chart_max_mb,
+        },
+    }
+
+    if engine.dialect.name == 'sqlite':
+        with engine.connect() as conn:
+            page_size = conn.exec_driver_sql('PRAGMA page_size').scalar()
+            page_count = conn.exec_driver_sql('PRAGMA page_count').scalar()
+            freelist = conn.exec_driver_sql('PRAGMA freelist_count').scalar()
+
+        stats['file_bytes'] = page_size * page_count
+        stats['free_bytes'] = page_size * freelist
+
+    return stats
@@ -0,0 +1,171 @@
+"""Especificações compactas dos gráficos, renderizadas como figuras do Plotly apenas quando lidas."""
+
+import json
+import struct
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
+from plotly.basedatatypes import BaseFigure
+
+
+@dataclass
+class ChartSpec:
+    """
+    Descrição declarativa de um gráfico: o tipo, as tabelas já agregadas que ele exibe,
+    as opções de apresentação e a versão do conjunto de dados de origem.
+    """
+
+    kind: str
+    tables: dict[str, pd.DataFrame]
+    options: dict = field(default_factory=dict)
+    version: str | None = None
+
+    def dumps(self) -> bytes:
+        """
+        Serializa a especificação: o tamanho do cabeçalho (4 bytes), o cabeçalho em
+        JSON e as tabelas no formato IPC do Arrow, em sequência.
+        """
+        tables = {name: _table_bytes(table) for name, table in self.tables.items()}
+        header = json.dumps(
+            {
+                'kind': self.kind,
+                'options': self.options,
+                'version': self.version,
+                'tables': {name: len(data) for name, data in tables.items()},
+            }
+        ).encode()
+
+        return b''.join([struct.pack('<I', len(header)), header, *tables.values()])
+
+    @classmethod
+    def loads(cls, payload: bytes) -> 'ChartSpec':
+        (size,) = struct.unpack_from('<I', payload)
+        spec = json.loads(payload[4 : 4 + size])
+
+        tables, offset = {}, 4 + size
+        for name, length in spec['tables'].items():
+            data = payload[offset : offset + length]
+            tables[name] = pa.ipc.open_stream(data).read_pandas()
+            offset += length
+
+        return cls(spec['kind'], tables, spec['options'], spec['version'])
+
+    @classmethod
+    def from_figure(cls, fig: BaseFigure) -> 'ChartSpec':
+        """Especificação de uma figura já montada (ex.: pela ferramenta de código Python)."""
+        return cls('figure', {}, {'json': fig.to_json()})
+
+    def render(self) -> BaseFigure:
+        """Monta a figura do Plotly descrita pela especificação."""
+        if self.kind not in RENDERERS:
+            raise ValueError(f'Unknown chart kind "{self.kind}".')
+
+        return RENDERERS[self.kind](self)
+
+
+def _table_bytes(table: pd.DataFrame) -> bytes:
+    # Índices inteiros são posições das linhas no conjunto de dados, sem uso nos
+    # gráficos; apenas índices com rótulos (ex.: matriz de correlação) são guardados
+    if pd.api.types.is_integer_dtype(table.index):
+        table = table.reset_index(drop=True)
+
+    sink = pa.BufferOutputStream()
+    arrow_table = pa.Table.from_pandas(table)
+
+    with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+        writer.write_table(arrow_table)
+
+    return sink.getvalue().to_pybytes()
+
+
+RENDERERS: dict[str, Callable[[ChartSpec], BaseFigure]] = {}
+
+
+def renderer(kind: str):
+    """Registra a função que monta as figuras de um tipo de gráfico."""
+
+    def register(func: Callable[[ChartSpec], BaseFigure]):
+        RENDERERS[kind] = func
+        return func
+
+    return register
+
+
+def _express_renderer(function: Callable[..., BaseFigure]):
+    """Gráficos do Plotly Express: a tabela `data` e as opções são os argumentos da função."""
+
+    def render(spec: ChartSpec) -> BaseFigure:
+        return function(spec.tables['data'], **spec.options)
+
+    return render
+
+
+RENDERERS.update(
+    scatter=_express_renderer(px.scatter),
+    bar=_express_renderer(px.bar),
+    line=_express_renderer(px.line),
+)
+
+
+@renderer('histogram')
+def _render_histogram(spec: ChartSpec) -> BaseFigure:
+    bins = spec.tables['bins']
+    column = spec.options['column']
+
+    fig = go.Figure(
+        go.Bar(x=bins['centers'], y=bins['counts'], width=bins['widths'], name=column)
+    )
+    fig.update_layout(bargap=0, xaxis_title=column, yaxis_title='count')
+
+    return fig
+
+
+@renderer('box')
+def _render_box(spec: ChartSpec) -> BaseFigure:
+    boxes = spec.tables['boxes']
+    outliers = spec.tables['outliers']
+    x_column, y_column = spec.options['x_column'], spec.options['y_column']
+
+    fig = go.Figure(
+        go.Box(
+            x=boxes['name'].tolist(),
+            q1=boxes['q1'].tolist(),
+            median=boxes['median'].tolist(),
+            q3=boxes['q3'].tolist(),
+            lowerfence=boxes['lower_fence'].tolist(),
+            upperfence=boxes['upper_fence'].tolist(),
+            mean=boxes['mean'].tolist(),
+            name=y_column,
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=outliers['name'].tolist(),
+            y=outliers['value'].to_numpy(),
+            mode='markers',
+            name='outliers',
+        )
+    )
+    fig.update_layout(
+        title=spec.options['title'],
+        xaxis_title=x_column,
+        yaxis_title=y_column,
+        showlegend=False,
+    )
+
+    return fig
+
+
+@renderer('figure')
+def _render_figure(spec: ChartSpec) -> BaseFigure:
+    return pio.from_json(spec.options['json'])
+
+
+@renderer('heatmap')
+def _render_heatmap(spec: ChartSpec) -> BaseFigure:
+    return px.imshow(spec.tables['matrix'], text_auto=True, **spec.options)
@@ -0,0 +1,160 @@
+"""Gravação dos gráficos em segundo plano, agrupando as inserções em transações."""
+
+import atexit
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+from src.utils.exceptions import DatabaseFailedException
+
+from .chart_identity import chart_cache
+from .chart_specs import ChartSpec
+from .db_services import (
+    FORMAT_SPEC,
+    compress_graph,
+    compress_spec,
+    insert_compressed_graphs_db,
+)
+
+
+@dataclass
+class PendingChart:
+    """
+    Gráfico aguardando gravação. A especificação é serializada uma única vez e a
+    figura só é renderizada se o gráfico for lido antes de ser gravado.
+    """
+
+    graph_id: str
+    spec: ChartSpec
+    metadata: str | None
+    _data: bytes | None = field(default=None, repr=False)
+
+    @property
+    def data(self) -> bytes:
+        """Especificação comprimida, salva no banco de dados."""
+        if self._data is None:
+            self._data = compress_spec(self.spec)
+
+        return self._data
+
+    def render(self) -> bytes:
+        """JSON da figura comprimido com gzip."""
+        return compress_graph(self.spec.render().to_json())
+
+
+class ChartWriter:
+    """
+    Recebe os gráficos gerados pelas ferramentas e os grava em uma thread própria,
+    em transações de até `batch_size` gráficos. Enquanto não são gravados, os gráficos
+    ficam disponíveis para leitura em `get_pending`. Os gráficos cuja gravação falhou
+    deixam de ser reaproveitados e sua leitura levanta `DatabaseFailedException`.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[PendingChart | None] = queue.Queue()
+        self._pending: dict[str, PendingChart] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        # IDs dos gráficos que não puderam ser gravados, no máximo um por gráfico reaproveitável
+        self._failed = LRUCache(max_items=settings.chart_dedup_cache_size)
+
+    def submit(self, graph_id: str, spec: ChartSpec, metadata: str | None) -> None:
+        """Agenda a gravação do gráfico, retornando imediatamente."""
+        chart = PendingChart(graph_id, spec, metadata)
+
+        with self._lock:
+            self._pending[graph_id] = chart
+            self._failed.pop(graph_id)
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='chart-writer', daemon=True
+                )
+                self._thread.start()
+
+            self._queue.put(chart)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def get_pending(self, graph_id: str) -> PendingChart | None:
+        """
+        Retorna o gráfico se ele ainda não foi gravado no banco de dados.
+
+        Raises:
+            DatabaseFailedException: Quando a gravação do gráfico falhou.
+        """
+        if graph_id in self._failed:
+            raise DatabaseFailedException(
+                f'The graph {graph_id} could not be saved, please generate it again.'
+            )
+
+        return self._pending.get(graph_id)
+
+    def close(self) -> None:
+        """Grava os gráficos pendentes e encerra a thread de gravação."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        stop = False
+
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            # Agrupa os gráficos que chegarem até o prazo ou até completar o lote
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(
+                        self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    )
+                except queue.Empty:
+                    break
+
+            if batch[-1] is None:
+                stop = True
+                batch.pop()
+
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[PendingChart]) -> None:
+        rows = [(chart.graph_id, chart.data, chart.metadata) for chart in batch]
+
+        try:
+            insert_compressed_graphs_db(rows, FORMAT_SPEC)
+        except SQLAlchemyError:
+            # Grava um a um para não perder o lote inteiro por causa de um gráfico; o
+            # erro de cada um já é exibido por `execute_query`
+            for row in rows:
+                try:
+                    insert_compressed_graphs_db([row], FORMAT_SPEC)
+                except SQLAlchemyError:
+                    # Uma chamada repetida da ferramenta gera o gráfico novamente
+                    chart_cache.pop(row[0])
+                    self._failed.set(row[0], True)
+
+        with self._lock:
+            for chart in batch:
+                self._pending.pop(chart.graph_id, None)
+
+
+chart_writer = ChartWriter(
+    settings.chart_write_batch_size, settings.chart_flush_interval_seconds
+)
+
+# Garante a gravação dos gráficos pendentes quando o processo termina
+atexit.register(chart_writer.close)
@@ -4,6 +4,7 @@ from pydantic_core import ValidationError
 
 from src.agents import SupervisorAgent
 from src.schemas import ApiKeyInput, JSONOutput
+from src.services.dataset_registry import DEFAULT_SESSION, current_session
 from src.settings import settings
 from src.utils.exceptions import APIKeyNotFoundException, ModelNotFoundException
 
@@ -21,17 +22,24 @@ MODELS = {
 class Chat:
     """
     Representa o serviço de chat que interage com o Agente Supervisor.
-    Esta classe deve ser gerenciada como um singleton para preservar o histórico de chat.
+    Esta classe deve ser gerenciada como um singleton para preservar o histórico de chat
+    de cada sessão.
     """
 
     def __init__(self, agent: SupervisorAgent):
         self.agent = agent
 
-    async def send_prompt(self, user_input: str):
+    async def send_prompt(self, user_input: str, thread_id: str = DEFAULT_SESSION):
         """
         Envia a entrada do usuário para o Agente Supervisor e processa a resposta.
+        As ferramentas dos agentes acessam o conjunto de dados da sessão `thread_id` e o
+        supervisor usa a memória de conversa dessa sessão.
         """
-        response: str = self.agent.run(user_input)
+        token = current_session.set(thread_id)
+        try:
+            response = await self.agent.arun(user_input, thread_id)
+        finally:
+            current_session.reset(token)
         content = response['output'].strip('`').replace('json', '', 1)
 
         # Tenta converter a string de conteúdo em um objeto JSON tipado (JSONOutput).
@@ -0,0 +1,213 @@
+"""Agrupamento (K-Means) escalável, com modelos mantidos em cache por versão do conjunto de dados."""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .dataset_registry import get_dataframe, get_dataset_version
+
+
+@dataclass
+class ClusterModel:
+    """
+    Modelo K-Means ajustado sobre colunas padronizadas e o grupo de cada linha do
+    conjunto de dados (-1 nas linhas com valores nulos nas colunas usadas).
+    """
+
+    columns: tuple[str, ...]
+    scaler: StandardScaler
+    model: KMeans | MiniBatchKMeans
+    labels: np.ndarray
+
+    @property
+    def n_clusters(self) -> int:
+        return self.model.n_clusters
+
+    def centers(self) -> pd.DataFrame:
+        """Retorna os centros dos grupos na escala original das colunas."""
+        centers = self.scaler.inverse_transform(self.model.cluster_centers_)
+
+        return pd.DataFrame(centers, columns=list(self.columns))
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """Atribui novas linhas aos grupos já encontrados."""
+        values = df[list(self.columns)].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        return self.model.predict(self.scaler.transform(values))
+
+
+def _feature_values(
+    df: pd.DataFrame, columns: tuple[str, ...]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna os valores das colunas numéricas do agrupamento nas linhas sem valores
+    nulos e a máscara dessas linhas.
+    """
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f'Columns not found in the dataset: {", ".join(missing)}.')
+
+    non_numeric = [
+        c
+        for c in columns
+        if not pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c])
+    ]
+    if non_numeric:
+        raise ValueError(
+            f'Columns must be numeric for clustering: {", ".join(non_numeric)}.'
+        )
+
+    values = df[list(columns)].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = ~np.isnan(values).any(axis=1)
+    if not valid.any():
+        raise ValueError('No rows without null values in the selected columns.')
+
+    return values[valid], valid
+
+
+def _sample(values: np.ndarray, size: int) -> np.ndarray:
+    if len(values) <= size:
+        return values
+
+    rng = np.random.default_rng(42)
+    return values[rng.choice(len(values), size, replace=False)]
+
+
+def _new_model(n_clusters: int, rows: int) -> KMeans | MiniBatchKMeans:
+    """K-Means completo para conjuntos pequenos e mini-batch para os grandes."""
+    if rows > settings.cluster_minibatch_threshold:
+        return MiniBatchKMeans(
+            n_clusters=n_clusters,
+            batch_size=settings.cluster_batch_size,
+            n_init=3,
+            random_state=42,
+        )
+
+    return KMeans(n_clusters=n_clusters, n_init=10, random_state=42)
+
+
+def fit_clusters(
+    df: pd.DataFrame, columns: tuple[str, ...], n_clusters: int
+) -> ClusterModel:
+    """
+    Ajusta o K-Means sobre as colunas padronizadas. O modelo é ajustado sobre uma
+    amostra de até `cluster_sample_rows` linhas (em mini-batches quando grande) e
+    depois usado para rotular todas as linhas.
+
+    Args:
+        df (DataFrame): Conjunto de dados.
+        columns (tuple[str, ...]): Colunas numéricas usadas como atributos.
+        n_clusters (int): Quantidade de grupos.
+
+    Returns:
+        ClusterModel: O modelo ajustado e os rótulos de cada linha de `df`.
+    """
+    if n_clusters < 2:
+        raise ValueError('The number of clusters must be at least 2.')
+
+    values, valid = _feature_values(df, columns)
+
+    if len(values) < n_clusters:
+        raise ValueError(
+            f'Not enough rows ({len(values)}) to find {n_clusters} clusters.'
+        )
+
+    sample = _sample(values, settings.cluster_sample_rows)
+    scaler = StandardScaler().fit(sample)
+    model = _new_model(n_clusters, len(sample)).fit(scaler.transform(sample))
+    labels = np.full(len(df), -1, dtype=np.int16)
+    labels[valid] = model.predict(scaler.transform(values))
+
+    return ClusterModel(columns, scaler, model, labels)
+
+
+def _score_k(values: np.ndarray, n_clusters: int) -> dict:
+    model = _new_model(n_clusters, len(values)).fit(values)
+    silhouette = silhouette_score(
+        values,
+        model.labels_,
+        sample_size=min(len(values), settings.cluster_silhouette_rows),
+        random_state=42,
+    )
+
+    return {
+        'n_clusters': n_clusters,
+        'inertia': float(model.inertia_),
+        'silhouette': float(silhouette),
+    }
+
+
+def sweep_clusters(
+    df: pd.DataFrame, columns: tuple[str, ...], max_clusters: int
+) -> pd.DataFrame:
+    """
+    Avalia de 2 a `max_clusters` grupos sobre uma amostra padronizada, em paralelo
+    (um processo por valor de k), retornando a inércia (método do cotovelo) e o
+    coeficiente de silhueta de cada um.
+    """
+    values, _ = _feature_values(df, columns)
+    sample = _sample(values, settings.cluster_sample_rows)
+    sample = StandardScaler().fit_transform(sample)
+    ks = range(2, min(max_clusters, len(sample) - 1) + 1)
+
+    if not ks:
+        raise ValueError('Not enough rows to evaluate the number of clusters.')
+
+    scores = Parallel(n_jobs=settings.cluster_workers)(
+        delayed(_score_k)(sample, k) for k in ks
+    )
+
+    return pd.DataFrame(scores).set_index('n_clusters')
+
+
+cluster_cache = LRUCache(max_items=settings.cluster_cache_size)
+
+
+def get_cluster_model(
+    columns: list[str], n_clusters: int | None = None, session: str | None = None
+) -> ClusterModel | None:
+    """
+    Retorna o modelo de agrupamento do conjunto de dados da sessão, mantido em cache
+    por versão do conjunto de dados, colunas e quantidade de grupos. Quando
+    `n_clusters` é omitido, usa a quantidade com o maior coeficiente de silhueta.
+    """
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    columns = tuple(columns)
+
+    if n_clusters is None:
+        scores = get_cluster_scores(columns, settings.cluster_max_k, session)
+        n_clusters = int(scores['silhouette'].idxmax())
+
+    return cluster_cache.get_or_set(
+        (version, columns, n_clusters),
+        lambda: fit_clusters(get_dataframe(session), columns, n_clusters),
+    )
+
+
+def get_cluster_scores(
+    columns: list[str], max_clusters: int, session: str | None = None
+) -> pd.DataFrame | None:
+    """Retorna a avaliação de quantidades de grupos, mantida em cache como os modelos."""
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    columns = tuple(columns)
+
+    return cluster_cache.get_or_set(
+        (version, columns, 'sweep', max_clusters),
+        lambda: sweep_clusters(get_dataframe(session), columns, max_clusters),
+    )
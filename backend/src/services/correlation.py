@@ -0,0 +1,138 @@
+"""Matrizes de correlação calculadas uma vez por versão do conjunto de dados e reutilizadas pelas ferramentas."""
+
+import numpy as np
+import pandas as pd
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .dataset_registry import get_dataframe, get_dataset_version
+
+METHODS = ('pearson', 'spearman')
+
+
+def _pairwise_pearson(values: np.ndarray) -> np.ndarray:
+    """
+    Correlação de Pearson entre as colunas de `values`, usando em cada par apenas as
+    linhas em que os dois valores são válidos (como o pandas). Sem valores ausentes,
+    basta um produto de matrizes; com eles, todas as somas por par são obtidas com
+    produtos de matrizes sobre a máscara de valores válidos. Além da máscara, apenas a
+    cópia centralizada dos dados e a máscara como float64 têm o tamanho dos dados.
+    """
+    mask = ~np.isnan(values)
+
+    if mask.all():
+        # Centralizar as colunas reduz o cancelamento numérico nas somas abaixo
+        centered = values - values.mean(axis=0)
+        cov = centered.T @ centered
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(np.diag(cov))
+            corr = cov / np.outer(std, std)
+
+        return np.clip(corr, -1.0, 1.0)
+
+    # Cópia com os valores ausentes zerados, centralizada pela média dos valores válidos
+    centered = np.where(mask, values, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centered -= centered.sum(axis=0) / mask.sum(axis=0)
+    np.copyto(centered, 0.0, where=~mask)
+    weights = mask.astype(np.float64)
+    del mask
+
+    n = weights.T @ weights
+    sum_x = centered.T @ weights  # soma de x_i nas linhas em que x_j também é válido
+    sum_xy = centered.T @ centered
+    sum_xx = np.multiply(centered, centered, out=centered).T @ weights
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var = sum_xx - sum_x**2 / n
+        corr = cov / np.sqrt(var * var.T)
+
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def compute_correlation(
+    df: pd.DataFrame,
+    method: str = 'pearson',
+    columns: list[str] | None = None,
+    sample_rows: int | None = None,
+) -> pd.DataFrame:
+    """
+    Calcula a matriz de correlação das colunas numéricas de um DataFrame.
+
+    Args:
+        df (DataFrame): Conjunto de dados.
+        method (str, optional): 'pearson' ou 'spearman'.
+        columns (list[str] | None, optional): Colunas usadas; todas as numéricas quando None.
+        sample_rows (int | None, optional): Quando informado e menor que a quantidade de
+            linhas, a matriz é estimada a partir de uma amostra aleatória desse tamanho.
+
+    Returns:
+        DataFrame: A matriz de correlação, indexada pelos nomes das colunas.
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f'Invalid method "{method}". Choose from {", ".join(METHODS)}.'
+        )
+
+    if columns is None:
+        numeric_df = df.select_dtypes(include='number')
+    else:
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f'Columns not found in the dataset: {", ".join(missing)}.')
+
+        numeric_df = df[columns]
+        non_numeric = [
+            c
+            for c in columns
+            if not pd.api.types.is_numeric_dtype(numeric_df[c])
+            or pd.api.types.is_bool_dtype(numeric_df[c])
+        ]
+        if non_numeric:
+            raise ValueError(f'Columns are not numeric: {", ".join(non_numeric)}.')
+
+    if sample_rows and len(numeric_df) > sample_rows:
+        numeric_df = numeric_df.sample(n=sample_rows, random_state=0)
+
+    # Na correlação de Spearman, os postos são calculados por coluna, sobre os valores válidos
+    if method == 'spearman':
+        numeric_df = numeric_df.rank()
+
+    values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    corr = _pairwise_pearson(values)
+
+    return pd.DataFrame(corr, index=numeric_df.columns, columns=numeric_df.columns)
+
+
+correlation_cache = LRUCache(max_items=settings.correlation_cache_size)
+
+
+def get_correlation(
+    method: str = 'pearson',
+    columns: list[str] | None = None,
+    approximate: bool = False,
+    session: str | None = None,
+) -> pd.DataFrame | None:
+    """
+    Retorna a matriz de correlação do conjunto de dados da sessão. A matriz é calculada
+    uma única vez por versão do conjunto de dados, método e colunas. No modo aproximado,
+    conjuntos com mais de `correlation_sample_rows` linhas são amostrados.
+    """
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    sample_rows = settings.correlation_sample_rows if approximate else None
+    key = (version, method, tuple(columns) if columns else None, sample_rows)
+
+    return correlation_cache.get_or_set(
+        key,
+        lambda: compute_correlation(
+            get_dataframe(session), method, columns, sample_rows
+        ),
+    )
@@ -0,0 +1,154 @@
+"""Serviço para compactação dos tipos de dados de um DataFrame carregado."""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.settings import settings
+
+# Valores como 2024-01-31, 31/01/2024 ou 2024-01-31 10:00:00
+DATE_PATTERN = re.compile(
+    r'^\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}([ T]\d{1,2}:\d{2}(:\d{2})?)?'
+)
+DATE_SAMPLE_SIZE = 1000
+# Limites do menor tipo dos inteiros compactados
+INT32 = np.iinfo(np.int32)
+
+
+def _memory_usage(df: pd.DataFrame) -> int:
+    """Retorna o uso de memória do DataFrame em bytes, incluindo objetos Python."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _downcast_numeric(series: pd.Series) -> pd.Series:
+    """
+    Reduz a precisão de uma coluna numérica sem prejudicar as contas feitas com ela.
+    Inteiros são convertidos no máximo para int32 (com sinal): tipos sem sinal ou menores
+    estouram em operações comuns (ex.: `qty - ret` negativo ou `valor * 2` em uint8,
+    também no DuckDB). Colunas float só são convertidas para float32 quando a conversão
+    não altera nenhum valor, preservando valores monetários.
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return series
+
+    if pd.api.types.is_integer_dtype(series):
+        minimum, maximum = series.min(), series.max()
+        if series.dtype.itemsize <= 4 or pd.isna(minimum):
+            return series
+
+        if INT32.min <= minimum and maximum <= INT32.max:
+            nullable = isinstance(series.dtype, pd.api.extensions.ExtensionDtype)
+            return series.astype('Int32' if nullable else np.int32)
+
+        return series
+
+    if series.dtype == np.float64:
+        converted = series.astype(np.float32)
+        if np.array_equal(
+            converted.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True
+        ):
+            return converted
+
+    return series
+
+
+def parse_dates(series: pd.Series) -> pd.Series | None:
+    """
+    Converte uma coluna de texto para datetime quando todos os valores são datas.
+    Uma amostra dos valores é verificada antes, descartando rapidamente colunas que
+    não são de datas. Datas no formato brasileiro (dia/mês/ano) são interpretadas com `dayfirst`.
+
+    Returns:
+        Series | None: A coluna convertida ou None se algum valor não for uma data.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _parse_categorical_dates(series)
+
+    sample = series.dropna()
+    sample = sample.sample(min(len(sample), DATE_SAMPLE_SIZE), random_state=0)
+
+    if sample.empty or not sample.astype(str).str.match(DATE_PATTERN).all():
+        return None
+
+    dayfirst = bool(sample.astype(str).str.match(r'^\d{1,2}[-/.]').all())
+
+    # Sem `errors='coerce'`: um valor fora da amostra que não é data mantém a coluna
+    # como texto em vez de ser perdido como NaT
+    try:
+        return pd.to_datetime(series, dayfirst=dayfirst)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _parse_categorical_dates(series: pd.Series) -> pd.Series | None:
+    """Converte uma coluna `category` de datas interpretando cada texto distinto uma única vez."""
+    if not pd.api.types.is_object_dtype(series.cat.categories):
+        return None
+
+    dates = parse_dates(pd.Series(series.cat.categories))
+    if dates is None:
+        return None
+
+    # Valores ausentes (código -1) viram NaT
+    values = pd.api.extensions.take(
+        dates.array, series.cat.codes.to_numpy(), allow_fill=True
+    )
+
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def compact_dataframe(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """
+    Compacta os tipos de dados do DataFrame carregado:
+
+    * colunas numéricas são convertidas para tipos menores (inteiros até int32, com
+      sinal, e float32 sem perda);
+    * colunas de texto com valores no formato de data são convertidas para datetime;
+    * colunas de texto com poucos valores distintos (categorias, fornecedores, etc.)
+      são convertidas para `category`.
+
+    Args:
+        df (DataFrame): DataFrame a ser compactado.
+
+    Returns:
+        tuple[DataFrame, dict]: O DataFrame compactado e um relatório de memória
+        com o uso antes e depois da compactação e as conversões realizadas.
+    """
+    memory_before = _memory_usage(df)
+    conversions = {}
+
+    for column in df.columns:
+        series = df[column]
+        converted = None
+
+        if pd.api.types.is_numeric_dtype(series):
+            converted = _downcast_numeric(series)
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            # Colunas de texto já convertidas para `category` na leitura do CSV
+            converted = parse_dates(series)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(
+            series
+        ):
+            converted = parse_dates(series)
+
+            if converted is None and len(series):
+                n_unique = series.nunique(dropna=True)
+                if n_unique / len(series) <= settings.category_max_ratio:
+                    converted = series.astype('category')
+
+        if converted is not None and converted.dtype != series.dtype:
+            conversions[str(column)] = f'{series.dtype} -> {converted.dtype}'
+            df[column] = converted
+
+    memory_after = _memory_usage(df)
+    report = {
+        'memory_before_mb': round(memory_before / 1024**2, 3),
+        'memory_after_mb': round(memory_after / 1024**2, 3),
+        'reduction_pct': round(100 * (1 - memory_after / memory_before), 2)
+        if memory_before
+        else 0.0,
+        'conversions': conversions,
+    }
+
+    return df, report
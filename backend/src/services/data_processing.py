@@ -1,19 +1,245 @@
 """Serviço para processamento de dados recebidos via upload."""
 
+import asyncio
+import contextlib
+import copy
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import shutil
+import sys
 import zipfile
-from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
+from typing import IO
+from weakref import WeakValueDictionary
 
+import numpy as np
 import pandas as pd
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pandas.api.types import union_categoricals
 
-from src.utils.exceptions import WrongFileTypeError
+from src.settings import settings
+from src.utils.exceptions import (
+    DatasetNotFoundError,
+    SchemaMismatchError,
+    WrongFileTypeError,
+)
 
-df: pd.DataFrame | None = None
+from .data_compaction import compact_dataframe, parse_dates
+from .dataset_registry import DEFAULT_SESSION, dataset_registry
+from .dataset_store import dataset_key, dataset_store
+from .schema_inference import CSVDialect, infer_csv_dialect
 
+# Proporção máxima de valores distintos de uma coluna de texto no primeiro bloco lido
+# para que os blocos a guardem como `category`: com cada valor repetido ao menos duas
+# vezes, os códigos e os textos distintos ocupam menos que um texto por linha
+CHUNK_CATEGORY_RATIO = 0.5
 
-def get_dataframe():
-    """Retorna o DataFrame global do pandas em uso."""
-    return df
+
+# C library do processo, cujo `malloc_trim` (glibc) devolve ao sistema a memória livre do heap
+_LIBC = ctypes.CDLL(ctypes.util.find_library('c')) if sys.platform == 'linux' else None
+
+
+def _release_memory() -> None:
+    """
+    Devolve ao sistema a memória já liberada que o glibc mantém no heap. Os pedaços de
+    poucos MB dos blocos lidos continuam no heap depois de liberados e, sem isso,
+    mantêm o RSS do processo no pico da leitura.
+    """
+    if _LIBC is not None and hasattr(_LIBC, 'malloc_trim'):
+        _LIBC.malloc_trim(0)
+
+
+def _low_cardinality_columns(chunk: pd.DataFrame) -> set:
+    """Colunas de texto do bloco com até `CHUNK_CATEGORY_RATIO` de valores distintos."""
+    return {
+        column
+        for column in chunk.columns
+        if pd.api.types.is_object_dtype(chunk[column])
+        and len(chunk)
+        and chunk[column].nunique(dropna=True) / len(chunk) <= CHUNK_CATEGORY_RATIO
+    }
+
+
+def _concat_column(pieces: list[pd.Series]) -> pd.Series:
+    """
+    Concatena os pedaços de uma coluna, unindo as categorias das colunas `category`.
+    A coluna volta a ser texto se o arquivo inteiro tiver valores distintos demais.
+    """
+    if not all(isinstance(piece.dtype, pd.CategoricalDtype) for piece in pieces):
+        return pd.concat(pieces, ignore_index=True)
+
+    column = pd.Series(
+        union_categoricals(pieces, ignore_order=True), name=pieces[0].name
+    )
+
+    if len(column.cat.categories) > settings.category_max_ratio * len(column):
+        return column.astype(object)
+
+    return column
+
+
+def _parse_csv(
+    file: IO[bytes], dialect: CSVDialect, dtypes: dict | None
+) -> pd.DataFrame:
+    """
+    Lê o CSV no formato informado em blocos de `csv_chunk_rows` linhas. As colunas de
+    texto com poucos valores distintos no primeiro bloco são lidas como `category` pelo
+    próprio leitor, que guarda cada texto distinto uma única vez, sem criar um texto por
+    linha; os blocos são unidos coluna a coluna, liberando e devolvendo ao sistema a
+    memória de cada coluna dos blocos ao ser unida.
+    """
+    options = {
+        'sep': dialect.separator,
+        'header': dialect.header,
+        'decimal': dialect.decimal,
+        'thousands': dialect.thousands,
+        'encoding': dialect.encoding,
+        'encoding_errors': 'replace',
+    }
+    first = pd.read_csv(file, dtype=dtypes, nrows=settings.csv_chunk_rows, **options)
+    categorical = _low_cardinality_columns(first)
+
+    # Arquivos de um único bloco já foram lidos por inteiro
+    if len(first) < settings.csv_chunk_rows:
+        chunks = [first.astype(dict.fromkeys(categorical, 'category'))]
+    else:
+        del first
+        file.seek(0)
+
+        with pd.read_csv(
+            file,
+            dtype={**(dtypes or {}), **dict.fromkeys(categorical, 'category')},
+            chunksize=settings.csv_chunk_rows,
+            **options,
+        ) as reader:
+            chunks = list(reader)
+
+    columns = {}
+
+    for column in list(chunks[0].columns):
+        columns[column] = _concat_column([chunk.pop(column) for chunk in chunks])
+        _release_memory()
+
+    return pd.DataFrame(columns, copy=False)
+
+
+def _read_csv(
+    file: IO[bytes], sep: str | None, header: int | None
+) -> tuple[pd.DataFrame, CSVDialect]:
+    """
+    Infere o formato e os tipos do CSV a partir dos primeiros `inference_sample_size`
+    bytes e lê o arquivo completo com os tipos explícitos. Se os tipos da amostra não
+    valerem para o arquivo inteiro, a leitura é refeita com a inferência do pandas.
+
+    Args:
+        file (IO[bytes]): Arquivo CSV aberto em modo binário.
+        sep (str | None): Separador do CSV, inferido quando None.
+        header (int | None): Linha dos cabeçalhos, inferida quando None.
+
+    Returns:
+        tuple[DataFrame, CSVDialect]: O DataFrame resultante e o formato usado na leitura.
+    """
+    dialect = infer_csv_dialect(file.read(settings.inference_sample_size), sep, header)
+    file.seek(0)
+
+    try:
+        return _parse_csv(file, dialect, dialect.dtypes), dialect
+    except (ValueError, TypeError):
+        file.seek(0)
+        dialect.dtypes = {}
+        return _parse_csv(file, dialect, None), dialect
+
+
+def _read_zip_member(
+    path: str | IO[bytes], member: str, sep: str | None, header: int | None
+) -> tuple[pd.DataFrame, CSVDialect]:
+    """Lê um CSV de dentro de um arquivo ZIP. Executada nos processos de leitura."""
+    with zipfile.ZipFile(path) as zip_file, zip_file.open(member) as csv_file:
+        return _read_csv(csv_file, sep, header)
+
+
+def _align_chunk(base: pd.DataFrame, chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Valida um lote de linhas contra o esquema do conjunto de dados e converte as colunas
+    numéricas e de data do lote para tipos compatíveis com as do conjunto.
+
+    Raises:
+        SchemaMismatchError: Quando as colunas ou os tipos dos valores não são compatíveis.
+    """
+    if set(chunk.columns) != set(base.columns):
+        raise SchemaMismatchError(
+            f'The file has columns {list(chunk.columns)}, '
+            f'expected the dataset columns {list(base.columns)}.'
+        )
+
+    chunk = chunk[list(base.columns)]
+
+    for column in base.columns:
+        values = chunk[column]
+
+        if pd.api.types.is_datetime64_any_dtype(base[column]):
+            if not pd.api.types.is_datetime64_any_dtype(values):
+                values = (
+                    parse_dates(values)
+                    if values.notna().any()
+                    else pd.to_datetime(values)
+                )
+        elif pd.api.types.is_numeric_dtype(base[column]):
+            try:
+                values = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                values = None
+
+        if values is None:
+            raise SchemaMismatchError(
+                f'The column "{column}" has values incompatible with the '
+                f'dataset type {base[column].dtype}.'
+            )
+
+        chunk[column] = values
+
+    chunk, _ = compact_dataframe(chunk)
+
+    return chunk
+
+
+def _value_kind(values: pd.Series) -> str | None:
+    """
+    Tipo dos valores de uma coluna na combinação dos CSVs de um ZIP: 'datetime',
+    'bool', 'numeric' ou 'text' (inteiros e decimais, ou categorias diferentes, são
+    compatíveis); None quando todos os valores são nulos, compatível com qualquer tipo.
+    """
+    if not values.notna().any():
+        return None
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return 'datetime'
+    if pd.api.types.is_bool_dtype(values):
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(values):
+        return 'numeric'
+
+    return 'text'
+
+
+def _append_rows(base: pd.DataFrame, chunk: pd.DataFrame) -> pd.DataFrame:
+    """Concatena o lote ao conjunto de dados, unindo as categorias das colunas `category`."""
+    columns = {}
+
+    for column in base.columns:
+        if isinstance(base[column].dtype, pd.CategoricalDtype):
+            columns[column] = union_categoricals(
+                [base[column], chunk[column].astype('category')], ignore_order=True
+            )
+        else:
+            columns[column] = pd.concat(
+                [base[column], chunk[column]], ignore_index=True
+            )
+
+    return pd.DataFrame(columns)
 
 
 class DataHandler:
@@ -25,72 +251,368 @@ class DataHandler:
     """
 
     def __init__(self):
-        pass
+        # Lock de cada sessão em uso, que serializa os envios que substituem o seu conjunto
+        self._session_locks: WeakValueDictionary[str, asyncio.Lock] = (
+            WeakValueDictionary()
+        )
+
+    def _session_lock(self, session: str) -> asyncio.Lock:
+        lock = self._session_locks.get(session)
+
+        if lock is None:
+            lock = self._session_locks[session] = asyncio.Lock()
+
+        return lock
 
     async def load_csv(
         self,
         data: UploadFile,
-        separator: str = ',',
-        header: int = 0,
-    ) -> bool:
+        separator: str | None = None,
+        header: int | None = None,
+        merge_zip_members: bool = False,
+        source_column: str | None = None,
+        session: str = DEFAULT_SESSION,
+    ) -> dict:
         """
         Carrega dados de um arquivo enviado (CSV ou ZIP contendo um CSV)
-        para um DataFrame do pandas. Injeta os dados na variável global df.
+        para um DataFrame do pandas. Registra os dados para a sessão informada
+        no `dataset_registry`.
+
+        O upload é lido em blocos para um arquivo temporário (mantido em memória
+        até `upload_spool_max_size` e enviado ao disco acima disso) e o CSV é
+        lido em blocos de `csv_chunk_rows` linhas, evitando manter os bytes brutos,
+        uma cópia deles e o DataFrame em memória ao mesmo tempo. Após a leitura,
+        os tipos das colunas são compactados com `compact_dataframe`. O separador,
+        a codificação, o separador decimal, o cabeçalho e os tipos das colunas são
+        inferidos de uma amostra do início do arquivo antes da leitura completa.
+
+        O resultado é persistido em disco com uma chave derivada do hash do conteúdo
+        enviado e dos parâmetros de leitura; o reenvio de um arquivo já conhecido
+        reutiliza os dados persistidos sem uma nova leitura do CSV. A versão substituída
+        é removida do disco quando nenhuma outra sessão a usa.
 
         Args:
             data (UploadFile): Arquivo a ser lido.
-            separator (str, optional): Separador do CSV. Padrão é ','.
-            header (int, optional): Linha dos cabeçalhos. Padrão é 0.
+            separator (str | None, optional): Separador do CSV, inferido quando None.
+            header (int | None, optional): Linha dos cabeçalhos, inferida quando None.
+            merge_zip_members (bool, optional): Se True, lê todos os CSVs do ZIP em
+                paralelo e os concatena em um único conjunto de dados. Padrão é False,
+                em que apenas o primeiro CSV do ZIP é lido.
+            source_column (str | None, optional): Nome de uma coluna a ser adicionada
+                com o arquivo de origem de cada linha ao combinar os CSVs do ZIP.
+            session (str, optional): Sessão (thread_id) dona do conjunto de dados.
 
         Raises:
             WrongFileTypeError: Quando o tipo de arquivo recebido não é suportado.
+            SchemaMismatchError: Quando os CSVs do ZIP não possuem as mesmas colunas,
+                com tipos compatíveis.
 
         Returns:
-            bool: True se a leitura foi bem-sucedida.
+            dict: Pré-visualização das primeiras linhas em JSON ('data'), o
+            relatório de memória da compactação ('memory') e o formato inferido do
+            CSV ('dialect'), ambos None quando os dados são reutilizados, a chave do
+            conjunto de dados ('dataset_id') e se ele foi reutilizado ('reused').
         """
-        global df
-        file = await data.read()
-        file_bytes = BytesIO(file)
+        self._check_content_type(data)
 
-        if data.content_type == 'application/zip':
-            df = await self._load_zip(file_bytes, separator, header)
+        file, content_hash = await self._spool_upload(data)
+        key = dataset_key(
+            content_hash,
+            data.content_type,
+            separator,
+            header,
+            merge_zip_members,
+            source_column,
+        )
+        reused = False
+        memory_report = dialect = None
 
-        elif data.content_type in ['text/csv', 'application/vnd.ms-excel']:
-            df = pd.read_csv(file_bytes, sep=separator, header=header)
+        with file:
+            if dataset_store.contains(key):
+                # Pode ter sido removida por linhas anexadas ao conjunto de outra sessão
+                with contextlib.suppress(FileNotFoundError):
+                    loaded = await run_in_threadpool(dataset_store.load, key)
+                    reused = True
 
-        else:
+            if not reused and data.content_type == 'application/zip':
+                loaded, dialect = await self._load_zip(
+                    file, separator, header, merge_zip_members, source_column
+                )
+            elif not reused:
+                loaded, dialect = await run_in_threadpool(
+                    _read_csv, file, separator, header
+                )
+
+        if not reused:
+            # Nomes de colunas como texto, exigido pelo formato Arrow
+            loaded.columns = loaded.columns.map(str)
+            loaded, memory_report = await run_in_threadpool(compact_dataframe, loaded)
+            await run_in_threadpool(dataset_store.save, key, loaded)
+
+        # Aguarda um envio anexado em andamento, que senão substituiria estes dados
+        async with self._session_lock(session):
+            previous = dataset_registry.get_version(session)
+            dataset_registry.set(session, loaded, key)
+
+        if previous not in (None, key):
+            await run_in_threadpool(dataset_registry.release, previous)
+
+        # Retorna as primeiras linhas do DataFrame em formato JSON para pré-visualização
+        return {
+            'data': loaded.head().to_json(),
+            'memory': memory_report,
+            'dialect': dialect.to_dict() if dialect else None,
+            'dataset_id': key,
+            'reused': reused,
+        }
+
+    async def append_csv(
+        self,
+        data: UploadFile,
+        separator: str | None = None,
+        header: int | None = None,
+        session: str = DEFAULT_SESSION,
+    ) -> dict:
+        """
+        Anexa as linhas de um arquivo enviado (CSV ou ZIP contendo um CSV) ao conjunto
+        de dados da sessão. O novo lote deve ter as mesmas colunas do conjunto atual e
+        valores compatíveis com os tipos de cada coluna. As estatísticas incrementais do
+        conjunto são atualizadas apenas com o novo lote, sem percorrer o histórico.
+
+        Os envios de uma mesma sessão são anexados um de cada vez. A versão substituída
+        é removida do disco quando nenhuma outra sessão a usa.
+
+        Args:
+            data (UploadFile): Arquivo com as novas linhas.
+            separator (str | None, optional): Separador do CSV, inferido quando None.
+            header (int | None, optional): Linha dos cabeçalhos, inferida quando None.
+            session (str, optional): Sessão (thread_id) dona do conjunto de dados.
+
+        Raises:
+            WrongFileTypeError: Quando o tipo de arquivo recebido não é suportado.
+            DatasetNotFoundError: Quando a sessão ainda não possui um conjunto de dados.
+            SchemaMismatchError: Quando o lote não é compatível com o conjunto atual.
+
+        Returns:
+            dict: Linhas anexadas ('rows_appended'), total de linhas ('rows') e a
+            chave da nova versão do conjunto de dados ('dataset_id').
+        """
+        self._check_content_type(data)
+
+        file, content_hash = await self._spool_upload(data)
+
+        with file:
+            if data.content_type == 'application/zip':
+                chunk, _ = await self._load_zip(file, separator, header)
+            else:
+                chunk, _ = await run_in_threadpool(_read_csv, file, separator, header)
+
+        chunk.columns = chunk.columns.map(str)
+
+        # Envios simultâneos da mesma sessão são anexados um após o outro, cada um à
+        # versão gerada pelo anterior
+        async with self._session_lock(session):
+            entry = await run_in_threadpool(dataset_registry.get, session)
+            if entry is None:
+                raise DatasetNotFoundError
+
+            chunk = await run_in_threadpool(_align_chunk, entry.df, chunk)
+            merged = await run_in_threadpool(_append_rows, entry.df, chunk)
+
+            # As estatísticas são atualizadas em uma cópia, que só substitui as atuais
+            # depois que a nova versão é salva
+            stats = None
+            if entry.stats is not None:
+                stats = copy.deepcopy(entry.stats)
+                await run_in_threadpool(stats.update, chunk)
+
+            key = dataset_key(entry.version, 'append', content_hash, separator, header)
+            await run_in_threadpool(dataset_store.save, key, merged)
+            dataset_registry.set(session, merged, key, stats)
+
+        await run_in_threadpool(dataset_registry.release, entry.version)
+
+        return {'rows_appended': len(chunk), 'rows': len(merged), 'dataset_id': key}
+
+    async def drop_dataset(self, session: str = DEFAULT_SESSION) -> dict:
+        """
+        Descarta o conjunto de dados da sessão, da memória e do disco. A versão em uso
+        é removida quando nenhuma outra sessão a usa.
+
+        Args:
+            session (str, optional): Sessão (thread_id) dona do conjunto de dados.
+
+        Returns:
+            dict: Se a sessão possuía um conjunto de dados ('released').
+        """
+        async with self._session_lock(session):
+            released = await run_in_threadpool(dataset_registry.drop, session)
+
+        return {'released': released}
+
+    def _check_content_type(self, data: UploadFile) -> None:
+        """
+        Verifica se o arquivo enviado é um CSV ou um ZIP.
+
+        Raises:
+            WrongFileTypeError: Quando o tipo de arquivo recebido não é suportado.
+        """
+        if data.content_type not in [
+            'application/zip',
+            'text/csv',
+            'application/vnd.ms-excel',
+        ]:
             raise WrongFileTypeError(
                 f'Unsupported file type: {data.content_type}. '
                 'Please upload a CSV or a ZIP file containing a CSV.'
             )
 
-        # Retorna as primeiras linhas do DataFrame em formato JSON para pré-visualização
-        return df.head().to_json()
+    async def _spool_upload(self, data: UploadFile) -> tuple[SpooledTemporaryFile, str]:
+        """
+        Copia o arquivo enviado em blocos para um arquivo temporário, que passa
+        a ser gravado em disco quando ultrapassa `upload_spool_max_size` bytes,
+        calculando o hash SHA-256 do conteúdo durante a cópia.
 
-    async def _load_zip(self, file: BytesIO, sep: str, header: int):
+        Args:
+            data (UploadFile): Arquivo a ser lido.
+
+        Returns:
+            tuple[SpooledTemporaryFile, str]: Arquivo temporário posicionado no início,
+            a ser fechado por quem chama, e o hash hexadecimal do conteúdo.
+        """
+        # O arquivo é devolvido aberto e passa a pertencer a quem chama
+        spool = SpooledTemporaryFile(max_size=settings.upload_spool_max_size)  # noqa: SIM115
+        digest = hashlib.sha256()
+
+        try:
+            while chunk := await data.read(settings.upload_chunk_size):
+                digest.update(chunk)
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            raise
+
+        spool.seek(0)
+        return spool, digest.hexdigest()
+
+    async def _load_zip(
+        self,
+        file: IO[bytes],
+        sep: str | None,
+        header: int | None,
+        merge_members: bool = False,
+        source_column: str | None = None,
+    ) -> tuple[pd.DataFrame, CSVDialect]:
         """
         Função auxiliar para ler arquivos ZIP, descompactar e retornar o DataFrame resultante.
 
         Args:
-            file (BytesIO): O arquivo ZIP em memória.
-            sep (str): Separador do CSV.
-            header (int): Linha dos cabeçalhos.
+            file (IO[bytes]): O arquivo ZIP enviado.
+            sep (str | None): Separador do CSV, inferido quando None.
+            header (int | None): Linha dos cabeçalhos, inferida quando None.
+            merge_members (bool, optional): Se True, lê e concatena todos os CSVs do ZIP.
+            source_column (str | None, optional): Coluna com o arquivo de origem de cada linha.
 
         Raises:
             FileNotFoundError: Quando nenhum arquivo CSV é encontrado após a descompactação.
+            SchemaMismatchError: Quando os CSVs do ZIP não possuem as mesmas colunas,
+                com tipos compatíveis.
 
         Returns:
-            DataFrame: O DataFrame resultante da leitura.
+            tuple[DataFrame, CSVDialect]: O DataFrame resultante da leitura e o
+            formato do (primeiro) CSV lido.
         """
         with zipfile.ZipFile(file) as zip_file:
-            # Encontra o primeiro arquivo que termina com '.csv' dentro do zip
-            csv_filename = next(
-                (name for name in zip_file.namelist() if name.endswith('.csv')),
-                None,
-            )
+            csv_filenames = [
+                name for name in zip_file.namelist() if name.endswith('.csv')
+            ]
 
-            if not csv_filename:
+            if not csv_filenames:
                 raise FileNotFoundError('No CSV file found in the zip archive.')
 
-            with zip_file.open(csv_filename) as csv_file:
-                return pd.read_csv(csv_file, sep=sep, header=header)
+            if not merge_members:
+                # Lê apenas o primeiro arquivo que termina com '.csv' dentro do zip
+                with zip_file.open(csv_filenames[0]) as csv_file:
+                    return await run_in_threadpool(_read_csv, csv_file, sep, header)
+
+        results = await self._load_zip_members(file, csv_filenames, sep, header)
+        parts = [part for part, _ in results]
+
+        columns = list(parts[0].columns)
+        # Tipo de cada coluna e o primeiro arquivo em que ela tem valores
+        kinds: dict[str, tuple[str, str]] = {}
+
+        for name, part in zip(csv_filenames, parts):
+            if list(part.columns) != columns:
+                raise SchemaMismatchError(
+                    f'The file "{name}" has columns {list(part.columns)}, '
+                    f'expected {columns} as in "{csv_filenames[0]}".'
+                )
+
+            for column in columns:
+                kind = _value_kind(part[column])
+                expected, first = kinds.setdefault(column, (kind, name))
+
+                if expected is None:
+                    kinds[column] = (kind, name)
+                elif kind is not None and kind != expected:
+                    raise SchemaMismatchError(
+                        f'The file "{name}" has column "{column}" as {kind} '
+                        f'({part[column].dtype}), expected {expected} as in "{first}".'
+                    )
+
+        if source_column and source_column in columns:
+            raise SchemaMismatchError(
+                f'The source column "{source_column}" already exists in the data.'
+            )
+
+        merged = pd.concat(parts, ignore_index=True)
+
+        if source_column:
+            codes = np.repeat(np.arange(len(parts)), [len(part) for part in parts])
+            merged[source_column] = pd.Categorical.from_codes(
+                codes, categories=csv_filenames
+            )
+
+        return merged, results[0][1]
+
+    async def _load_zip_members(
+        self, file: IO[bytes], members: list[str], sep: str | None, header: int | None
+    ) -> list[tuple[pd.DataFrame, CSVDialect]]:
+        """
+        Lê os CSVs informados do arquivo ZIP em um pool de processos, um arquivo por tarefa.
+        O ZIP é copiado para um arquivo nomeado em disco para ser aberto pelos processos.
+        Com um único processo, os CSVs são lidos em sequência, sem o pool.
+
+        Returns:
+            list[tuple[DataFrame, CSVDialect]]: Os DataFrames lidos e seus formatos,
+            na mesma ordem de `members`.
+        """
+        workers = min(settings.ingest_workers or os.cpu_count() or 1, len(members))
+
+        # Sem paralelismo, o pool só acrescenta a cópia do ZIP e o envio dos DataFrames
+        # entre os processos (ver benchmarks/ingest_zip.py)
+        if workers == 1:
+            return [
+                await run_in_threadpool(_read_zip_member, file, member, sep, header)
+                for member in members
+            ]
+
+        with NamedTemporaryFile(suffix='.zip', delete=False) as zip_copy:
+            file.seek(0)
+            await run_in_threadpool(shutil.copyfileobj, file, zip_copy)
+
+        try:
+            loop = asyncio.get_running_loop()
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool, _read_zip_member, zip_copy.name, member, sep, header
+                        )
+                        for member in members
+                    )
+                )
+        finally:
+            os.remove(zip_copy.name)
@@ -0,0 +1,129 @@
+"""Perfil dos conjuntos de dados, calculado uma vez por versão e reutilizado pelas ferramentas."""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .dataset_registry import get_dataframe, get_dataset_stats, get_dataset_version
+from .dataset_stats import DatasetStats
+
+
+@dataclass
+class ColumnProfile:
+    """Perfil de uma coluna: tipo, valores nulos, cardinalidade, valores frequentes e estatísticas."""
+
+    name: str
+    dtype: str
+    numeric: bool
+    non_null: int
+    nulls: int
+    unique: int | str | None
+    top_values: list[tuple[object, int]]
+    stats: dict = field(default_factory=dict)
+
+
+@dataclass
+class DatasetProfile:
+    """Perfil de uma versão de um conjunto de dados."""
+
+    version: str
+    rows: int
+    memory_bytes: int
+    columns: dict[str, ColumnProfile]
+
+    def info(self) -> str:
+        """Retorna a quantidade de linhas e colunas e o uso de memória."""
+        return (
+            f'{self.rows} rows, {len(self.columns)} columns, '
+            f'memory usage: {self.memory_bytes / 1024**2:.2f} MB'
+        )
+
+    def table(self) -> pd.DataFrame:
+        """
+        Retorna uma linha por coluna com tipo, contagem de valores não nulos e as
+        estatísticas descritivas, formato compacto mesmo em conjuntos com muitas colunas.
+        """
+        table = self.describe().T.drop(columns='count')
+        table.insert(0, 'dtype', [c.dtype for c in self.columns.values()])
+        table.insert(1, 'non_null', [c.non_null for c in self.columns.values()])
+
+        return table.dropna(axis=1, how='all')
+
+    def describe(self) -> pd.DataFrame:
+        """Retorna as estatísticas descritivas de todas as colunas, como `describe(include='all')`."""
+        index = ['count', 'unique', 'top', 'freq', 'mean', 'std', 'min']
+        index += ['25%', '50%', '75%', 'max']
+        data = {
+            column.name: {**column.stats, 'unique': column.unique}
+            for column in self.columns.values()
+        }
+
+        return pd.DataFrame(data, index=index)
+
+
+def _build_profile(
+    version: str, df: pd.DataFrame, stats: DatasetStats
+) -> DatasetProfile:
+    columns = {}
+
+    for name, column_stats in stats.columns.items():
+        if column_stats.numeric:
+            unique = None
+        elif column_stats.value_counts is not None:
+            unique = len(column_stats.value_counts)
+        else:
+            unique = f'>{settings.stats_max_distinct}'
+
+        describe = column_stats.describe()
+        if column_stats.numeric and column_stats.count:
+            # Os quartis do sketch são aproximados em conjuntos grandes; com o DataFrame
+            # em memória, são calculados exatamente (uma vez por versão)
+            values = df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            describe['25%'], describe['50%'], describe['75%'] = (
+                float(q) for q in np.nanpercentile(values, [25, 50, 75])
+            )
+
+        columns[name] = ColumnProfile(
+            name=name,
+            dtype=str(df[name].dtype),
+            numeric=column_stats.numeric,
+            non_null=column_stats.count,
+            nulls=column_stats.nulls,
+            unique=unique,
+            top_values=column_stats.top_values(settings.profile_top_values),
+            stats=describe,
+        )
+
+    return DatasetProfile(
+        version=version,
+        rows=stats.rows,
+        memory_bytes=int(df.memory_usage(deep=True).sum()),
+        columns=columns,
+    )
+
+
+profile_cache = LRUCache(max_items=settings.profile_cache_size)
+
+
+def get_dataset_profile(session: str | None = None) -> DatasetProfile | None:
+    """
+    Retorna o perfil do conjunto de dados da sessão. O perfil é calculado uma única vez
+    por versão do conjunto de dados (a partir das estatísticas incrementais, com os
+    quartis e a mediana exatos) e só é recalculado quando os dados mudam, isto é,
+    quando a versão muda.
+    """
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    return profile_cache.get_or_set(
+        version,
+        lambda: _build_profile(
+            version, get_dataframe(session), get_dataset_stats(session)
+        ),
+    )
@@ -0,0 +1,201 @@
+"""Registro dos conjuntos de dados em memória por sessão, com limite de memória e descarte LRU."""
+
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.settings import settings
+
+from .dataset_stats import DatasetStats
+from .dataset_store import DatasetStore, dataset_store
+
+DEFAULT_SESSION = 'default'
+
+# Sessão (thread_id) da requisição em andamento, usada pelas ferramentas dos agentes
+current_session: ContextVar[str] = ContextVar(
+    'current_session', default=DEFAULT_SESSION
+)
+
+
+@dataclass
+class DatasetEntry:
+    """
+    Conjunto de dados de uma sessão mantido em memória. `stats` é calculado no primeiro
+    acesso e descartado junto com o conjunto de dados.
+    """
+
+    version: str
+    df: pd.DataFrame
+    nbytes: int
+    stats: DatasetStats | None = None
+
+    @property
+    def memory_usage(self) -> int:
+        """Bytes do conjunto de dados e de suas estatísticas."""
+        return self.nbytes + (self.stats.nbytes if self.stats else 0)
+
+
+class DatasetRegistry:
+    """
+    Mantém o conjunto de dados de cada sessão em memória, limitado a um orçamento total
+    de bytes. Quando o orçamento é excedido, os conjuntos usados há mais tempo são
+    descartados da memória com suas estatísticas; eles permanecem persistidos no
+    `DatasetStore` e são recarregados (mapeados em memória) no próximo acesso da sessão.
+    """
+
+    def __init__(self, memory_budget: int, store: DatasetStore):
+        self.memory_budget = memory_budget
+        self.store = store
+        self._entries: OrderedDict[str, DatasetEntry] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def memory_usage(self) -> int:
+        """Total de bytes dos conjuntos de dados mantidos em memória."""
+        return sum(entry.memory_usage for entry in self._entries.values())
+
+    def set(
+        self,
+        session: str,
+        df: pd.DataFrame,
+        version: str,
+        stats: DatasetStats | None = None,
+    ) -> None:
+        """
+        Registra o conjunto de dados de uma sessão, substituindo o anterior.
+
+        Args:
+            session (str): Identificador da sessão (thread_id).
+            df (DataFrame): Conjunto de dados carregado.
+            version (str): Chave do conjunto de dados no `DatasetStore`.
+            stats (DatasetStats | None, optional): Estatísticas já calculadas para `df`.
+        """
+        nbytes = int(df.memory_usage(deep=True).sum())
+
+        with self._lock:
+            self._entries[session] = DatasetEntry(version, df, nbytes, stats)
+            self._entries.move_to_end(session)
+            self.store.set_session(session, version)
+            self._evict()
+
+    def get(self, session: str) -> DatasetEntry | None:
+        """
+        Retorna o conjunto de dados de uma sessão, recarregando-o do disco quando
+        foi descartado da memória ou quando a aplicação foi reiniciada. A leitura do
+        disco é feita fora do lock, sem bloquear as demais sessões.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(session)
+
+                if entry is not None:
+                    self._entries.move_to_end(session)
+                    return entry
+
+            version = self.store.get_session(session)
+            if version is None:
+                return None
+
+            try:
+                df = self.store.load(version)
+            except FileNotFoundError:
+                # Versão substituída e removida durante a leitura
+                continue
+
+            loaded = DatasetEntry(version, df, int(df.memory_usage(deep=True).sum()))
+
+            with self._lock:
+                # Outra requisição pode ter carregado ou substituído o conjunto nesse meio-tempo
+                entry = self._entries.get(session)
+
+                if entry is None:
+                    if self.store.get_session(session) != version:
+                        continue
+                    entry = self._entries[session] = loaded
+
+                self._entries.move_to_end(session)
+                self._evict()
+
+                return entry
+
+    def get_version(self, session: str) -> str | None:
+        """Retorna a chave do conjunto de dados de uma sessão sem carregá-lo na memória."""
+        with self._lock:
+            entry = self._entries.get(session)
+
+            return entry.version if entry else self.store.get_session(session)
+
+    def release(self, version: str) -> None:
+        """
+        Remove do disco uma versão substituída por outra, se nenhuma sessão a usa mais.
+        Conjuntos em memória mapeados sobre o arquivo removido continuam válidos.
+        """
+        with self._lock:
+            self.store.delete_unused(version)
+
+    def drop(self, session: str) -> bool:
+        """
+        Descarta o conjunto de dados de uma sessão da memória e o seu registro no disco,
+        removendo também a versão, se nenhuma outra sessão a usa.
+
+        Returns:
+            bool: Se a sessão possuía um conjunto de dados.
+        """
+        with self._lock:
+            entry = self._entries.pop(session, None)
+            version = self.store.delete_session(session)
+
+            if version is not None:
+                self.store.delete_unused(version)
+
+            return entry is not None or version is not None
+
+    def _evict(self) -> None:
+        """Descarta da memória os conjuntos usados há mais tempo até respeitar o orçamento."""
+        # O conjunto usado mais recentemente nunca é descartado
+        for session in list(self._entries)[:-1]:
+            if self.memory_usage <= self.memory_budget:
+                break
+
+            entry = self._entries.pop(session)
+            if not self.store.contains(entry.version):
+                self.store.save(entry.version, entry.df)
+
+
+dataset_registry = DatasetRegistry(
+    settings.dataset_memory_budget_mb * 1024**2, dataset_store
+)
+
+
+def get_dataframe(session: str | None = None) -> pd.DataFrame | None:
+    """
+    Retorna o DataFrame do pandas em uso pela sessão informada ou, se omitida,
+    pela sessão da requisição atual.
+    """
+    entry = dataset_registry.get(session or current_session.get())
+
+    return entry.df if entry else None
+
+
+def get_dataset_version(session: str | None = None) -> str | None:
+    """Retorna a chave (hash do conteúdo) do conjunto de dados em uso pela sessão."""
+    return dataset_registry.get_version(session or current_session.get())
+
+
+def get_dataset_stats(session: str | None = None) -> DatasetStats | None:
+    """
+    Retorna as estatísticas incrementais do conjunto de dados da sessão, calculadas
+    uma única vez e atualizadas a cada lote anexado, sem percorrer os dados novamente.
+    """
+    entry = dataset_registry.get(session or current_session.get())
+
+    if entry is None:
+        return None
+
+    if entry.stats is None:
+        entry.stats = DatasetStats.from_frame(entry.df)
+
+    return entry.stats
@@ -0,0 +1,241 @@
+"""Estatísticas incrementais (mescláveis) dos conjuntos de dados, atualizadas a cada novo lote de linhas."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.settings import settings
+
+QUANTILES = (0.25, 0.5, 0.75)
+# Memória aproximada de um item da contagem de valores (entrada do dict, chave e contagem)
+COUNTER_ITEM_BYTES = 200
+
+
+class QuantileSketch:
+    """
+    Sketch de quantis mesclável no estilo KLL. Os valores são mantidos em níveis em que
+    cada item do nível `i` representa 2**i observações; quando um nível passa de `k`
+    itens, ele é ordenado e metade dos itens (alternados) sobe para o nível seguinte.
+    O erro de rank é proporcional a 1/k e é exato enquanto houver até `k` observações.
+    """
+
+    def __init__(self, k: int = 256):
+        self.k = k
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(0)
+
+    @property
+    def count(self) -> int:
+        return int(sum(len(level) << i for i, level in enumerate(self.levels)))
+
+    def update(self, values: np.ndarray) -> None:
+        """Adiciona valores ao sketch, ignorando valores nulos."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Incorpora as observações de outro sketch."""
+        for i, level in enumerate(other.levels):
+            if i == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[i] = np.concatenate([self.levels[i], level])
+
+        self._compress()
+
+    def _compress(self) -> None:
+        i = 0
+        while i < len(self.levels):
+            level = self.levels[i]
+
+            if len(level) > self.k:
+                level = np.sort(level)
+                kept = level[:0]
+
+                # Mantém um item no nível quando a quantidade é ímpar
+                if len(level) % 2:
+                    kept, level = level[-1:], level[:-1]
+
+                promoted = level[self._rng.integers(2) :: 2]
+
+                if i + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[i] = kept
+                self.levels[i + 1] = np.concatenate([self.levels[i + 1], promoted])
+
+            i += 1
+
+    def quantiles(self, qs: tuple[float, ...] = QUANTILES) -> list[float | None]:
+        """Retorna os quantis aproximados solicitados, None quando o sketch está vazio."""
+        values = np.concatenate(self.levels)
+
+        if values.size == 0:
+            return [None for _ in qs]
+
+        weights = np.concatenate(
+            [np.full(len(level), 1 << i) for i, level in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind='stable')
+        values, cumulative = values[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs) * (cumulative[-1] - 1)
+
+        return values[np.searchsorted(cumulative, ranks, side='right')].tolist()
+
+
+@dataclass
+class ColumnStats:
+    """
+    Agregados de uma coluna. Colunas numéricas mantêm média e variância (algoritmo de Chan),
+    mínimo, máximo e um sketch de quantis; as demais mantêm a contagem de cada valor,
+    descartada quando a coluna passa de `stats_max_distinct` valores distintos.
+    """
+
+    numeric: bool
+    count: int = 0
+    nulls: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: object = None
+    max: object = None
+    sketch: QuantileSketch | None = None
+    value_counts: Counter | None = field(default_factory=Counter)
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> 'ColumnStats':
+        numeric = pd.api.types.is_numeric_dtype(
+            series
+        ) and not pd.api.types.is_bool_dtype(series)
+        stats = cls(numeric=numeric)
+        stats.update(series)
+
+        return stats
+
+    def update(self, series: pd.Series) -> None:
+        """Incorpora um novo lote de valores da coluna."""
+        values = series.dropna()
+        self.nulls += len(series) - len(values)
+
+        if values.empty:
+            return
+
+        if self.numeric:
+            array = values.to_numpy(dtype=np.float64)
+            other = ColumnStats(
+                True,
+                count=len(array),
+                mean=float(array.mean()),
+                m2=float(((array - array.mean()) ** 2).sum()),
+                min=float(array.min()),
+                max=float(array.max()),
+                sketch=QuantileSketch(settings.stats_sketch_size),
+                value_counts=None,
+            )
+            other.sketch.update(array)
+            self._merge_numeric(other)
+            return
+
+        # Mínimo e máximo de datas e de categorias ordenadas
+        if pd.api.types.is_datetime64_any_dtype(values) or (
+            isinstance(values.dtype, pd.CategoricalDtype) and values.cat.ordered
+        ):
+            self.min = values.min() if self.min is None else min(self.min, values.min())
+            self.max = values.max() if self.max is None else max(self.max, values.max())
+
+        self.count += len(values)
+
+        if self.value_counts is not None:
+            counts = values.value_counts(sort=False)
+            self.value_counts.update(counts[counts > 0].to_dict())
+
+            if len(self.value_counts) > settings.stats_max_distinct:
+                self.value_counts = None
+
+    def _merge_numeric(self, other: 'ColumnStats') -> None:
+        total = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta**2 * self.count * other.count / total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.count = total
+
+        if self.sketch is None:
+            self.sketch = other.sketch
+        else:
+            self.sketch.merge(other.sketch)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória aproximada do sketch e da contagem de valores."""
+        sketch = sum(level.nbytes for level in self.sketch.levels) if self.sketch else 0
+        counts = len(self.value_counts) * COUNTER_ITEM_BYTES if self.value_counts else 0
+
+        return sketch + counts
+
+    @property
+    def std(self) -> float | None:
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else None
+
+    def top_values(self, n: int = 5) -> list[tuple[object, int]]:
+        """Retorna os `n` valores mais frequentes, vazio se a contagem foi descartada."""
+        return self.value_counts.most_common(n) if self.value_counts else []
+
+    def describe(self) -> dict:
+        """Retorna as estatísticas no formato de `DataFrame.describe(include='all')`."""
+        if self.numeric:
+            q1, median, q3 = (
+                self.sketch.quantiles() if self.sketch else [None, None, None]
+            )
+            return {
+                'count': self.count,
+                'mean': self.mean if self.count else None,
+                'std': self.std,
+                'min': self.min,
+                '25%': q1,
+                '50%': median,
+                '75%': q3,
+                'max': self.max,
+            }
+
+        top = self.top_values(1)
+        return {
+            'count': self.count,
+            'unique': len(self.value_counts) if self.value_counts is not None else None,
+            'top': top[0][0] if top else None,
+            'freq': top[0][1] if top else None,
+            'min': self.min,
+            'max': self.max,
+        }
+
+
+@dataclass
+class DatasetStats:
+    """Agregados de todas as colunas de um conjunto de dados, atualizados a cada lote anexado."""
+
+    rows: int = 0
+    columns: dict[str, ColumnStats] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(stats.nbytes for stats in self.columns.values())
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DatasetStats':
+        return cls(
+            rows=len(df),
+            columns={
+                column: ColumnStats.from_series(df[column]) for column in df.columns
+            },
+        )
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Incorpora um novo lote de linhas, com as mesmas colunas do conjunto de dados."""
+        self.rows += len(chunk)
+
+        for column, stats in self.columns.items():
+            stats.update(chunk[column])
@@ -0,0 +1,204 @@
+"""Serviço para persistência dos conjuntos de dados carregados em formato colunar (Arrow IPC)."""
+
+import contextlib
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+from src.settings import settings
+
+
+def _is_zero_copy(column: pa.ChunkedArray, numpy_type: str | None) -> bool:
+    """
+    Verifica se a coluna pode ser lida como um array do NumPy sobre o arquivo mapeado:
+    numérica, em um único bloco, sem nulos e sem tipo estendido do pandas (ex.: Int64).
+    """
+    if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)):
+        return False
+
+    return (
+        column.num_chunks == 1
+        and column.null_count == 0
+        and numpy_type == str(np.dtype(column.type.to_pandas_dtype()))
+    )
+
+
+def dataset_key(content_hash: str, *params) -> str:
+    """
+    Gera a chave de um conjunto de dados a partir do hash do conteúdo enviado e dos
+    parâmetros de leitura, já que o mesmo arquivo lido com outro separador gera outro DataFrame.
+
+    Args:
+        content_hash (str): Hash SHA-256 dos bytes enviados.
+        *params: Parâmetros de leitura que influenciam o DataFrame resultante.
+
+    Returns:
+        str: A chave hexadecimal do conjunto de dados.
+    """
+    return hashlib.sha256(f'{content_hash}:{params!r}'.encode()).hexdigest()
+
+
+class DatasetStore:
+    """
+    Armazena cada conjunto de dados carregado como um arquivo Arrow IPC (Feather v2)
+    não compactado, identificado pelo hash do conteúdo enviado. Arquivos não compactados
+    podem ser mapeados em memória na leitura, dispensando uma nova leitura do CSV.
+    """
+
+    SESSIONS_DIR = 'sessions'
+    REFS_DIR = 'refs'
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        (self.directory / self.SESSIONS_DIR).mkdir(parents=True, exist_ok=True)
+
+        # Diretórios criados antes do índice de referências: indexa as sessões existentes
+        if not (self.directory / self.REFS_DIR).exists():
+            for path in (self.directory / self.SESSIONS_DIR).iterdir():
+                self._add_reference(path.read_text().strip(), path.name)
+            (self.directory / self.REFS_DIR).mkdir(exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.arrow'
+
+    def contains(self, key: str) -> bool:
+        """Verifica se um conjunto de dados com a chave informada já foi persistido."""
+        return self._path(key).exists()
+
+    def save(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Persiste o DataFrame com a chave informada. A escrita é feita em um arquivo
+        temporário renomeado ao final, para que leitores nunca vejam um arquivo incompleto.
+        As colunas são gravadas em um único bloco, o que permite lê-las sem cópia.
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp')
+
+        feather.write_feather(
+            df, tmp_path, compression='uncompressed', chunksize=max(len(df), 1)
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, key: str) -> pd.DataFrame:
+        """
+        Carrega um conjunto de dados persistido mapeando o arquivo em memória. As colunas
+        numéricas sem nulos são expostas sem cópia (somente leitura) sobre o arquivo
+        mapeado, cujas páginas ficam no cache do sistema; as demais são convertidas.
+
+        Raises:
+            FileNotFoundError: Quando não há conjunto de dados com a chave informada.
+        """
+        table = feather.read_table(self._path(key), memory_map=True)
+        metadata = table.schema.pandas_metadata or {}
+
+        # Índices gravados como colunas e nomes repetidos exigem a conversão completa
+        if len(set(table.column_names)) < table.num_columns or any(
+            isinstance(index, str) for index in metadata.get('index_columns', [])
+        ):
+            return table.to_pandas()
+
+        numpy_types = {
+            column['field_name']: column['numpy_type']
+            for column in metadata.get('columns', [])
+        }
+        zero_copy = {
+            name
+            for name, column in zip(table.column_names, table.columns)
+            if _is_zero_copy(column, numpy_types.get(name))
+        }
+        converted = table.drop_columns(list(zero_copy)).to_pandas()
+
+        columns = {
+            name: table[name].chunk(0).to_numpy()
+            if name in zero_copy
+            else converted[name]
+            for name in table.column_names
+        }
+
+        return pd.DataFrame(columns, index=converted.index, copy=False)
+
+    def delete_unused(self, key: str) -> bool:
+        """
+        Remove o conjunto de dados com a chave informada, se nenhuma sessão o usa. O
+        mesmo conteúdo enviado por sessões diferentes compartilha a mesma chave; as
+        sessões que usam cada chave são indexadas em `refs/<chave>/`, e apenas esse
+        diretório é consultado.
+
+        Returns:
+            bool: Se o conjunto de dados foi removido.
+        """
+        refs = self._refs_path(key)
+
+        if refs.exists() and any(refs.iterdir()):
+            return False
+
+        self._path(key).unlink(missing_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            refs.rmdir()
+
+        return True
+
+    def _session_path(self, session: str) -> Path:
+        name = hashlib.sha256(session.encode()).hexdigest()
+        return self.directory / self.SESSIONS_DIR / name
+
+    def _refs_path(self, key: str) -> Path:
+        return self.directory / self.REFS_DIR / key
+
+    def _add_reference(self, key: str, name: str) -> None:
+        refs = self._refs_path(key)
+        refs.mkdir(parents=True, exist_ok=True)
+        (refs / name).touch()
+
+    def _remove_reference(self, key: str, name: str) -> None:
+        (self._refs_path(key) / name).unlink(missing_ok=True)
+
+    def set_session(self, session: str, key: str) -> None:
+        """
+        Registra a chave do conjunto de dados em uso por uma sessão, substituindo a
+        anterior também no índice de referências.
+        """
+        path = self._session_path(session)
+        previous = path.read_text().strip() if path.exists() else None
+
+        self._add_reference(key, path.name)
+        path.write_text(key)
+
+        if previous not in (None, key):
+            self._remove_reference(previous, path.name)
+
+    def delete_session(self, session: str) -> str | None:
+        """
+        Remove o registro da sessão e sua referência ao conjunto de dados em uso.
+
+        Returns:
+            str | None: A chave do conjunto de dados que a sessão usava, se havia um.
+        """
+        path = self._session_path(session)
+
+        if not path.exists():
+            return None
+
+        key = path.read_text().strip()
+        path.unlink(missing_ok=True)
+        self._remove_reference(key, path.name)
+
+        return key
+
+    def get_session(self, session: str) -> str | None:
+        """Retorna a chave do conjunto de dados em uso por uma sessão, se ainda persistido."""
+        path = self._session_path(session)
+
+        if not path.exists():
+            return None
+
+        key = path.read_text().strip()
+        return key if self.contains(key) else None
+
+
+dataset_store = DatasetStore(settings.dataset_store_dir)
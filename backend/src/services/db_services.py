@@ -1,18 +1,138 @@
 """Serviço para manipulação do banco de dados"""
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Result
+import asyncio
+import gzip
+
+from sqlalchemy import (
+    TextClause,
+    bindparam,
+    create_engine,
+    event,
+    inspect,
+    make_url,
+    text,
+)
+from sqlalchemy.engine import URL, Engine, Result
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from src.settings import settings
 from src.utils.exceptions import DatabaseFailedException
 
-# Cria o motor de conexão com o banco de dados usando a URI das configurações
-engine = create_engine(settings.database_uri)
+from .chart_specs import ChartSpec
+
+# Pragmas do SQLite: o `auto_vacuum` incremental só vale para um banco novo (antes do
+# WAL, que já grava a primeira página); WAL permite leituras concorrentes com uma escrita
+# e `synchronous=NORMAL` é seguro com WAL; as demais reduzem E/S (cache de páginas,
+# tabelas temporárias e mmap)
+SQLITE_PRAGMAS = {
+    'auto_vacuum': 'INCREMENTAL',
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+    'mmap_size': 256 * 1024**2,
+}
+
+# Formatos do gráfico salvo (coluna `format_version`): 0 é o JSON em texto na coluna
+# `graph_json` (gráficos antigos), 1 é o JSON comprimido com gzip na coluna `graph_data`
+# e 2 é a especificação do gráfico (`ChartSpec`) comprimida, renderizada na leitura
+FORMAT_TEXT = 0
+FORMAT_GZIP = 1
+FORMAT_SPEC = 2
+
+# Consultas fixas dos gráficos, compiladas uma única vez e reaproveitadas pelo cache de
+# instruções do SQLAlchemy e do driver
+SELECT_GRAPH = text(
+    'SELECT format_version, graph_data, graph_json FROM charts WHERE "uuid" = :graph_id LIMIT 1'
+)
+SELECT_GRAPHS = text(
+    'SELECT "uuid", format_version, graph_data, graph_json FROM charts WHERE "uuid" IN :graph_ids'
+).bindparams(bindparam('graph_ids', expanding=True))
+SELECT_METADATA = text('SELECT metadata FROM charts WHERE "uuid" = :graph_id LIMIT 1')
+# Os IDs são derivados do conteúdo: um gráfico já salvo com o mesmo ID é mantido
+INSERT_GRAPH = text(
+    'INSERT INTO charts ("uuid", "graph_data", "format_version", "metadata") '
+    'VALUES (:graph_id, :graph_data, :format_version, :metadata) '
+    'ON CONFLICT ("uuid") DO NOTHING'
+)
+SELECT_TEXT_GRAPHS = text(
+    'SELECT "uuid", graph_json FROM charts WHERE format_version = :format_version LIMIT :limit'
+)
+UPDATE_GRAPH_DATA = text(
+    'UPDATE charts SET graph_data = :graph_data, graph_json = NULL, '
+    'format_version = :format_version WHERE "uuid" = :graph_id'
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f'PRAGMA {pragma}={value}')
+    cursor.close()
+
+
+def _pool_args(url: URL) -> dict:
+    # Bancos SQLite em memória usam um pool próprio, de uma conexão por thread
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+
+    return {
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+    }
+
+
+def _create_engine() -> Engine:
+    """Motor síncrono com pool de conexões, usado pelas ferramentas dos agentes."""
+    url = make_url(settings.database_uri)
+
+    if url.get_backend_name() != 'sqlite':
+        return create_engine(url, pool_pre_ping=True, **_pool_args(url))
+
+    engine = create_engine(
+        url,
+        connect_args={'check_same_thread': False, 'cached_statements': 256},
+        **_pool_args(url),
+    )
+    event.listen(engine, 'connect', _set_sqlite_pragmas)
+
+    return engine
+
+
+def _create_async_engine() -> AsyncEngine | None:
+    """
+    Motor assíncrono com pool de conexões para as rotas da API. Para o SQLite usa o
+    driver aiosqlite; para outros bancos, `async_database_uri` deve informar um driver
+    assíncrono, senão as funções assíncronas executam as síncronas em uma thread.
+    """
+    if settings.async_database_uri:
+        url = make_url(settings.async_database_uri)
+    else:
+        url = make_url(settings.database_uri)
+        if url.get_backend_name() != 'sqlite':
+            return None
+        url = url.set(drivername='sqlite+aiosqlite')
+
+    if url.get_backend_name() != 'sqlite':
+        return create_async_engine(url, pool_pre_ping=True, **_pool_args(url))
+
+    engine = create_async_engine(
+        url, connect_args={'cached_statements': 256}, **_pool_args(url)
+    )
+    event.listen(engine.sync_engine, 'connect', _set_sqlite_pragmas)
+
+    return engine
+
+
+# Cria os motores de conexão com o banco de dados usando a URI das configurações
+engine = _create_engine()
+async_engine = _create_async_engine()
 
 
 def execute_query(
-    user_query: str,
+    user_query: str | TextClause,
     parameters: dict[str, any] | None = None,
     commit: bool = False,
 ) -> Result:
@@ -25,18 +145,22 @@ def execute_query(
         commit: Se True, efetua o commit da transação após a execução.
 
     Returns:
-        O objeto Result retornado pelo SQLAlchemy.
+        O objeto Result retornado pelo SQLAlchemy, com as linhas já lidas, de modo
+        que pode ser usado depois que a conexão volta ao pool.
 
     Raises:
         SQLAlchemyError: Se ocorrer qualquer erro de banco de dados.
     """
 
+    query = text(user_query) if isinstance(user_query, str) else user_query
+
     try:
-        # Abre uma conexão com o motor do banco de dados
+        # Obtém uma conexão do pool do motor do banco de dados
         with engine.connect() as conn:
-            query = text(user_query)
             result = conn.execute(query, parameters)
 
+            if result.returns_rows:
+                result = result.freeze()()
             if commit:
                 conn.commit()
             return result
@@ -45,20 +169,179 @@ def execute_query(
         raise
 
 
+async def execute_query_async(
+    user_query: str | TextClause,
+    parameters: dict[str, any] | None = None,
+    commit: bool = False,
+) -> Result:
+    """Versão assíncrona de `execute_query`, sem bloquear o loop de eventos."""
+
+    if async_engine is None:
+        return await asyncio.to_thread(execute_query, user_query, parameters, commit)
+
+    query = text(user_query) if isinstance(user_query, str) else user_query
+
+    try:
+        async with async_engine.connect() as conn:
+            result = await conn.execute(query, parameters)
+
+            if result.returns_rows:
+                result = result.freeze()()
+            if commit:
+                await conn.commit()
+            return result
+    except SQLAlchemyError as e:
+        print(f'Database query failed: {e}')
+        raise
+
+
+def compress_graph(graph_json: str) -> bytes:
+    """Comprime o JSON de um gráfico no formato gzip, aceito diretamente pelos navegadores."""
+
+    return gzip.compress(
+        graph_json.encode(), compresslevel=settings.chart_compress_level, mtime=0
+    )
+
+
+def compress_spec(spec: ChartSpec) -> bytes:
+    """Comprime a especificação de um gráfico para ser salva no banco de dados."""
+
+    return gzip.compress(
+        spec.dumps(), compresslevel=settings.chart_compress_level, mtime=0
+    )
+
+
+def render_spec(graph_data: bytes) -> str:
+    """Renderiza o JSON da figura a partir da especificação comprimida."""
+
+    return ChartSpec.loads(gzip.decompress(graph_data)).render().to_json()
+
+
+def _graph_json(row) -> str | None:
+    """JSON em texto de um gráfico salvo em qualquer um dos formatos."""
+
+    if row is None:
+        return None
+    if row.format_version == FORMAT_SPEC:
+        return render_spec(row.graph_data)
+    if row.format_version == FORMAT_GZIP:
+        return gzip.decompress(row.graph_data).decode()
+
+    return row.graph_json
+
+
+def _graph_data(row) -> bytes | None:
+    """JSON comprimido com gzip de um gráfico salvo em qualquer um dos formatos."""
+
+    if row is None:
+        return None
+    if row.format_version == FORMAT_SPEC:
+        return compress_graph(render_spec(row.graph_data))
+    if row.format_version == FORMAT_GZIP:
+        return bytes(row.graph_data)
+
+    return compress_graph(row.graph_json)
+
+
+def migrate_charts() -> int:
+    """
+    Acrescenta as colunas do formato comprimido a uma tabela 'charts' antiga e
+    comprime, em lotes, os gráficos salvos em texto.
+
+    Returns:
+        int: Quantidade de gráficos convertidos.
+    """
+
+    columns = {column['name'] for column in inspect(engine).get_columns('charts')}
+
+    if 'graph_data' not in columns:
+        execute_query('ALTER TABLE charts ADD COLUMN graph_data BLOB', commit=True)
+    if 'format_version' not in columns:
+        execute_query(
+            'ALTER TABLE charts ADD COLUMN format_version INTEGER NOT NULL DEFAULT 0',
+            commit=True,
+        )
+
+    migrated = 0
+
+    while True:
+        rows = execute_query(
+            SELECT_TEXT_GRAPHS,
+            {
+                'format_version': FORMAT_TEXT,
+                'limit': settings.chart_migration_batch_size,
+            },
+        ).all()
+
+        if not rows:
+            return migrated
+
+        execute_query(
+            UPDATE_GRAPH_DATA,
+            [
+                {
+                    'graph_id': row.uuid,
+                    'graph_data': compress_graph(row.graph_json or 'null'),
+                    'format_version': FORMAT_GZIP,
+                }
+                for row in rows
+            ],
+            commit=True,
+        )
+        migrated += len(rows)
+
+
+def enable_incremental_vacuum() -> bool:
+    """
+    Ativa o `auto_vacuum` incremental do SQLite, que permite devolver ao sistema as
+    páginas liberadas pelas exclusões em pequenas etapas. Bancos novos já são criados
+    assim; em um banco já existente a mudança só vale após um VACUUM completo, que
+    reescreve o arquivo e bloqueia as escritas, executado uma única vez pela
+    compactação em segundo plano.
+
+    Returns:
+        bool: Se o VACUUM completo foi executado.
+    """
+
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        if conn.exec_driver_sql('PRAGMA auto_vacuum').scalar() == 2:
+            return False
+
+        conn.exec_driver_sql('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.exec_driver_sql('VACUUM')
+
+    return True
+
+
 def init_db() -> None:
-    """Inicializa o banco de dados criando a tabela 'charts' se ela não existir."""
+    """
+    Inicializa o banco de dados criando a tabela 'charts' e seus índices se eles não
+    existirem e migrando os gráficos salvos em texto para o formato comprimido.
+    """
 
     query = """\
     CREATE TABLE IF NOT EXISTS charts(
     uuid VARCHAR(36) PRIMARY KEY,
     graph_json JSON,
+    graph_data BLOB,
+    format_version INTEGER NOT NULL DEFAULT 0,
     metadata VARCHAR(500),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
     """
 
     try:
         # Executa a query de criação da tabela
-        execute_query(query)
+        execute_query(query, commit=True)
+        execute_query(
+            'CREATE INDEX IF NOT EXISTS idx_charts_created_at ON charts(created_at)',
+            commit=True,
+        )
+        migrated = migrate_charts()
+        if migrated:
+            print(f'{migrated} charts migrated to the compressed format.')
         print('Database initialized successfully.')
     except SQLAlchemyError as e:
         # Captura e relança exceção de falha na inicialização
@@ -66,6 +349,19 @@ def init_db() -> None:
         raise DatabaseFailedException
 
 
+async def close_db() -> None:
+    """
+    Fecha as conexões mantidas nos pools, ao encerrar a aplicação (no lifespan). Cada
+    conexão do aiosqlite mantém uma thread não daemon: scripts e testes que usam as
+    funções assíncronas fora da aplicação devem aguardar `close_db` antes de terminar,
+    senão o interpretador não encerra.
+    """
+
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
 def get_graph_db(graph_id: str) -> str | None:
     """
     Recupera o JSON do gráfico para um determinado ID.
@@ -77,16 +373,61 @@ def get_graph_db(graph_id: str) -> str | None:
         Os dados do gráfico como uma string JSON, ou None se não for encontrado.
     """
 
-    query = 'SELECT graph_json FROM charts WHERE "uuid" = :graph_id LIMIT 1'
     try:
-        # Executa a consulta e retorna o resultado escalar
-        result = execute_query(query, {'graph_id': graph_id})
-        return result.scalar_one_or_none()
+        # Executa a consulta e descomprime o gráfico encontrado
+        result = execute_query(SELECT_GRAPH, {'graph_id': graph_id})
+        return _graph_json(result.one_or_none())
     except SQLAlchemyError:
         # Em caso de erro, levanta a exceção customizada
         raise DatabaseFailedException
 
 
+async def get_graph_db_async(graph_id: str) -> str | None:
+    """Versão assíncrona de `get_graph_db`."""
+
+    try:
+        result = await execute_query_async(SELECT_GRAPH, {'graph_id': graph_id})
+        return await asyncio.to_thread(_graph_json, result.one_or_none())
+    except SQLAlchemyError:
+        raise DatabaseFailedException
+
+
+async def get_graph_data_async(graph_id: str) -> bytes | None:
+    """
+    Recupera o JSON do gráfico comprimido com gzip, sem descomprimi-lo, para ser
+    enviado diretamente aos clientes que aceitam essa codificação.
+    """
+
+    try:
+        result = await execute_query_async(SELECT_GRAPH, {'graph_id': graph_id})
+        # Especificações são renderizadas fora do loop de eventos
+        return await asyncio.to_thread(_graph_data, result.one_or_none())
+    except SQLAlchemyError:
+        raise DatabaseFailedException
+
+
+async def get_graphs_data_async(graph_ids: list[str]) -> dict[str, bytes]:
+    """
+    Recupera em uma única consulta o JSON comprimido de vários gráficos.
+
+    Returns:
+        dict[str, bytes]: JSON comprimido por ID; IDs não encontrados são omitidos.
+    """
+
+    if not graph_ids:
+        return {}
+
+    try:
+        result = await execute_query_async(
+            SELECT_GRAPHS, {'graph_ids': list(dict.fromkeys(graph_ids))}
+        )
+        return await asyncio.to_thread(
+            lambda: {row.uuid: _graph_data(row) for row in result}
+        )
+    except SQLAlchemyError:
+        raise DatabaseFailedException
+
+
 def get_graph_metadata(graph_id: str) -> str | None:
     """
     Recupera os metadados para um determinado ID de gráfico.
@@ -98,10 +439,19 @@ def get_graph_metadata(graph_id: str) -> str | None:
         Os metadados como uma string, ou None se não forem encontrados.
     """
 
-    query = 'SELECT metadata FROM charts WHERE "uuid" = :graph_id LIMIT 1;'
     try:
         # Executa a consulta e retorna o resultado escalar
-        result = execute_query(query, {'graph_id': graph_id})
+        result = execute_query(SELECT_METADATA, {'graph_id': graph_id})
+        return result.scalar_one_or_none()
+    except SQLAlchemyError:
+        raise DatabaseFailedException
+
+
+async def get_graph_metadata_async(graph_id: str) -> str | None:
+    """Versão assíncrona de `get_graph_metadata`."""
+
+    try:
+        result = await execute_query_async(SELECT_METADATA, {'graph_id': graph_id})
         return result.scalar_one_or_none()
     except SQLAlchemyError:
         raise DatabaseFailedException
@@ -110,9 +460,52 @@ def get_graph_metadata(graph_id: str) -> str | None:
 def insert_graphs_db(
     graph_id: str, graph_json: str, metadata: str | None = None
 ) -> None:
-    """Insere um novo registro de gráfico no banco de dados."""
+    """Insere um novo registro de gráfico no banco de dados, com o JSON comprimido."""
+
+    params = {
+        'graph_id': graph_id,
+        'graph_data': compress_graph(graph_json),
+        'format_version': FORMAT_GZIP,
+        'metadata': metadata,
+    }
+
+    execute_query(INSERT_GRAPH, params, commit=True)
+
+
+def insert_compressed_graphs_db(
+    graphs: list[tuple[str, bytes, str | None]], format_version: int = FORMAT_GZIP
+) -> None:
+    """
+    Insere vários gráficos, já comprimidos, em uma única transação.
+
+    Args:
+        graphs: Tuplas (graph_id, dados comprimidos com gzip, metadados).
+        format_version: Formato dos dados: JSON da figura ou especificação do gráfico.
+    """
+
+    params = [
+        {
+            'graph_id': graph_id,
+            'graph_data': graph_data,
+            'format_version': format_version,
+            'metadata': metadata,
+        }
+        for graph_id, graph_data, metadata in graphs
+    ]
+
+    execute_query(INSERT_GRAPH, params, commit=True)
+
+
+async def insert_graphs_db_async(
+    graph_id: str, graph_json: str, metadata: str | None = None
+) -> None:
+    """Versão assíncrona de `insert_graphs_db`."""
 
-    query = 'INSERT INTO charts ("uuid", "graph_json", "metadata") VALUES (:graph_id, :graph_json, :metadata)'
-    params = {'graph_id': graph_id, 'graph_json': graph_json, 'metadata': metadata}
+    params = {
+        'graph_id': graph_id,
+        'graph_data': await asyncio.to_thread(compress_graph, graph_json),
+        'format_version': FORMAT_GZIP,
+        'metadata': metadata,
+    }
 
-    execute_query(query, params, commit=True)
+    await execute_query_async(INSERT_GRAPH, params, commit=True)
@@ -0,0 +1,126 @@
+"""Redução da quantidade de pontos dos gráficos, preservando sua forma visual."""
+
+import numpy as np
+import pandas as pd
+
+
+def _axis_values(series: pd.Series) -> np.ndarray:
+    """Converte uma coluna em coordenadas numéricas (datas em nanossegundos, textos em códigos)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return pd.factorize(series)[0].astype(np.float64)
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: divide os pontos internos em `n_out - 2` faixas e
+    mantém, em cada uma, o ponto que forma o maior triângulo com o ponto escolhido na
+    faixa anterior e a média da faixa seguinte. O primeiro e o último ponto são mantidos.
+    """
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax()) if end > start else start
+        indices[i + 1] = a
+
+    return np.unique(indices)
+
+
+def downsample_line(
+    df: pd.DataFrame, x_column: str, y_column: str, max_points: int
+) -> pd.DataFrame:
+    """
+    Reduz um gráfico de linha a no máximo `max_points` pontos com o algoritmo LTTB,
+    que preserva picos, vales e a tendência da série. Mantém a ordem original das linhas.
+    """
+    data = df[[x_column, y_column]].dropna()
+
+    if len(data) <= max_points or max_points < 3:
+        return data
+
+    y = _axis_values(data[y_column])
+    x = _axis_values(data[x_column])
+
+    # Sem eixo X ordenado, a área dos triângulos é calculada sobre a posição das linhas
+    if not pd.Series(x).is_monotonic_increasing:
+        x = np.arange(len(data), dtype=np.float64)
+
+    return data.iloc[_lttb_indices(x, y, max_points)]
+
+
+def downsample_scatter(
+    df: pd.DataFrame,
+    x_column: str,
+    y_column: str,
+    max_points: int,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Reduz um gráfico de dispersão a no máximo `max_points` pontos com amostragem
+    estratificada em uma grade 2-D: cada célula ocupada mantém pelo menos um ponto
+    (preservando regiões esparsas e valores extremos) e as células densas recebem no
+    máximo a mesma cota de pontos, escolhidos aleatoriamente.
+
+    Args:
+        df (DataFrame): Conjunto de dados.
+        x_column (str): Coluna do eixo X.
+        y_column (str): Coluna do eixo Y.
+        max_points (int): Quantidade máxima de pontos.
+        columns (list[str] | None, optional): Colunas adicionais mantidas (ex.: cor).
+
+    Returns:
+        DataFrame: As linhas amostradas, na ordem original.
+    """
+    data = df[list(dict.fromkeys([x_column, y_column, *(columns or [])]))].dropna(
+        subset=[x_column, y_column]
+    )
+
+    if len(data) <= max_points:
+        return data
+
+    # Grade com no máximo um quarto do orçamento em células, para sobrar cota às densas
+    bins = max(int(np.sqrt(max_points / 4)), 1)
+    cells = np.zeros(len(data), dtype=np.int64)
+
+    for column in (x_column, y_column):
+        values = _axis_values(data[column])
+        low, high = values.min(), values.max()
+        scale = bins / (high - low) if high > low else 0.0
+        cells = cells * bins + np.minimum(
+            ((values - low) * scale).astype(np.int64), bins - 1
+        )
+
+    # Ordem aleatória dentro de cada célula e posição de cada ponto na sua célula
+    rng = np.random.default_rng(0)
+    order = np.argsort(cells + rng.random(len(data)))
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, len(sorted_cells)])
+    rank = np.arange(len(order)) - np.repeat(starts, counts)
+
+    # Maior cota por célula que respeita o orçamento total
+    low, high = 1, int(counts.max())
+    while low < high:
+        quota = (low + high + 1) // 2
+        if np.minimum(counts, quota).sum() <= max_points:
+            low = quota
+        else:
+            high = quota - 1
+
+    return data.iloc[np.sort(order[rank < low])]
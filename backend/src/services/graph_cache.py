@@ -0,0 +1,81 @@
+"""Cache em memória dos gráficos salvos, que não mudam depois de gravados."""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .chart_writer import chart_writer
+from .db_services import get_graph_data_async, get_graphs_data_async
+
+
+@dataclass(frozen=True)
+class CachedGraph:
+    """JSON comprimido com gzip de um gráfico e o hash do seu conteúdo, usado nos ETags."""
+
+    data: bytes
+    digest: str
+
+    @classmethod
+    def from_data(cls, data: bytes) -> 'CachedGraph':
+        return cls(data, hashlib.sha256(data).hexdigest()[:32])
+
+
+graph_cache = LRUCache(
+    max_items=None,
+    max_bytes=settings.graph_cache_max_mb * 1024**2,
+    sizeof=lambda graph: len(graph.data),
+)
+
+
+async def get_cached_graph(graph_id: str) -> CachedGraph | None:
+    """
+    Retorna o gráfico do cache ou o lê dos gráficos ainda não gravados ou do banco de
+    dados e o armazena. Os gráficos salvos como especificação são renderizados apenas
+    nessa primeira leitura.
+    """
+    graph = graph_cache.get(graph_id)
+
+    if graph is None:
+        pending = chart_writer.get_pending(graph_id)
+        if pending is not None:
+            data = await asyncio.to_thread(pending.render)
+        else:
+            data = await get_graph_data_async(graph_id)
+        if data is None:
+            return None
+
+        graph = CachedGraph.from_data(data)
+        graph_cache.set(graph_id, graph)
+
+    return graph
+
+
+async def get_cached_graphs(graph_ids: list[str]) -> dict[str, CachedGraph]:
+    """
+    Retorna vários gráficos, lendo do banco de dados em uma única consulta apenas os
+    que não estão no cache. IDs não encontrados são omitidos.
+    """
+    graphs = {}
+    missing = []
+
+    for graph_id in dict.fromkeys(graph_ids):
+        graph = graph_cache.get(graph_id)
+        pending = chart_writer.get_pending(graph_id) if graph is None else None
+
+        if pending is not None:
+            graph = CachedGraph.from_data(await asyncio.to_thread(pending.render))
+            graph_cache.set(graph_id, graph)
+
+        if graph is None:
+            missing.append(graph_id)
+        else:
+            graphs[graph_id] = graph
+
+    for graph_id, data in (await get_graphs_data_async(missing)).items():
+        graphs[graph_id] = CachedGraph.from_data(data)
+        graph_cache.set(graph_id, graphs[graph_id])
+
+    return graphs
@@ -0,0 +1,158 @@
+"""Serviço para inferência do formato e dos tipos de um CSV a partir de uma amostra inicial."""
+
+import csv
+import io
+import re
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+
+DELIMITERS = ',;\t|'
+SNIFF_SIZE = 64 * 1024  # bytes analisados para detectar o separador e o cabeçalho
+
+# Números com vírgula decimal (1.234,56 ou 1234,56) e com ponto decimal (1,234.56 ou 1234.56)
+COMMA_DECIMAL = re.compile(r'^-?(\d{1,3}(\.\d{3})+|\d+),\d+$')
+DOT_DECIMAL = re.compile(r'^-?(\d{1,3}(,\d{3})+|\d+)\.\d+$')
+DOT_THOUSANDS = re.compile(r'^-?\d{1,3}(\.\d{3})+(,\d+)?$')
+INTEGER = re.compile(r'^-?\d+$')
+
+
+@dataclass
+class CSVDialect:
+    """Formato de um CSV e os tipos das colunas usados na leitura completa."""
+
+    encoding: str = 'utf-8'
+    separator: str = ','
+    decimal: str = '.'
+    thousands: str | None = None
+    header: int | None = 0
+    dtypes: dict[str | int, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _decode(sample: bytes) -> tuple[str, str]:
+    """Decodifica a amostra em UTF-8 ou, se inválida, em Latin-1 (comum em arquivos do Excel)."""
+    try:
+        return sample.decode('utf-8-sig'), 'utf-8-sig'
+    except UnicodeDecodeError:
+        return sample.decode('latin-1'), 'latin-1'
+
+
+def _detect_decimal(text: str, separator: str) -> tuple[str, str | None]:
+    """
+    Detecta o separador decimal e de milhar contando os valores numéricos da amostra
+    em cada formato. Vírgula decimal só é possível quando o separador de campos não é vírgula.
+    """
+    if separator == ',':
+        return '.', None
+
+    values = [
+        value.strip().strip('"')
+        for row in csv.reader(io.StringIO(text), delimiter=separator)
+        for value in row
+    ]
+    comma = sum(1 for v in values if COMMA_DECIMAL.match(v))
+    dot = sum(1 for v in values if DOT_DECIMAL.match(v))
+
+    if comma > dot:
+        thousands = '.' if any(DOT_THOUSANDS.match(v) for v in values) else None
+        return ',', thousands
+
+    return '.', None
+
+
+def _detect_header(text: str, separator: str, sniffer: csv.Sniffer) -> int | None:
+    """
+    Detecta se a primeira linha é de cabeçalhos. Por padrão ela é tratada como
+    cabeçalho; o CSV só é lido sem cabeçalhos quando o `csv.Sniffer` não o detecta e
+    a primeira linha tem algum valor numérico, já que nomes de colunas raramente são
+    números e o `Sniffer` falha em arquivos com apenas colunas de texto.
+    """
+    try:
+        if sniffer.has_header(text):
+            return 0
+    except csv.Error:
+        return 0
+
+    first_row = next(csv.reader(io.StringIO(text), delimiter=separator), [])
+    values = [value.strip().strip('"') for value in first_row]
+
+    if any(
+        INTEGER.match(v) or COMMA_DECIMAL.match(v) or DOT_DECIMAL.match(v)
+        for v in values
+    ):
+        return None
+
+    return 0
+
+
+def _infer_dtypes(sample: pd.DataFrame) -> dict[str | int, str]:
+    """
+    Mapeia os tipos inferidos na amostra para tipos explícitos da leitura completa.
+    Inteiros usam o tipo anulável `Int64`, já que valores nulos podem aparecer após a amostra.
+    Colunas de texto não são fixadas e são tratadas na compactação.
+    """
+    dtypes = {}
+
+    for column, dtype in sample.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[column] = 'boolean'
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[column] = 'Int64'
+        elif pd.api.types.is_float_dtype(dtype):
+            dtypes[column] = 'float64'
+
+    return dtypes
+
+
+def infer_csv_dialect(
+    sample: bytes, separator: str | None = None, header: int | None = None
+) -> CSVDialect:
+    """
+    Infere codificação, separador, separador decimal, linha de cabeçalho e os tipos
+    das colunas de um CSV a partir de uma amostra do início do arquivo.
+
+    Args:
+        sample (bytes): Bytes iniciais do arquivo.
+        separator (str | None, optional): Separador informado, inferido quando None.
+        header (int | None, optional): Linha do cabeçalho informada, inferida quando None.
+
+    Returns:
+        CSVDialect: O formato inferido do CSV.
+    """
+    # Descarta a última linha, possivelmente incompleta
+    if b'\n' in sample:
+        sample = sample[: sample.rindex(b'\n') + 1]
+
+    text, encoding = _decode(sample)
+    sniff_text = text[:SNIFF_SIZE]
+    sniffer = csv.Sniffer()
+
+    if separator is None:
+        try:
+            separator = sniffer.sniff(sniff_text, delimiters=DELIMITERS).delimiter
+        except csv.Error:
+            separator = ','
+
+    if header is None:
+        header = _detect_header(sniff_text, separator, sniffer)
+
+    decimal, thousands = _detect_decimal(sniff_text, separator)
+    dialect = CSVDialect(encoding, separator, decimal, thousands, header)
+
+    try:
+        sample_df = pd.read_csv(
+            io.StringIO(text),
+            sep=separator,
+            header=header,
+            decimal=decimal,
+            thousands=thousands,
+        )
+    except (ValueError, pd.errors.ParserError):
+        return dialect
+
+    dialect.dtypes = _infer_dtypes(sample_df)
+
+    return dialect
@@ -0,0 +1,113 @@
+"""Consultas SQL somente leitura sobre o conjunto de dados da sessão, executadas no DuckDB."""
+
+import threading
+
+import duckdb
+import pandas as pd
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .dataset_registry import get_dataframe, get_dataset_version
+
+TABLE_NAME = 'data'
+
+
+def _connect(df: pd.DataFrame) -> duckdb.DuckDBPyConnection:
+    """
+    Cria uma conexão em memória com o DataFrame registrado como a tabela `data`, lido
+    diretamente pelo DuckDB (sem cópia). O acesso a arquivos e a rede é desativado e a
+    configuração é travada, de modo que as consultas não possam reativá-los.
+    """
+    con = duckdb.connect(':memory:')
+    con.register(TABLE_NAME, df)
+
+    if settings.sql_threads:
+        con.execute(f'SET threads = {int(settings.sql_threads)}')
+    con.execute(f"SET memory_limit = '{int(settings.sql_memory_limit_mb)}MB'")
+    con.execute('SET enable_external_access = false')
+    con.execute('SET lock_configuration = true')
+
+    return con
+
+
+def _validate(query: str) -> str:
+    """Aceita apenas uma única instrução SELECT, sem o ponto e vírgula final."""
+    try:
+        statements = duckdb.extract_statements(query)
+    except duckdb.Error as e:
+        raise ValueError(str(e)) from e
+
+    if len(statements) != 1:
+        raise ValueError('Only one SQL statement can be executed at a time.')
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError('Only read-only SELECT queries are allowed.')
+
+    return query.strip().rstrip(';')
+
+
+def execute_sql(
+    df: pd.DataFrame, query: str, max_rows: int, timeout: float
+) -> tuple[pd.DataFrame, bool]:
+    """
+    Executa uma consulta SELECT sobre `df` (tabela `data`) usando todas as CPUs.
+
+    Args:
+        df (DataFrame): Conjunto de dados consultado.
+        query (str): Consulta SQL (dialeto do DuckDB).
+        max_rows (int): Linhas máximas do resultado.
+        timeout (float): Tempo máximo de execução em segundos.
+
+    Returns:
+        tuple[DataFrame, bool]: O resultado e se ele foi truncado em `max_rows` linhas.
+    """
+    query = _validate(query)
+    con = _connect(df)
+
+    # O DuckDB não tem tempo limite por consulta: a consulta é interrompida por um timer
+    timer = threading.Timer(timeout, con.interrupt)
+    timer.start()
+
+    try:
+        result = con.sql(query).limit(max_rows + 1).df()
+    except duckdb.InterruptException as e:
+        raise ValueError(
+            f'Query exceeded the time limit of {timeout:g} seconds.'
+        ) from e
+    except duckdb.Error as e:
+        raise ValueError(str(e)) from e
+    finally:
+        timer.cancel()
+        con.close()
+
+    return result.head(max_rows), len(result) > max_rows
+
+
+query_cache = LRUCache(
+    max_items=settings.sql_cache_size,
+    max_bytes=settings.sql_cache_max_mb * 1024**2,
+    sizeof=lambda item: int(item[0].memory_usage(deep=True).sum()),
+)
+
+
+def run_query(
+    query: str, session: str | None = None
+) -> tuple[pd.DataFrame, bool] | None:
+    """
+    Executa uma consulta sobre o conjunto de dados da sessão. Os resultados são
+    mantidos em cache por versão do conjunto de dados e texto da consulta.
+    """
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    return query_cache.get_or_set(
+        (version, query.strip()),
+        lambda: execute_sql(
+            get_dataframe(session),
+            query,
+            settings.sql_max_rows,
+            settings.sql_timeout_seconds,
+        ),
+    )
@@ -0,0 +1,195 @@
+"""Séries temporais: índice de datas ordenado mantido em cache e reamostragem por período."""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.settings import settings
+from src.utils.cache import LRUCache
+
+from .data_compaction import parse_dates
+from .dataset_registry import get_dataframe, get_dataset_version
+
+# Períodos aceitos e as frequências do pandas correspondentes (rotuladas pelo início)
+FREQUENCIES = {
+    'H': 'h',
+    'D': 'D',
+    'W': 'W-MON',
+    'M': 'MS',
+    'Q': 'QS',
+    'Y': 'YS',
+}
+AGGREGATIONS = ('sum', 'mean', 'count', 'min', 'max', 'median', 'last')
+
+# Deslocamento, em períodos, da comparação com o mesmo período do ano anterior
+YEAR_OVER_YEAR = {'D': 365, 'W': 52, 'M': 12, 'Q': 4, 'Y': 1}
+
+
+@dataclass
+class TimeIndex:
+    """Datas válidas de uma coluna em ordem crescente e a posição de cada uma no conjunto de dados."""
+
+    column: str
+    values: pd.DatetimeIndex
+    positions: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.positions.nbytes
+
+
+def build_time_index(df: pd.DataFrame, column: str) -> TimeIndex:
+    """
+    Converte a coluna para datas, quando ainda não for, e a ordena uma única vez.
+
+    Raises:
+        ValueError: Se a coluna não existir ou não contiver datas.
+    """
+    if column not in df.columns:
+        raise ValueError(f'Column "{column}" not found in the dataset.')
+
+    series = df[column]
+    if pd.api.types.is_numeric_dtype(series):
+        raise ValueError(f'Column "{column}" is not a date column.')
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        series = parse_dates(series)
+        if series is None:
+            raise ValueError(f'Column "{column}" is not a date column.')
+
+    values = series.to_numpy(dtype='datetime64[ns]')
+    positions = np.flatnonzero(~np.isnat(values))
+    positions = positions[np.argsort(values[positions], kind='stable')]
+
+    return TimeIndex(column, pd.DatetimeIndex(values[positions]), positions)
+
+
+def auto_frequency(index: TimeIndex, max_points: int) -> str:
+    """Menor período (de hora em hora a anual) que resulta em até `max_points` pontos."""
+    if len(index.values) == 0:
+        return 'D'
+
+    span = index.values[-1] - index.values[0]
+
+    for period, length in (
+        ('H', pd.Timedelta(hours=1)),
+        ('D', pd.Timedelta(days=1)),
+        ('W', pd.Timedelta(weeks=1)),
+        ('M', pd.Timedelta(days=31)),
+        ('Q', pd.Timedelta(days=92)),
+    ):
+        if span / length <= max_points:
+            return period
+
+    return 'Y'
+
+
+def resample_series(
+    df: pd.DataFrame,
+    index: TimeIndex,
+    value_column: str | None,
+    period: str,
+    aggregation: str = 'sum',
+) -> pd.Series:
+    """
+    Agrega uma coluna numérica (ou conta as linhas) por período sobre o índice
+    ordenado, incluindo os períodos sem dados.
+
+    Args:
+        df (DataFrame): Conjunto de dados.
+        index (TimeIndex): Índice de datas do conjunto de dados.
+        value_column (str | None): Coluna numérica; None conta as linhas.
+        period (str): Período de `FREQUENCIES`.
+        aggregation (str, optional): Função de `AGGREGATIONS`.
+
+    Returns:
+        Series: Um valor por período, indexado pelo início do período.
+    """
+    if period not in FREQUENCIES:
+        raise ValueError(
+            f'Invalid period "{period}". Choose from {", ".join(FREQUENCIES)}.'
+        )
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(
+            f'Invalid aggregation "{aggregation}". Choose from {", ".join(AGGREGATIONS)}.'
+        )
+
+    if value_column is None:
+        values = np.ones(len(index.positions), dtype=np.int64)
+        aggregation, name = 'sum', 'count'
+    else:
+        if value_column not in df.columns:
+            raise ValueError(f'Column "{value_column}" not found in the dataset.')
+        if not pd.api.types.is_numeric_dtype(
+            df[value_column]
+        ) or pd.api.types.is_bool_dtype(df[value_column]):
+            raise ValueError(f'Column "{value_column}" is not numeric.')
+
+        values = df[value_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[index.positions]
+        name = f'{aggregation}({value_column})'
+
+    series = pd.Series(values, index=index.values, name=name)
+
+    return series.resample(FREQUENCIES[period]).agg(aggregation)
+
+
+def time_series_table(
+    series: pd.Series,
+    period: str,
+    rolling_window: int | None = None,
+    compare: str | None = None,
+) -> pd.DataFrame:
+    """
+    Acrescenta à série reamostrada a média móvel e a variação em relação ao período
+    anterior ('previous') ou ao mesmo período do ano anterior ('year').
+    """
+    table = series.to_frame()
+    table.index.name = 'period'
+
+    if rolling_window:
+        table[f'rolling_mean_{rolling_window}'] = series.rolling(
+            rolling_window, min_periods=1
+        ).mean()
+
+    if compare == 'previous':
+        shift = 1
+    elif compare == 'year':
+        if period not in YEAR_OVER_YEAR:
+            raise ValueError(
+                f'Year-over-year comparison is not available for "{period}".'
+            )
+        shift = YEAR_OVER_YEAR[period]
+    elif compare:
+        raise ValueError(f'Invalid compare "{compare}". Choose from previous, year.')
+
+    if compare:
+        previous = series.shift(shift)
+        table['change'] = series - previous
+        table['change_pct'] = (100 * table['change'] / previous.abs()).replace(
+            [np.inf, -np.inf], np.nan
+        )
+
+    return table
+
+
+time_index_cache = LRUCache(
+    max_items=settings.time_index_cache_size,
+    max_bytes=settings.time_index_cache_max_mb * 1024**2,
+    sizeof=lambda index: index.nbytes,
+)
+
+
+def get_time_index(column: str, session: str | None = None) -> TimeIndex | None:
+    """
+    Retorna o índice de datas ordenado de uma coluna do conjunto de dados da sessão,
+    convertido e ordenado uma única vez por versão do conjunto de dados.
+    """
+    version = get_dataset_version(session)
+
+    if version is None:
+        return None
+
+    return time_index_cache.get_or_set(
+        (version, column), lambda: build_time_index(get_dataframe(session), column)
+    )
@@ -10,6 +10,117 @@ class Settings(BaseSettings):
     groq_api_key: str | None = None
     gemini_api_key: str | None = None
     database_uri: str
+    # URI com driver assíncrono; derivada de `database_uri` (aiosqlite) quando SQLite
+    async_database_uri: str | None = None
+    # Pool de conexões do banco de dados: conexões mantidas e extras sob demanda
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Compressão gzip do JSON dos gráficos salvos (1 a 9) e linhas convertidas por lote
+    # na migração dos gráficos salvos em texto
+    chart_compress_level: int = 6
+    chart_migration_batch_size: int = 500
+    # Gráficos comprimidos mantidos em cache (MB) e IDs máximos por requisição em lote
+    graph_cache_max_mb: int = 128
+    graph_batch_max_ids: int = 100
+    # Gravação dos gráficos em segundo plano: gráficos por transação e tempo máximo
+    # (segundos) de espera para agrupar gráficos em uma transação
+    chart_write_batch_size: int = 64
+    chart_flush_interval_seconds: float = 0.05
+    # Threads que executam as ferramentas síncronas dos agentes e as demais tarefas
+    # bloqueantes fora do loop de eventos (None usa o padrão do asyncio)
+    agent_tool_workers: int | None = None
+    # Sessões (thread_id) com memória de conversa do supervisor mantidas; as usadas há
+    # mais tempo são descartadas
+    agent_memory_max_sessions: int = 256
+    # Retenção dos gráficos salvos (None desativa cada limite): idade máxima em dias,
+    # quantidade máxima e tamanho total máximo (MB); intervalo (segundos) da compactação,
+    # gráficos excluídos por transação e páginas devolvidas por etapa do vacuum incremental
+    chart_ttl_days: float | None = None
+    chart_max_rows: int | None = None
+    chart_max_mb: int | None = None
+    chart_compaction_interval_seconds: float = 3600
+    chart_compaction_batch_size: int = 1000
+    chart_vacuum_pages: int = 2000
+    # Resultados de ferramentas de gráficos mantidos para reaproveitar pedidos repetidos
+    chart_dedup_cache_size: int = 256
+
+    # Ingestão de arquivos enviados: tamanho dos blocos lidos do upload, limite em
+    # bytes para o upload passar da memória para o disco, linhas por bloco na leitura
+    # do CSV, bytes iniciais usados para inferir o formato do CSV, diretório dos
+    # conjuntos de dados persistidos e processos usados na leitura de ZIPs com vários
+    # CSVs (None usa a quantidade de CPUs)
+    upload_chunk_size: int = 1024 * 1024
+    upload_spool_max_size: int = 32 * 1024 * 1024
+    csv_chunk_rows: int = 200_000
+    inference_sample_size: int = 1024 * 1024
+    # Proporção máxima de valores distintos de um texto convertido em `category`
+    category_max_ratio: float = 0.05
+    dataset_store_dir: str = 'data/datasets'
+    ingest_workers: int | None = None
+
+    # Orçamento total de memória (MB) dos conjuntos de dados mantidos por sessão
+    dataset_memory_budget_mb: int = 2048
+
+    # Estatísticas incrementais: itens por nível do sketch de quantis e valores
+    # distintos máximos para manter a contagem de valores de uma coluna
+    stats_sketch_size: int = 256
+    stats_max_distinct: int = 1000
+
+    # Perfis de conjuntos de dados mantidos em cache (um por versão) e quantidade de
+    # valores mais frequentes registrados por coluna
+    profile_cache_size: int = 32
+    profile_top_values: int = 5
+
+    # Matrizes de correlação mantidas em cache e linhas amostradas no modo aproximado
+    correlation_cache_size: int = 32
+    correlation_sample_rows: int = 200_000
+
+    # Quantidade máxima de pontos dos gráficos de dispersão e de linha
+    chart_max_points: int = 5000
+
+    # Faixas máximas dos histogramas e valores extremos exibidos por caixa nos box plots
+    histogram_max_bins: int = 100
+    box_max_outliers: int = 1000
+
+    # Agrupamento: linhas da amostra usada no ajuste, a partir de quantas linhas usar
+    # mini-batches e seu tamanho, linhas usadas na silhueta, maior k avaliado,
+    # processos da avaliação de k (-1 usa todas as CPUs) e modelos mantidos em cache
+    cluster_sample_rows: int = 100_000
+    cluster_minibatch_threshold: int = 20_000
+    cluster_batch_size: int = 4096
+    cluster_silhouette_rows: int = 5000
+    cluster_max_k: int = 10
+    cluster_workers: int = -1
+    cluster_cache_size: int = 16
+
+    # Relatórios de valores anômalos mantidos em cache e linhas retornadas por página
+    anomaly_cache_size: int = 32
+    anomaly_page_size: int = 20
+
+    # Saídas das ferramentas para os agentes: orçamento de caracteres (~4 por token),
+    # linhas e colunas máximas, casas decimais e caracteres máximos por célula
+    tool_output_max_chars: int = 4000
+    tool_output_max_rows: int = 50
+    tool_output_max_cols: int = 20
+    tool_output_decimals: int = 4
+    tool_output_max_cell_chars: int = 60
+
+    # Consultas SQL (DuckDB): linhas máximas e tempo limite (segundos) de cada consulta,
+    # threads (None usa todas as CPUs), memória máxima (MB) e resultados em cache
+    sql_max_rows: int = 10_000
+    sql_timeout_seconds: float = 30.0
+    sql_threads: int | None = None
+    sql_memory_limit_mb: int = 2048
+    sql_cache_size: int = 64
+    sql_cache_max_mb: int = 256
+
+    # Agregações por grupo materializadas em cache: quantidade e tamanho total (MB)
+    aggregate_cache_size: int = 128
+    aggregate_cache_max_mb: int = 256
+
+    # Índices de datas ordenados mantidos em cache: quantidade e tamanho total (MB)
+    time_index_cache_size: int = 16
+    time_index_cache_max_mb: int = 512
 
     model_config = SettingsConfigDict(
         env_file='.env',
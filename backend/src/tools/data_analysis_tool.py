@@ -1,60 +1,110 @@
 """Ferramentas para o agente de análise de dados"""
 
-import io
 import uuid
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
 from langchain.tools import tool
 from plotly.basedatatypes import BaseFigure
-from sklearn.cluster import KMeans
 
-from src.services.data_processing import get_dataframe
-from src.services.db_services import get_graph_metadata, insert_graphs_db
-
-
-def _save_graph_to_db(fig: BaseFigure, metadata: str) -> str:
+from src.services.aggregation import get_aggregate
+from src.services.anomalies import get_anomaly_report, get_anomaly_rows
+from src.services.chart_aggregates import compute_box_groups, compute_histogram
+from src.services.chart_identity import current_chart_id, deduplicate_chart
+from src.services.chart_specs import ChartSpec
+from src.services.chart_writer import chart_writer
+from src.services.clustering import get_cluster_model, get_cluster_scores
+from src.services.correlation import get_correlation
+from src.services.dataset_profile import get_dataset_profile
+from src.services.dataset_registry import (
+    get_dataframe,
+    get_dataset_stats,
+    get_dataset_version,
+)
+from src.services.db_services import get_graph_metadata
+from src.services.downsampling import downsample_line, downsample_scatter
+from src.services.time_series import (
+    auto_frequency,
+    get_time_index,
+    resample_series,
+    time_series_table,
+)
+from src.settings import settings
+from src.utils.formatting import format_table
+
+
+def _save_graph_to_db(spec: ChartSpec | BaseFigure, metadata: str) -> str:
     """
-    Função para salvar o JSON gerado por ferramentas no banco de dados.
+    Função para salvar a especificação dos gráficos gerados por ferramentas no banco
+    de dados; a figura só é montada quando o gráfico é lido. Figuras prontas (ex.: da
+    ferramenta de código Python) também são aceitas. A gravação é feita em
+    segundo plano e o graph_id, derivado do conteúdo nas ferramentas com
+    `deduplicate_chart`, é retornado imediatamente.
     """
-    graph_id = str(uuid.uuid4())
-    graph_json = fig.to_json()
-    insert_graphs_db(graph_id, graph_json, metadata)
+    if isinstance(spec, BaseFigure):
+        spec = ChartSpec.from_figure(spec)
+
+    graph_id = current_chart_id.get() or str(uuid.uuid4())
+    spec.version = spec.version or get_dataset_version()
+    chart_writer.submit(graph_id, spec, metadata)
 
     return graph_id
 
 
+def _points_note(plotted: int, rows: int) -> str:
+    """Informa nos metadados a quantidade real de linhas e de pontos exibidos."""
+    if plotted < rows:
+        return f' The dataset has {rows} rows; the chart was downsampled to {plotted} representative points.'
+
+    return f' The chart shows all {rows} rows of the dataset.'
+
+
+def _fmt(value) -> str:
+    """Formata uma estatística numérica para os metadados dos gráficos."""
+    return 'N/A' if value is None else f'{value:.2f}'
+
+
 @tool('get_graph_metadata')
 def get_metadata(graph_id: str):
     """Returns the metadata generated for a specific graph selected by graph_id. Used if the metadata couldn't be found in chat history."""
-    metadata = get_graph_metadata(graph_id)
+    pending = chart_writer.get_pending(graph_id)
+    metadata = pending.metadata if pending else get_graph_metadata(graph_id)
 
     return {'metadata': metadata}
 
 
 @tool('get_data_summary')
-def get_data_summary() -> str:
+def get_data_summary(offset: int = 0) -> str:
     """
     Returns a string with a summary of the DataFrame, including dtypes,
     non-null counts, and descriptive statistics. Use this to get a general
     overview of the dataset.
+
+    Args:
+        offset (int): Index of the first column summarized, for datasets with many
+                      columns. Defaults to 0.
     """
-    df = get_dataframe()
+    profile = get_dataset_profile()
 
-    if df is None or df.empty:
+    if profile is None or profile.rows == 0:
         return 'DataFrame empty, no data to analyse.'
 
-    info_buffer = io.StringIO()
-    df.info(buf=info_buffer)
-    info_str = info_buffer.getvalue()
-
-    desc_str = df.describe(include='all').to_string()
+    info_str = profile.info()
+    table = profile.table()
+    desc_str = format_table(
+        table.iloc[offset:],
+        offset=offset,
+        total_rows=len(table),
+        page_hint='call get_data_summary with offset={offset}',
+    )
 
-    return f'Data Summary:\n\n{info_str}\n\nDescriptive Statistics:\n{desc_str}'
+    return f'Data Summary:\n\n{info_str}\n\nColumns (one per row):\n{desc_str}'
 
 
 @tool('get_data_rows')
-def get_data_rows(n_rows: int = 10, sample_method: str = 'head') -> str:
+def get_data_rows(
+    n_rows: int = 10, sample_method: str = 'head', offset: int = 0
+) -> str:
     """
     Returns a sample of N rows from the DataFrame.
     Use this to get a quick sample of the data and see its structure.
@@ -64,6 +114,8 @@ def get_data_rows(n_rows: int = 10, sample_method: str = 'head') -> str:
         sample_method (str): The method for sampling. Can be 'head' (first N rows),
                              'tail' (last N rows), or 'random' (N random rows).
                              Defaults to 'head'.
+        offset (int): Index of the first row returned with the 'head' method,
+                      for pagination. Defaults to 0.
     """
     df = get_dataframe()
 
@@ -74,64 +126,122 @@ def get_data_rows(n_rows: int = 10, sample_method: str = 'head') -> str:
         return 'Error: Number of rows (n_rows) must be a positive integer.'
 
     if sample_method == 'head':
-        return df.head(n_rows).to_string()
+        return format_table(
+            df.iloc[offset : offset + n_rows],
+            offset=offset,
+            total_rows=len(df),
+            page_hint="call get_data_rows with sample_method='head' and offset={offset}",
+        )
     if sample_method == 'tail':
-        return df.tail(n_rows).to_string()
+        return format_table(df.tail(n_rows))
     if sample_method == 'random':
-        return df.sample(n=min(n_rows, len(df))).to_string()
+        return format_table(df.sample(n=min(n_rows, len(df))))
 
     return "Error: Invalid sample_method. Choose from 'head', 'tail', or 'random'."
 
 
 @tool('get_correlation_matrix')
-def get_correlation_matrix() -> str:
+def get_correlation_matrix(
+    method: str = 'pearson', columns: list[str] | None = None, approximate: bool = False
+) -> str:
     """
     Returns the correlation matrix for the numeric columns of the DataFrame.
-    Use this to understand the linear relationships between numeric variables.
+    Use this to understand the relationships between numeric variables.
+
+    Args:
+        method (str): 'pearson' (linear) or 'spearman' (rank/monotonic). Defaults to 'pearson'.
+        columns (list[str]): Numeric columns to correlate. Defaults to all numeric columns.
+        approximate (bool): Estimate the matrix from a random sample of rows,
+                            faster for very large datasets. Defaults to False.
     """
     df = get_dataframe()
 
     if df is None or df.empty:
         return 'DataFrame empty, no data to analyse.'
 
-    numeric_df = df.select_dtypes(include='number')
-    if numeric_df.empty:
+    try:
+        corr_matrix = get_correlation(method, columns, approximate)
+    except ValueError as e:
+        return f'Error: {e}'
+
+    if corr_matrix.empty:
         return 'No numeric columns found to calculate correlation.'
 
-    return numeric_df.corr().to_string()
+    return format_table(corr_matrix)
+
+
+@tool('scan_anomalies')
+def scan_numeric_anomalies(method: str = 'iqr', threshold: float | None = None) -> str:
+    """
+    Scans all numeric columns for outliers at once and returns, for each column, the
+    normal range, the number and percentage of outliers and the most extreme values.
+    Use this first to find which columns have unusual values, then use detect_outliers_iqr
+    to list the rows of a specific column.
+
+    Args:
+        method (str): 'iqr' (quartiles), 'zscore' (mean and standard deviation) or
+                      'mad' (median absolute deviation). Defaults to 'iqr'.
+        threshold (float): Multiplier of the method. Defaults to 1.5 for 'iqr',
+                           3 for 'zscore' and 3.5 for 'mad'.
+    """
+    df = get_dataframe()
+
+    if df is None or df.empty:
+        return 'DataFrame empty, no data to analyse.'
+
+    try:
+        report = get_anomaly_report(method, threshold)
+    except ValueError as e:
+        return f'Error: {e}'
+
+    if report.empty:
+        return 'No numeric columns found to scan for outliers.'
+
+    return f'Outlier scan ({method}) over {len(df)} rows:\n{format_table(report)}'
 
 
 @tool('detect_outliers_iqr')
-def detect_outliers_iqr(column: str) -> str:
+def detect_outliers_iqr(
+    column: str, method: str = 'iqr', offset: int = 0, limit: int | None = None
+) -> str:
     """
-    Detects outliers in a numeric column using the IQR method.
+    Detects outliers in a numeric column (IQR method by default) and returns the number
+    of outliers and one page of the outlying rows.
     Use this to identify unusual data points in a specific column.
+
+    Args:
+        column (str): The numeric column.
+        method (str): 'iqr', 'zscore' or 'mad'. Defaults to 'iqr'.
+        offset (int): Index of the first outlying row returned, for pagination. Defaults to 0.
+        limit (int): Maximum number of rows returned. Defaults to 20.
     """
     df = get_dataframe()
 
     if df is None or df.empty:
         return 'DataFrame empty, no data to analyse.'
 
-    if column not in df.columns:
-        return f'Error: Column "{column}" not found in the dataset.'
-    if not pd.api.types.is_numeric_dtype(df[column]):
-        return f'Error: Column "{column}" is not numeric.'
-
-    q1 = df[column].quantile(0.25)
-    q3 = df[column].quantile(0.75)
-    iqr = q3 - q1
-    lower_bound = q1 - 1.5 * iqr
-    upper_bound = q3 + 1.5 * iqr
+    limit = limit or settings.anomaly_page_size
 
-    outliers = df[(df[column] < lower_bound) | (df[column] > upper_bound)]
+    try:
+        rows, total = get_anomaly_rows(column, method, offset=offset, limit=limit)
+    except ValueError as e:
+        return f'Error: {e}'
 
-    if outliers.empty:
+    if total == 0:
         return f'No outliers detected in column "{column}".'
 
-    return f'Detected {len(outliers)} outliers in column "{column}":\n{outliers.to_string()}'
+    rows_str = format_table(
+        rows,
+        offset=offset,
+        total_rows=total,
+        page_hint=f"call detect_outliers_iqr with column='{column}' and offset={{offset}}",
+    )
+
+    return f'Detected {total} outliers in column "{column}":\n{rows_str}'
 
 
 @tool('create_histogram')
+@deduplicate_chart
 def create_histogram(column: str) -> dict:
     """
     Generates a histogram for a given column, saves it, and returns its unique ID.
@@ -147,19 +257,28 @@ def create_histogram(column: str) -> dict:
     if not pd.api.types.is_numeric_dtype(df[column]):
         return f'Error: Column "{column}" is not numeric. Use create_bar_chart for categorical columns.'
 
-    stats = df[column].describe()
+    stats = get_dataset_profile().columns[column].stats
     metadata = (
         f"Graph Type: Histogram for the '{column}' column. "
         f'Visualizes the frequency distribution of the column. '
-        f'Key statistics: Mean={stats.get("mean", "N/A"):.2f}, '
-        f'Median={stats.get("50%", "N/A"):.2f}, '
-        f'Max={stats.get("max", "N/A"):.2f}, '
-        f'Min={stats.get("min", "N/A"):.2f}. '
+        f'Key statistics: Mean={_fmt(stats.get("mean"))}, '
+        f'Median={_fmt(stats.get("50%"))}, '
+        f'Max={_fmt(stats.get("max"))}, '
+        f'Min={_fmt(stats.get("min"))}. '
         f"The X-axis is '{column}' and the Y-axis is the count of occurrences."
     )
 
-    fig = px.histogram(df, x=column)
-    graph_id = _save_graph_to_db(fig, metadata)
+    # Faixas e contagens calculadas no servidor: a figura guarda apenas os agregados
+    histogram = compute_histogram(df[column], settings.histogram_max_bins)
+    bins = pd.DataFrame(
+        {
+            'centers': histogram.centers,
+            'counts': histogram.counts,
+            'widths': histogram.widths,
+        }
+    )
+    spec = ChartSpec('histogram', {'bins': bins}, {'column': column})
+    graph_id = _save_graph_to_db(spec, metadata)
 
     return {
         'response': f'Histogram for "{column}" created successfully.',
@@ -169,6 +288,7 @@ def create_histogram(column: str) -> dict:
 
 
 @tool('create_scatter_plot')
+@deduplicate_chart
 def create_scatter_plot(x_column: str, y_column: str) -> dict:
     """
     Generates a scatter plot for two columns, saves it, and returns its unique ID.
@@ -189,8 +309,11 @@ def create_scatter_plot(x_column: str, y_column: str) -> dict:
         f'Each point corresponds to an observation in the data.'
     )
 
-    fig = px.scatter(df, x=x_column, y=y_column)
-    graph_id = _save_graph_to_db(fig, metadata)
+    data = downsample_scatter(df, x_column, y_column, settings.chart_max_points)
+    metadata += _points_note(len(data), len(df))
+
+    spec = ChartSpec('scatter', {'data': data}, {'x': x_column, 'y': y_column})
+    graph_id = _save_graph_to_db(spec, metadata)
     return {
         'response': f'Scatter plot for "{x_column}" vs "{y_column}" created successfully.',
         'graph_id': graph_id,
@@ -199,6 +322,7 @@ def create_scatter_plot(x_column: str, y_column: str) -> dict:
 
 
 @tool('create_bar_chart')
+@deduplicate_chart
 def create_bar_chart(column: str) -> dict:
     """
     Generates a bar chart for a given categorical column, saves it, and returns its unique ID.
@@ -220,11 +344,19 @@ def create_bar_chart(column: str) -> dict:
         f"The X-axis represents the categories of '{column}' and the Y-axis represents the frequency (count)."
     )
 
-    counts = df[column].value_counts().reset_index()
-    counts.columns = [column, 'count']
-    fig = px.bar(counts, x=column, y='count', title=f'Distribution of {column}')
+    value_counts = get_dataset_stats().columns[column].value_counts
+    if value_counts is not None:
+        counts = pd.DataFrame(value_counts.most_common(), columns=[column, 'count'])
+    else:
+        counts = df[column].value_counts().reset_index()
+        counts.columns = [column, 'count']
+    spec = ChartSpec(
+        'bar',
+        {'data': counts},
+        {'x': column, 'y': 'count', 'title': f'Distribution of {column}'},
+    )
 
-    graph_id = _save_graph_to_db(fig, metadata)
+    graph_id = _save_graph_to_db(spec, metadata)
 
     return {
         'response': f'Bar chart for "{column}" created successfully.',
@@ -233,11 +365,197 @@ def create_bar_chart(column: str) -> dict:
     }
 
 
+@tool('aggregate_data')
+def aggregate_data(
+    group_by: list[str] | None = None,
+    value_columns: list[str] | None = None,
+    aggregations: list[str] | None = None,
+    filters: dict[str, list] | None = None,
+    date_column: str | None = None,
+    period: str | None = None,
+    offset: int = 0,
+) -> str:
+    """
+    Groups the data and aggregates numeric columns, like a SQL GROUP BY or a pivot table.
+    Use this for questions such as "total/average X by Y (by month)".
+
+    Args:
+        group_by (list[str]): Columns to group by (usually categorical).
+        value_columns (list[str]): Numeric columns to aggregate. If omitted, counts the rows.
+        aggregations (list[str]): Any of 'sum', 'mean', 'count', 'min', 'max', 'median'
+                                  and 'std'. Defaults to ['sum'].
+        filters (dict[str, list]): Values to keep for each column, e.g. {"region": ["North"]}.
+        date_column (str): Date column also used for grouping, by period. Optional.
+        period (str): Period of date_column: 'D', 'W', 'M', 'Q' or 'Y'.
+        offset (int): Index of the first group returned, for pagination. Defaults to 0.
+    """
+    df = get_dataframe()
+
+    if df is None or df.empty:
+        return 'DataFrame empty, no data to analyse.'
+
+    try:
+        result = get_aggregate(
+            group_by or [], value_columns, aggregations, filters, date_column, period
+        )
+    except ValueError as e:
+        return f'Error: {e}'
+
+    if result.empty:
+        return 'No rows match the filters.'
+
+    return format_table(
+        result.iloc[offset:],
+        offset=offset,
+        total_rows=len(result),
+        page_hint='call aggregate_data with the same arguments and offset={offset}',
+    )
+
+
+@tool('create_aggregate_bar_chart')
+@deduplicate_chart
+def create_aggregate_bar_chart(
+    value_column: str | None = None,
+    aggregation: str = 'sum',
+    group_by: list[str] | None = None,
+    filters: dict[str, list] | None = None,
+    date_column: str | None = None,
+    period: str | None = None,
+) -> dict:
+    """
+    Generates a bar chart of an aggregated numeric column by group, saves it, and returns its unique ID.
+    Use this to compare totals/averages between categories or periods. The first group is
+    the X-axis and a second group, if given, is shown as colored bars.
+
+    Args:
+        value_column (str): Numeric column to aggregate. If omitted, counts the rows.
+        aggregation (str): 'sum', 'mean', 'count', 'min', 'max', 'median' or 'std'. Defaults to 'sum'.
+        group_by (list[str]): Up to two columns to group by.
+        filters (dict[str, list]): Values to keep for each column, e.g. {"region": ["North"]}.
+        date_column (str): Date column used for grouping, by period. Optional.
+        period (str): Period of date_column: 'D', 'W', 'M', 'Q' or 'Y'.
+    """
+    df = get_dataframe()
+
+    if df is None or df.empty:
+        return 'DataFrame empty, no data to analyse.'
+
+    group_by = list(group_by or [])
+    if len(group_by) + bool(date_column) > 2:
+        return 'Error: A bar chart supports at most two grouping columns (including date_column).'
+
+    value_columns = [value_column] if value_column else []
+
+    try:
+        result = get_aggregate(
+            group_by, value_columns, [aggregation], filters, date_column, period
+        )
+    except ValueError as e:
+        return f'Error: {e}'
+
+    if result.empty:
+        return 'No rows match the filters.'
+
+    keys = list(result.columns[:-1])
+    measure = result.columns[-1]
+    x_column = keys[-1] if date_column else keys[0]
+    color = next((k for k in keys if k != x_column), None)
+
+    metadata = (
+        f"Graph Type: Bar Chart of {measure} by '{x_column}'"
+        + (f" and '{color}'" if color else '')
+        + '. '
+        + (f'Filters: {filters}. ' if filters else '')
+        + f'{len(result)} groups; largest value {_fmt(result[measure].max())}, '
+        f'smallest value {_fmt(result[measure].min())}.'
+    )
+
+    data = result.astype({k: str for k in keys if k != x_column})
+    spec = ChartSpec(
+        'bar',
+        {'data': data},
+        {
+            'x': x_column,
+            'y': measure,
+            'color': color,
+            'barmode': 'group',
+            'title': f'{measure} by {x_column}',
+        },
+    )
+    graph_id = _save_graph_to_db(spec, metadata)
+
+    return {
+        'response': f'Bar chart of {measure} by "{x_column}" created successfully.',
+        'graph_id': graph_id,
+        'metadata': metadata,
+    }
+
+
+@tool('analyze_time_series')
+def analyze_time_series(
+    date_column: str,
+    value_column: str | None = None,
+    period: str | None = None,
+    aggregation: str = 'sum',
+    rolling_window: int | None = None,
+    compare: str | None = None,
+    offset: int = 0,
+) -> str:
+    """
+    Aggregates a numeric column (or counts rows) by time period, optionally with a
+    rolling average and the change versus the previous period or the same period of
+    the previous year. Use this for trends, seasonality and period-over-period questions.
+
+    Args:
+        date_column (str): The date column.
+        value_column (str): Numeric column to aggregate. If omitted, counts the rows.
+        period (str): 'H', 'D', 'W', 'M', 'Q' or 'Y'. Chosen from the date range if omitted.
+        aggregation (str): 'sum', 'mean', 'count', 'min', 'max', 'median' or 'last'. Defaults to 'sum'.
+        rolling_window (int): Number of periods of the rolling average. Optional.
+        compare (str): 'previous' (period over period) or 'year' (year over year). Optional.
+        offset (int): Index of the first period returned, for pagination. Defaults to 0.
+    """
+    df = get_dataframe()
+
+    if df is None or df.empty:
+        return 'DataFrame empty, no data to analyse.'
+
+    try:
+        index = get_time_index(date_column)
+        period = period or auto_frequency(index, settings.tool_output_max_rows)
+        series = resample_series(df, index, value_column, period, aggregation)
+        table = time_series_table(series, period, rolling_window, compare)
+    except ValueError as e:
+        return f'Error: {e}'
+
+    if table.empty:
+        return f'No valid dates found in column "{date_column}".'
+
+    return format_table(
+        table.iloc[offset:],
+        offset=offset,
+        total_rows=len(table),
+        page_hint='call analyze_time_series with the same arguments and offset={offset}',
+    )
+
+
 @tool('create_line_plot')
-def create_line_plot(x_column: str, y_column: str) -> dict:
+@deduplicate_chart
+def create_line_plot(
+    x_column: str, y_column: str, period: str | None = None, aggregation: str = 'mean'
+) -> dict:
     """
     Generates a line plot, saves it, and returns its unique ID.
     Use this to visualize trends over time. 'x_column' should ideally be a datetime column.
+    When it is, the values are aggregated by period before plotting.
+
+    Args:
+        x_column (str): The X-axis column, ideally a date column.
+        y_column (str): The numeric column plotted.
+        period (str): For date columns, 'H', 'D', 'W', 'M', 'Q' or 'Y'. Chosen from
+                      the date range if omitted.
+        aggregation (str): For date columns, 'sum', 'mean', 'count', 'min', 'max',
+                           'median' or 'last' of y_column per period. Defaults to 'mean'.
     """
     df = get_dataframe()
 
@@ -253,10 +571,34 @@ def create_line_plot(x_column: str, y_column: str) -> dict:
         f'Ideal for visualizing data over time.'
     )
 
-    fig = px.line(
-        df, x=x_column, y=y_column, title=f'Trend of {y_column} over {x_column}'
+    # Colunas de datas: série reamostrada a partir do índice ordenado em cache
+    try:
+        index = get_time_index(x_column)
+    except ValueError:
+        index = None
+
+    if index is not None and pd.api.types.is_numeric_dtype(df[y_column]):
+        try:
+            period = period or auto_frequency(index, settings.chart_max_points)
+            series = resample_series(df, index, y_column, period, aggregation)
+        except ValueError as e:
+            return f'Error: {e}'
+
+        data = series.rename(y_column).rename_axis(x_column).reset_index()
+        metadata += (
+            f" Each point is the {aggregation} of '{y_column}' per period '{period}'"
+            f' ({len(data)} periods, from {len(index.positions)} rows with valid dates).'
+        )
+    else:
+        data = downsample_line(df, x_column, y_column, settings.chart_max_points)
+        metadata += _points_note(len(data), len(df))
+
+    spec = ChartSpec(
+        'line',
+        {'data': data},
+        {'x': x_column, 'y': y_column, 'title': f'Trend of {y_column} over {x_column}'},
     )
-    graph_id = _save_graph_to_db(fig, metadata)
+    graph_id = _save_graph_to_db(spec, metadata)
 
     return {
         'response': f'Line plot for "{y_column}" over "{x_column}" created successfully.',
@@ -266,7 +608,8 @@ def create_line_plot(x_column: str, y_column: str) -> dict:
 
 
 @tool('create_box_plot')
-def create_box_plot(y_column: str, x_column: str = None) -> dict:
+@deduplicate_chart
+def create_box_plot(y_column: str, x_column: str | None = None) -> dict:
     """
     Generates a box plot, saves it, and returns its unique ID.
     Use this to visualize the distribution of a numeric variable (y_column),
@@ -282,28 +625,62 @@ def create_box_plot(y_column: str, x_column: str = None) -> dict:
     if not pd.api.types.is_numeric_dtype(df[y_column]):
         return f'Error: Column "{y_column}" must be numeric for a box plot.'
 
-    stats = df[y_column].describe()
+    if x_column and x_column not in df.columns:
+        return f'Error: Grouping column "{x_column}" not found in the dataset.'
+
+    # Quartis, bigodes e valores extremos calculados no servidor; as estatísticas
+    # descritas no metadata são as mesmas do gráfico (sem agrupamento)
+    overall = compute_box_groups(df, y_column, None, settings.box_max_outliers)
+    if not overall:
+        return f'Error: Column "{y_column}" has no values to plot.'
+
+    stats = overall[y_column]
+    boxes = (
+        compute_box_groups(df, y_column, x_column, settings.box_max_outliers)
+        if x_column
+        else overall
+    )
+
     metadata = (
         f"Graph Type: Box Plot for the '{y_column}' column. "
         f'Visualizes the distribution and identifies outliers. '
-        f'Key statistics: Mean={stats.get("mean", "N/A"):.2f}, '
-        f'Q1={stats.get("25%", "N/A"):.2f}, Median={stats.get("50%", "N/A"):.2f}, '
-        f'Q3={stats.get("75%", "N/A"):.2f}, Max={stats.get("max", "N/A"):.2f}, '
-        f'Min={stats.get("min", "N/A"):.2f}.'
+        f'Key statistics: Mean={_fmt(stats.mean)}, '
+        f'Q1={_fmt(stats.q1)}, Median={_fmt(stats.median)}, '
+        f'Q3={_fmt(stats.q3)}, Max={_fmt(stats.max)}, '
+        f'Min={_fmt(stats.min)}.'
     )
 
     title = f'Box Plot for {y_column}'
     if x_column:
-        if x_column not in df.columns:
-            return f'Error: Grouping column "{x_column}" not found in the dataset.'
         title += f' grouped by {x_column}'
         metadata += (
             f" Optionally grouped by the categorical column '{x_column}' on the X-axis."
         )
 
-    fig = px.box(df, y=y_column, x=x_column, title=title)
+    box_table = pd.DataFrame(
+        {
+            'name': list(boxes),
+            **{
+                stat: [getattr(b, stat) for b in boxes.values()]
+                for stat in ('q1', 'median', 'q3', 'lower_fence', 'upper_fence', 'mean')
+            },
+        }
+    )
+    outliers = pd.DataFrame(
+        {
+            'name': pd.Categorical(
+                [name for name, b in boxes.items() for _ in b.outliers]
+            ),
+            'value': np.concatenate([b.outliers for b in boxes.values()] or [[]]),
+        }
+    )
+    spec = ChartSpec(
+        'box',
+        {'boxes': box_table, 'outliers': outliers},
+        {'x_column': x_column, 'y_column': y_column, 'title': title},
+    )
 
-    graph_id = _save_graph_to_db(fig, metadata)
+    graph_id = _save_graph_to_db(spec, metadata)
 
     return {
         'response': f'Box plot for "{y_column}" created successfully.',
@@ -313,26 +690,39 @@ def create_box_plot(y_column: str, x_column: str = None) -> dict:
 
 
 @tool('create_correlation_heatmap')
-def create_correlation_heatmap() -> dict:
+@deduplicate_chart
+def create_correlation_heatmap(
+    method: str = 'pearson', columns: list[str] | None = None, approximate: bool = False
+) -> dict:
     """
     Generates a correlation heatmap for numeric columns, saves it, and returns its ID.
-    Use this for a visual overview of the linear relationships between variables.
+    Use this for a visual overview of the relationships between variables.
+
+    Args:
+        method (str): 'pearson' (linear) or 'spearman' (rank/monotonic). Defaults to 'pearson'.
+        columns (list[str]): Numeric columns to correlate. Defaults to all numeric columns.
+        approximate (bool): Estimate the matrix from a random sample of rows,
+                            faster for very large datasets. Defaults to False.
     """
     df = get_dataframe()
 
     if df is None or df.empty:
         return 'DataFrame empty, no data to analyse.'
 
-    numeric_df = df.select_dtypes(include='number')
+    try:
+        corr_matrix = get_correlation(method, columns, approximate)
+    except ValueError as e:
+        return f'Error: {e}'
 
-    if numeric_df.shape[1] < 2:
+    if corr_matrix.shape[1] < 2:
         return 'Error: At least two numeric columns are required to create a correlation heatmap.'
 
-    metadata = 'Graph Type: Correlation Heatmap. Visualizes the correlation matrix for the numeric columns of the dataset. The colors indicate the strength and direction of the linear correlation between pairs of variables.'
+    metadata = f'Graph Type: Correlation Heatmap. Visualizes the {method.capitalize()} correlation matrix for the numeric columns of the dataset. The colors indicate the strength and direction of the correlation between pairs of variables.'
 
-    corr_matrix = numeric_df.corr()
-    fig = px.imshow(corr_matrix, text_auto=True, title='Correlation Heatmap')
-    graph_id = _save_graph_to_db(fig, metadata)
+    spec = ChartSpec(
+        'heatmap', {'matrix': corr_matrix}, {'title': 'Correlation Heatmap'}
+    )
+    graph_id = _save_graph_to_db(spec, metadata)
 
     return {
         'response': 'Correlation heatmap created successfully.',
@@ -342,42 +732,84 @@ def create_correlation_heatmap() -> dict:
 
 
 @tool('find_clusters_and_plot')
-def find_clusters_and_plot(x_column: str, y_column: str, n_clusters: int) -> dict:
+@deduplicate_chart
+def find_clusters_and_plot(
+    x_column: str,
+    y_column: str,
+    n_clusters: int | None = None,
+    feature_columns: list[str] | None = None,
+) -> dict:
     """
     Performs K-Means clustering and generates a scatter plot, saves it, and returns its unique ID.
     Use this to identify and visualize groupings in your data.
+
+    Args:
+        x_column (str): Numeric column on the X-axis, also used for clustering.
+        y_column (str): Numeric column on the Y-axis, also used for clustering.
+        n_clusters (int): The number of clusters. If omitted, the number with the
+                          best silhouette score (from 2 to 10) is used.
+        feature_columns (list[str]): Additional numeric columns used for clustering. Optional.
     """
     df = get_dataframe()
 
     if df is None or df.empty:
         return 'DataFrame empty, no data to analyse.'
 
-    if x_column not in df.columns or y_column not in df.columns:
-        return 'Error: One or both columns not found in the dataset.'
-
-    if not pd.api.types.is_numeric_dtype(
-        df[x_column]
-    ) or not pd.api.types.is_numeric_dtype(df[y_column]):
-        return f'Error: Columns "{x_column}" and "{y_column}" must be numeric for clustering.'
+    columns = list(dict.fromkeys([x_column, y_column, *(feature_columns or [])]))
 
-    metadata = f"Graph Type: Scatter Plot with Clusters. Runs the K-Means algorithm to find {n_clusters} clusters in the data based on the '{x_column}' and '{y_column}' columns. The colors represent the identified clusters."
+    try:
+        model = get_cluster_model(columns, n_clusters)
+    except ValueError as e:
+        return f'Error: {e}'
 
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    cluster_data = df[[x_column, y_column]].dropna()
-    cluster_data['cluster'] = kmeans.fit_predict(cluster_data)
-    cluster_data['cluster'] = cluster_data['cluster'].astype(str)
+    features = ', '.join(f"'{c}'" for c in columns)
+    metadata = f'Graph Type: Scatter Plot with Clusters. Runs the K-Means algorithm to find {model.n_clusters} clusters in the data based on the {features} columns (standardized). The colors represent the identified clusters.'
 
-    fig = px.scatter(
-        cluster_data,
-        x=x_column,
-        y=y_column,
-        color='cluster',
-        title=f'Clusters in {x_column} vs {y_column}',
+    cluster_data = df[[x_column, y_column]].assign(cluster=model.labels)
+    cluster_data = cluster_data[cluster_data['cluster'] >= 0]
+    plot_data = downsample_scatter(
+        cluster_data, x_column, y_column, settings.chart_max_points, ['cluster']
     )
-    graph_id = _save_graph_to_db(fig, metadata)
+    plot_data['cluster'] = plot_data['cluster'].astype(str)
+    metadata += _points_note(len(plot_data), len(df))
+
+    spec = ChartSpec(
+        'scatter',
+        {'data': plot_data},
+        {
+            'x': x_column,
+            'y': y_column,
+            'color': 'cluster',
+            'title': f'Clusters in {x_column} vs {y_column}',
+        },
+    )
+    graph_id = _save_graph_to_db(spec, metadata)
 
     return {
-        'response': f'Cluster plot for "{x_column}" vs "{y_column}" with {n_clusters} clusters created successfully. 📊',
+        'response': f'Cluster plot for "{x_column}" vs "{y_column}" with {model.n_clusters} clusters created successfully. 📊',
         'graph_id': graph_id,
         'metadata': metadata,
+        'cluster_centers': format_table(model.centers()),
     }
+
+
+@tool('evaluate_clusters')
+def evaluate_clusters(columns: list[str], max_clusters: int = 10) -> str:
+    """
+    Evaluates K-Means with 2 to max_clusters clusters on the given numeric columns and
+    returns the inertia (elbow method) and the silhouette score of each number of clusters.
+    Use this to choose the number of clusters before calling find_clusters_and_plot.
+    """
+    df = get_dataframe()
+
+    if df is None or df.empty:
+        return 'DataFrame empty, no data to analyse.'
+
+    try:
+        scores = get_cluster_scores(list(dict.fromkeys(columns)), max_clusters)
+    except ValueError as e:
+        return f'Error: {e}'
+
+    best = int(scores['silhouette'].idxmax())
+
+    return f'{format_table(scores)}\n\nBest number of clusters by silhouette score: {best}.'
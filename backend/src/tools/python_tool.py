@@ -3,19 +3,43 @@ import plotly.express as px
 from langchain.tools import Tool
 from langchain_experimental.tools import PythonAstREPLTool
 
-from src.services.data_processing import get_dataframe
+from src.services.dataset_registry import current_session, get_dataframe
 from src.tools.data_analysis_tool import _save_graph_to_db
 
-python_ast_repl = Tool(
-    name='Python_code',
-    func=PythonAstREPLTool(
+
+def _editable_dataframe(session: str) -> pd.DataFrame | None:
+    """
+    Cópia do conjunto de dados que o código pode alterar. As colunas numéricas de um
+    conjunto recarregado do disco são somente leitura (mapeadas sem cópia), e alterações
+    no próprio conjunto invalidariam as estatísticas e os caches das demais ferramentas.
+    """
+    df = get_dataframe(session)
+
+    return None if df is None else df.copy()
+
+
+def run_python_code(query: str) -> str:
+    """
+    Executa o código em um REPL criado para esta chamada. As variáveis (ex.: `df`) não
+    são compartilhadas com as chamadas simultâneas de outras sessões, e `get_dataframe`
+    retorna uma cópia do conjunto de dados da sessão da requisição.
+    """
+    session = current_session.get()
+    repl = PythonAstREPLTool(
         locals={
-            'get_dataframe': get_dataframe,
+            'get_dataframe': lambda: _editable_dataframe(session),
             '_save_graph_to_db': _save_graph_to_db,
             'pd': pd,
             'px': px,
         }
-    ),
+    )
+
+    return repl.run(query)
+
+
+python_ast_repl = Tool(
+    name='Python_code',
+    func=run_python_code,
     description="""Executes Python code in a secure environment. Use this tool for complex tasks requiring data processing, statistics, or custom DataFrame manipulation, such as filtering, grouping, complex calculations, or graph generation.
 You have access to the following.
     pd: Pandas.
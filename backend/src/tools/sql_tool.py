@@ -0,0 +1,40 @@
+"""Ferramenta de consultas SQL sobre o conjunto de dados para o agente de análise de dados"""
+
+from langchain.tools import tool
+
+from src.schemas import QueryOutput
+from src.services.dataset_registry import get_dataframe
+from src.services.sql_engine import TABLE_NAME, run_query
+from src.settings import settings
+from src.utils.formatting import format_table
+
+
+@tool('sql_query', args_schema=QueryOutput)
+def sql_query(query: str) -> str:
+    """
+    Runs a read-only SQL SELECT query (DuckDB dialect) against the current dataset,
+    available as the table "data", and returns the result. Prefer this tool over
+    Python_code for filtering, grouping, aggregations, rankings and joins of the data
+    with itself: it is much faster on large datasets.
+    Use get_data_summary first to know the column names; quote names with spaces or
+    accents with double quotes (e.g. SELECT "Valor Total" FROM data). Aggregate or use
+    LIMIT to keep the result small.
+    """
+    df = get_dataframe()
+
+    if df is None or df.empty:
+        return 'DataFrame empty, no data to analyse.'
+
+    try:
+        result, truncated = run_query(query)
+    except ValueError as e:
+        return f'Error: {e}'
+
+    if result.empty:
+        return 'The query returned no rows.'
+
+    output = format_table(result)
+    if truncated:
+        output += f'\n[Result truncated at {settings.sql_max_rows} rows; aggregate or filter the query on table "{TABLE_NAME}".]'
+
+    return output
@@ -8,20 +8,20 @@ _data_engineer = DataEngineerAgent()
 
 
 @tool('data_analyst')
-def use_data_analyst(user_request: str) -> dict[str, str]:
+async def use_data_analyst(user_request: str) -> dict[str, str]:
     """This tool calls the Data Analyst to work on user's requests. The data and insights generated by the agent are returned. The Data Analyst has the following features:
-    (create_bar_chart, create_histogram, create_line_plot, create_scatter_plot, detect_outliers_iqr, find_clusters_and_plot, get_correlation_matrix, get_data_summary, create_box_plot, create_correlation_heatmap, get_data_rows, get_metadata, python_ast_repl)
+    (create_bar_chart, create_aggregate_bar_chart, aggregate_data, create_histogram, create_line_plot, analyze_time_series, create_scatter_plot, detect_outliers_iqr, scan_anomalies, find_clusters_and_plot, evaluate_clusters, get_correlation_matrix, get_data_summary, create_box_plot, create_correlation_heatmap, get_data_rows, get_metadata, sql_query, python_ast_repl)
     These are the functions available for data analysis, the python_ast_repl function is powerful for creating insights not available in other functions.
     """
 
-    response = _data_analyst.run(user_request)
+    response = await _data_analyst.arun(user_request)
 
     return {'results': response['output']}
 
 
 @tool('data_engineer')
-def use_data_engineer(user_request: str) -> dict[str, str]:
-    """"""
-    response = _data_engineer.run(user_request)
+async def use_data_engineer(user_request: str) -> dict[str, str]:
+    """This tool calls the Data Engineer to work on data processing and treatment requests. The Data Engineer inspects the dataset (columns, data types, missing values and statistics) with get_data_summary and returns a report of the data state."""
+    response = await _data_engineer.arun(user_request)
 
     return {'results': response['output']}
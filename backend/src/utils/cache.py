@@ -0,0 +1,135 @@
+"""Cache LRU em memória compartilhado pelos serviços da aplicação."""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+
+class LRUCache:
+    """
+    Cache LRU thread-safe, limitado pela quantidade de itens e, opcionalmente, pelo
+    total de bytes dos valores (calculado por `sizeof`). Os itens usados há mais tempo
+    são descartados primeiro quando algum dos limites é excedido.
+    """
+
+    def __init__(
+        self,
+        max_items: int | None = 128,
+        max_bytes: int | None = None,
+        sizeof: Callable[[object], int] = sys.getsizeof,
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Lock de cada chave sendo calculada por `get_or_set` e quantas chamadas o usam
+        self._factories: dict[Hashable, tuple[threading.Lock, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable, default=None):
+        """Retorna o valor da chave, marcando-o como usado recentemente."""
+        with self._lock:
+            item = self._items.get(key)
+
+            if item is None:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._items.move_to_end(key)
+            return item[0]
+
+    def set(self, key: Hashable, value) -> None:
+        """Armazena o valor, descartando os itens usados há mais tempo se necessário."""
+        size = self.sizeof(value) if self.max_bytes else 0
+
+        # Valores maiores que o limite total não são armazenados
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= self._items.pop(key)[1]
+
+            self._items[key] = (value, size)
+            self.nbytes += size
+
+            while self._items and (
+                (self.max_items and len(self._items) > self.max_items)
+                or (self.max_bytes and self.nbytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], object]):
+        """
+        Retorna o valor da chave ou o calcula com `factory` e o armazena. O lock da
+        chave é mantido enquanto `factory` executa: chamadas simultâneas com a mesma
+        chave aguardam e recebem o valor calculado pela primeira, sem bloquear as
+        chamadas com outras chaves.
+        """
+        value = self.get(key)
+
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock, users = self._factories.get(key, (None, 0))
+            key_lock = key_lock or threading.Lock()
+            self._factories[key] = (key_lock, users + 1)
+
+        try:
+            with key_lock:
+                with self._lock:
+                    item = self._items.get(key)
+
+                if item is not None:
+                    return item[0]
+
+                value = factory()
+                self.set(key, value)
+
+                return value
+        finally:
+            with self._lock:
+                _, users = self._factories[key]
+
+                if users == 1:
+                    del self._factories[key]
+                else:
+                    self._factories[key] = (key_lock, users - 1)
+
+    def pop(self, key: Hashable, default=None):
+        """Remove a chave do cache, retornando seu valor."""
+        with self._lock:
+            item = self._items.pop(key, None)
+
+            if item is None:
+                return default
+
+            self.nbytes -= item[1]
+            return item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        """Retorna a ocupação e as contagens de acertos e falhas do cache."""
+        return {
+            'items': len(self._items),
+            'bytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -6,6 +6,22 @@ class WrongFileTypeError(Exception):
         self.msg = msg or 'Wrong file type received, only csv is supported!'
 
 
+class SchemaMismatchError(Exception):
+    """Raised when the files of a dataset don't share the same columns."""
+
+    def __init__(self, msg: str = None):
+        self.msg = (
+            msg or 'The files received have different columns and cannot be merged.'
+        )
+
+
+class DatasetNotFoundError(Exception):
+    """Raised when an operation requires a dataset that wasn't uploaded for the session."""
+
+    def __init__(self, msg: str = None):
+        self.msg = msg or 'No dataset found for this session, upload a file first.'
+
+
 class ModelNotFoundException(Exception):
     """Raised when no llm was instantiated before using agents or the model provided was not found."""
 
@@ -0,0 +1,108 @@
+"""Formatação compacta de tabelas retornadas pelas ferramentas aos agentes, limitada por um orçamento de caracteres."""
+
+import pandas as pd
+
+from src.settings import settings
+
+
+def _compact(df: pd.DataFrame, decimals: int, max_cell_chars: int) -> pd.DataFrame:
+    """Arredonda os números e encurta os textos longos de cada célula."""
+    df = df.round(decimals)
+
+    for column in df.columns:
+        if pd.api.types.is_object_dtype(df[column]):
+            # Colunas com tipos mistos (ex.: estatísticas de colunas diferentes)
+            df[column] = pd.Series(
+                [round(v, decimals) if isinstance(v, float) else v for v in df[column]],
+                index=df.index,
+                dtype=object,
+            )
+
+        if pd.api.types.is_object_dtype(df[column]) or isinstance(
+            df[column].dtype, pd.CategoricalDtype | pd.StringDtype
+        ):
+            text = df[column].astype(str)
+            long = text.str.len() > max_cell_chars
+            if long.any():
+                df[column] = (
+                    df[column]
+                    .astype(object)
+                    .where(~long, text.str[: max_cell_chars - 1] + '…')
+                )
+
+    return df
+
+
+def _render(df: pd.DataFrame) -> str:
+    """CSV com índice: sem o preenchimento com espaços do `to_string`."""
+    return df.to_csv(lineterminator='\n').rstrip('\n')
+
+
+def format_table(
+    df: pd.DataFrame,
+    offset: int = 0,
+    total_rows: int | None = None,
+    page_hint: str | None = None,
+    max_chars: int | None = None,
+) -> str:
+    """
+    Formata uma tabela para o contexto do agente respeitando um orçamento de
+    caracteres: arredonda os números, encurta os textos longos, limita a quantidade de
+    colunas e mantém apenas as linhas que cabem no orçamento, informando o que foi
+    omitido e como obter as próximas linhas.
+
+    Args:
+        df (DataFrame): Tabela (ou página de uma tabela) a ser formatada.
+        offset (int, optional): Posição da primeira linha de `df` na tabela completa.
+        total_rows (int | None, optional): Linhas da tabela completa; `len(df)` se None.
+        page_hint (str | None, optional): Como pedir mais linhas, com `{offset}` no
+            lugar da posição da próxima linha (ex.: 'call get_data_rows with offset={offset}').
+        max_chars (int | None, optional): Orçamento de caracteres; `tool_output_max_chars` se None.
+
+    Returns:
+        str: A tabela em CSV seguida das notas sobre o que foi omitido.
+    """
+    max_chars = max_chars or settings.tool_output_max_chars
+    total_rows = len(df) if total_rows is None else total_rows
+    notes = []
+
+    if len(df.columns) > settings.tool_output_max_cols:
+        omitted = [str(c) for c in df.columns[settings.tool_output_max_cols :]]
+        df = df.iloc[:, : settings.tool_output_max_cols]
+        notes.append(
+            f'{len(omitted)} columns omitted: {", ".join(omitted[:20])}'
+            + (', ...' if len(omitted) > 20 else '')
+            + '. Ask for specific columns to see them.'
+        )
+
+    df = _compact(
+        df.head(settings.tool_output_max_rows),
+        settings.tool_output_decimals,
+        settings.tool_output_max_cell_chars,
+    )
+    text = _render(df)
+
+    # Busca binária da maior quantidade de linhas que cabe no orçamento
+    if len(text) > max_chars:
+        low, high = 0, len(df)
+        while low < high:
+            rows = (low + high + 1) // 2
+            if len(_render(df.head(rows))) <= max_chars:
+                low = rows
+            else:
+                high = rows - 1
+        df = df.head(max(low, 1))
+        text = _render(df)
+
+    shown = len(df)
+    if offset + shown < total_rows:
+        note = f'Showing rows {offset + 1}-{offset + shown} of {total_rows}.'
+        if page_hint:
+            note += (
+                ' To see more, '
+                + page_hint.replace('{offset}', str(offset + shown))
+                + '.'
+            )
+        notes.append(note)
+
+    return '\n'.join([text, *(f'[{note}]' for note in notes)])
@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# As configurações são lidas ao importar `src`: o banco de dados e os conjuntos de dados
+# dos testes ficam em um diretório temporário e os agentes recebem uma chave fictícia
+_directory = tempfile.mkdtemp(prefix='sfs-tests-')
+os.environ.setdefault('DATABASE_URI', f'sqlite:///{_directory}/test.db')
+os.environ.setdefault('DATASET_STORE_DIR', os.path.join(_directory, 'datasets'))
+os.environ.setdefault('GROQ_API_KEY', 'test')
+os.environ.setdefault('LANGSMITH_TRACING', 'false')
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Importa os serviços antes dos agentes, na ordem da aplicação (evita a importação circular)
+import src.services  # noqa: F401
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from src.services.anomalies import compute_bounds
+from src.services.dataset_stats import DatasetStats
+
+
+def test_iqr_bounds_use_exact_quartiles():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'valor': rng.lognormal(size=100_000)})
+    # Estatísticas do sketch, aproximadas neste tamanho
+    stats = {'valor': DatasetStats.from_frame(df).columns['valor'].describe()}
+
+    bounds = compute_bounds(df, ['valor'], 'iqr', stats=stats)
+
+    q1, q3 = np.percentile(df['valor'], [25, 75])
+    assert bounds.loc['valor', 'lower'] == q1 - 1.5 * (q3 - q1)
+    assert bounds.loc['valor', 'upper'] == q3 + 1.5 * (q3 - q1)
@@ -0,0 +1,22 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.cache import LRUCache
+
+
+def test_get_or_set_runs_the_factory_once_per_key():
+    cache = LRUCache()
+    calls = []
+
+    def factory():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        return object()
+
+    with ThreadPoolExecutor(4) as pool:
+        values = list(pool.map(lambda _: cache.get_or_set('k', factory), range(4)))
+
+    assert len(calls) == 1
+    assert all(value is values[0] for value in values)
+    assert not cache._factories
@@ -0,0 +1,29 @@
+from src.services import chart_identity, chart_retention
+from src.services.db_services import get_graph_db, init_db, insert_graphs_db
+from src.settings import settings
+
+
+def test_deleted_chart_is_generated_again(monkeypatch):
+    init_db()
+    monkeypatch.setattr(chart_identity, 'get_dataset_version', lambda: 'v1')
+    monkeypatch.setattr(settings, 'chart_max_rows', 0)
+    calls = []
+
+    @chart_identity.deduplicate_chart
+    def create_chart(column: str) -> dict:
+        graph_id = chart_identity.current_chart_id.get()
+        insert_graphs_db(graph_id, '{}')
+        calls.append(graph_id)
+        return {'graph_id': graph_id}
+
+    first = create_chart('valor')
+    assert create_chart('valor') == first
+    assert len(calls) == 1
+
+    # A retenção exclui o gráfico: a chamada repetida não pode retornar o ID excluído
+    assert chart_retention.compact_charts()['over_rows'] >= 1
+    assert get_graph_db(first['graph_id']) is None
+
+    assert create_chart('valor') == first
+    assert len(calls) == 2
+    assert get_graph_db(first['graph_id']) == '{}'
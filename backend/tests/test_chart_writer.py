@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.services import chart_writer as chart_writer_module
+from src.services.chart_identity import chart_cache
+from src.services.chart_specs import ChartSpec
+from src.services.chart_writer import ChartWriter
+from src.utils.exceptions import DatabaseFailedException
+
+
+def _fail(rows, format_version):
+    raise OperationalError('INSERT', {}, Exception('disk I/O error'))
+
+
+def test_failed_write_is_reported_and_not_reused(monkeypatch):
+    monkeypatch.setattr(chart_writer_module, 'insert_compressed_graphs_db', _fail)
+    writer = ChartWriter(batch_size=8, flush_interval=0)
+    spec = ChartSpec('bar', {'data': pd.DataFrame({'x': [1]})})
+    chart_cache.set('falhou', ({'graph_id': 'falhou'}, 0.1))
+
+    writer.submit('falhou', spec, None)
+    writer.close()
+
+    assert 'falhou' not in chart_cache
+    with pytest.raises(DatabaseFailedException):
+        writer.get_pending('falhou')
+
+    # Gerado novamente e gravado, o gráfico deixa de ser tratado como falho
+    monkeypatch.setattr(
+        chart_writer_module, 'insert_compressed_graphs_db', lambda *args: None
+    )
+    writer.submit('falhou', spec, None)
+    writer.close()
+    assert writer.get_pending('falhou') is None
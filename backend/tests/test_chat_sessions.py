@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+
+from src.agents import SupervisorAgent
+from src.services.chat_model import Chat
+from src.services.dataset_registry import current_session
+
+DELAY = 0.5
+
+
+@tool
+async def session_probe() -> str:
+    """Returns the session the tool runs in."""
+    await asyncio.sleep(DELAY)
+    return current_session.get()
+
+
+@tool
+def sync_session_probe() -> str:
+    """Returns the session the tool runs in, blocking like the data tools."""
+    time.sleep(DELAY)
+    return current_session.get()
+
+
+class FakeChatModel(BaseChatModel):
+    """Chama a ferramenta `probe` e responde com o seu resultado; como sumarizador, repete o prompt."""
+
+    probe: str = 'session_probe'
+    tools_bound: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return 'fake'
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={'tools_bound': True})
+
+    def _reply(self, messages) -> AIMessage:
+        if not self.tools_bound:
+            return AIMessage(messages[-1].content)
+
+        results = [message for message in messages if isinstance(message, ToolMessage)]
+        if results:
+            return AIMessage(f'{{"response": "{results[-1].content}", "graph_id": ""}}')
+
+        return AIMessage(
+            '',
+            tool_calls=[{'name': self.probe, 'args': {}, 'id': 'probe'}],
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(DELAY)
+        return self._generate(messages)
+
+
+@pytest.mark.parametrize('probe', [session_probe, sync_session_probe])
+def test_overlapping_prompts_use_their_own_session(probe):
+    agent = SupervisorAgent()
+    agent._llm = FakeChatModel(probe=probe.name)
+    agent.initialize_agent(
+        tools=[probe],
+        prompt=agent.prompt,
+        memory_key='chat_history',
+        verbose=False,
+    )
+    chat = Chat(agent)
+
+    async def main():
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            chat.send_prompt('question from a', 'a'),
+            chat.send_prompt('question from b', 'b'),
+        )
+        return responses, time.perf_counter() - start
+
+    responses, elapsed = asyncio.run(main())
+
+    # Cada prompt espera três vezes DELAY (duas chamadas ao modelo e a ferramenta); em
+    # sequência os dois levariam seis vezes DELAY. A ferramenta síncrona roda em uma
+    # thread do executor padrão, com o contexto (e a sessão) da sua requisição
+    assert elapsed < 4 * DELAY
+    assert [response.response for response in responses] == ['a', 'b']
+
+    memory_a = agent.executor('a').memory
+    memory_b = agent.executor('b').memory
+    assert memory_a is not memory_b
+    assert 'question from a' in memory_a.buffer
+    assert 'question from b' not in memory_a.buffer
+    assert 'question from b' in memory_b.buffer
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.correlation import compute_correlation
+
+
+@pytest.mark.parametrize('missing', [0.0, 0.2])
+def test_pearson_matches_pandas(missing):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(2000, 4)), columns=list('abcd'))
+    df['e'] = 3 * df['a'] + rng.normal(size=2000)
+    df['constante'] = 1.0
+    df = df.mask(rng.random(df.shape) < missing)
+
+    corr = compute_correlation(df)
+
+    np.testing.assert_allclose(corr, df.corr(), equal_nan=True)
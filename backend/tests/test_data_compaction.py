@@ -0,0 +1,29 @@
+import duckdb
+import pandas as pd
+
+from src.services.data_compaction import compact_dataframe
+
+
+def test_downcast_integers_keep_arithmetic():
+    df, _ = compact_dataframe(
+        pd.DataFrame(
+            {
+                'qty': [1, 200, 0],
+                'ret': [0, 199, 2],
+                'nullable': pd.array([100, None, 3], dtype='Int64'),
+            }
+        )
+    )
+
+    assert (df['qty'] - df['ret']).tolist() == [1, 1, -2]
+    assert (df['qty'] * 2).tolist() == [2, 400, 0]
+    assert (df['nullable'] * 2).tolist() == [200, pd.NA, 6]
+
+    result = duckdb.sql('SELECT qty - ret, qty * 200 FROM df').fetchall()
+    assert result == [(1, 200), (1, 40000), (-2, 0)]
+
+
+def test_large_integers_stay_int64():
+    df, _ = compact_dataframe(pd.DataFrame({'id': [0, 2**40]}))
+
+    assert df['id'].dtype == 'int64'
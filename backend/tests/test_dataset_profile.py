@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from src.services.dataset_profile import get_dataset_profile
+from src.services.dataset_registry import dataset_registry
+
+
+def test_profile_quartiles_are_exact():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'valor': rng.lognormal(size=100_000)})
+    df.loc[::7, 'valor'] = np.nan
+    dataset_registry.set('profile', df, 'profile-v1')
+
+    stats = get_dataset_profile('profile').columns['valor'].stats
+
+    expected = df['valor'].quantile([0.25, 0.5, 0.75]).tolist()
+    assert [stats['25%'], stats['50%'], stats['75%']] == expected
@@ -0,0 +1,75 @@
+import asyncio
+import io
+import shutil
+
+import pandas as pd
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from src.services.data_processing import DataHandler
+from src.services.dataset_registry import dataset_registry
+from src.services.dataset_store import DatasetStore, dataset_store
+
+
+def _upload(content: bytes) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        filename='dados.csv',
+        headers=Headers({'content-type': 'text/csv'}),
+    )
+
+
+def _load(handler: DataHandler, content: bytes, session: str) -> str:
+    result = asyncio.run(handler.load_csv(_upload(content), session=session))
+    return result['dataset_id']
+
+
+def test_reupload_releases_the_previous_version():
+    handler = DataHandler()
+    first = _load(handler, b'a,b\n1,2\n3,4\n', 'reupload')
+    shared = _load(handler, b'a,b\n1,2\n3,4\n', 'reupload-other')
+
+    second = _load(handler, b'a,b\n5,6\n7,8\n', 'reupload')
+
+    # A primeira versão continua em uso pela outra sessão
+    assert first == shared
+    assert dataset_store.contains(first)
+    assert dataset_registry.get_version('reupload') == second
+
+    _load(handler, b'a,b\n9,9\n', 'reupload-other')
+    third = _load(handler, b'a,b\n0,0\n', 'reupload')
+
+    assert not dataset_store.contains(first)
+    assert not dataset_store.contains(second)
+    assert dataset_store.contains(third)
+
+
+def test_dropped_session_removes_its_pointer_and_version():
+    handler = DataHandler()
+    _load(handler, b'a,b\n4,2\n', 'dropped')
+    key = _load(handler, b'a,b\n4,3\n', 'dropped')
+    pointer = dataset_store._session_path('dropped')
+    refs = dataset_store.directory / dataset_store.REFS_DIR
+
+    assert asyncio.run(handler.drop_dataset('dropped')) == {'released': True}
+    assert asyncio.run(handler.drop_dataset('dropped')) == {'released': False}
+
+    assert not pointer.exists()
+    assert not list(refs.glob(f'*/{pointer.name}'))
+    assert not dataset_store.contains(key)
+    assert dataset_registry.get('dropped') is None
+
+
+def test_store_indexes_sessions_from_an_older_directory(tmp_path):
+    store = DatasetStore(tmp_path)
+    store.save('v1', pd.DataFrame({'a': [1]}))
+    store.set_session('s1', 'v1')
+    # Diretório sem o índice de referências, como os gravados antes dele
+    shutil.rmtree(tmp_path / DatasetStore.REFS_DIR)
+
+    store = DatasetStore(tmp_path)
+
+    assert not store.delete_unused('v1')
+    store.set_session('s1', 'v2')
+    assert store.delete_unused('v1')
+    assert not store.contains('v1')
@@ -0,0 +1,56 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.services.dataset_registry import current_session, dataset_registry
+from src.services.dataset_store import DatasetStore
+from src.tools.python_tool import python_ast_repl
+
+CODE = """\
+import time
+df = get_dataframe()
+time.sleep(0.3)
+print(df['owner'].iloc[0])
+"""
+
+
+def _run_in_session(session: str) -> str:
+    current_session.set(session)
+    return python_ast_repl.run(CODE).strip()
+
+
+def test_concurrent_sessions_see_their_own_dataframe():
+    for session in ('a', 'b'):
+        dataset_registry.set(session, pd.DataFrame({'owner': [session]}), session)
+
+    # Como as ferramentas síncronas dos agentes, cada chamada roda em uma thread com
+    # uma cópia do contexto da sua requisição
+    with ThreadPoolExecutor(2) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, _run_in_session, session)
+            for session in ('a', 'b')
+        ]
+
+    assert [future.result() for future in futures] == ['a', 'b']
+
+
+def test_reloaded_dataframe_is_editable(tmp_path):
+    store = DatasetStore(tmp_path)
+    store.save('v1', pd.DataFrame({'q': [1, 2, 3], 'valor': [1.0, -2.0, 3.0]}))
+    dataset_registry.set('reloaded', store.load('v1'), 'v1')
+    current_session.set('reloaded')
+
+    output = python_ast_repl.run(
+        """\
+df = get_dataframe()
+df.iloc[0, 0] = 10
+df['q'] += 1
+df.loc[df['valor'] < 0, 'valor'] = 0
+df['valor'].clip(upper=2, inplace=True)
+print(df['q'].tolist(), df['valor'].tolist())
+"""
+    )
+
+    assert output.strip() == '[11, 3, 4] [1.0, 0.0, 2.0]'
+    assert dataset_registry.get('reloaded').df['q'].tolist() == [1, 2, 3]
@@ -0,0 +1,48 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+from src.services.data_processing import DataHandler
+from src.settings import settings
+from src.utils.exceptions import SchemaMismatchError
+
+
+def _merge(monkeypatch, members: dict[str, str]):
+    monkeypatch.setattr(settings, 'ingest_workers', 1)
+    file = io.BytesIO()
+    with zipfile.ZipFile(file, 'w') as zip_file:
+        for name, content in members.items():
+            zip_file.writestr(name, content)
+    file.seek(0)
+
+    merged, _ = asyncio.run(DataHandler()._load_zip(file, None, None, True))
+    return merged
+
+
+def test_members_with_compatible_types_are_merged(monkeypatch):
+    merged = _merge(
+        monkeypatch,
+        {
+            'jan.csv': 'valor,loja,obs\n1,A,\n2,B,\n',
+            'fev.csv': 'valor,loja,obs\n2.5,C,nota\n3.5,A,\n',
+        },
+    )
+
+    assert merged['valor'].tolist() == [1.0, 2.0, 2.5, 3.5]
+    assert merged['loja'].astype(str).tolist() == ['A', 'B', 'C', 'A']
+
+
+def test_members_with_incompatible_types_are_rejected(monkeypatch):
+    with pytest.raises(SchemaMismatchError) as error:
+        _merge(
+            monkeypatch,
+            {
+                'jan.csv': 'valor,loja\n1,A\n2,B\n',
+                'fev.csv': 'valor,loja\nmuito,C\npouco,A\n',
+            },
+        )
+
+    assert '"fev.csv" has column "valor" as text' in error.value.msg
+    assert 'expected numeric as in "jan.csv"' in error.value.msg